@@ -0,0 +1,95 @@
+"""Shared fixtures for the benchmark scripts."""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+from aiogram import Bot
+
+from aiogram_webhook import SingleBotEngine
+from aiogram_webhook.route import Route
+from aiogram_webhook.security import Security, StaticSecretToken
+
+SECRET_TOKEN = "benchmark-secret"
+BODY = json.dumps({
+    "update_id": 1,
+    "message": {"message_id": 1, "date": 0, "chat": {"id": 1, "type": "private"}, "text": "hi"},
+}).encode()
+
+
+class NullDispatcher:
+    """Dispatcher that answers every update with ``reply``, ``None`` by default."""
+
+    def __init__(self, reply: Any = None) -> None:
+        self.workflow_data: dict[str, Any] = {}
+        self.reply = reply
+
+    async def feed_webhook_update(self, bot: Bot, update: dict[str, Any]) -> Any:
+        return self.reply
+
+    async def emit_startup(self, **kwargs: Any) -> None:
+        return None
+
+    async def emit_shutdown(self, **kwargs: Any) -> None:
+        return None
+
+
+def build_engine(web: Any, dispatcher: NullDispatcher | None = None) -> SingleBotEngine:
+    """Foreground engine with secret-token verification and a dispatcher that does nothing by default."""
+    return SingleBotEngine(
+        dispatcher or NullDispatcher(),  # ty:ignore[invalid-argument-type]
+        Bot("42:BENCHMARK"),
+        web=web,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        security=Security(secret_token=StaticSecretToken(SECRET_TOKEN)),
+        handle_in_background=False,
+    )
+
+
+async def hammer(host: str, port: int, requests: int, concurrency: int) -> float:
+    """
+    Send ``requests`` webhook POSTs to ``/webhook`` over ``concurrency`` keep-alive connections.
+
+    The client writes a prebuilt request and parses only the status line and ``Content-Length``, so its own cost
+    stays small next to the server under test.
+
+    :return: Elapsed seconds.
+    """
+    request = (
+        f"POST /webhook HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(BODY)}\r\nX-Telegram-Bot-Api-Secret-Token: {SECRET_TOKEN}\r\n\r\n"
+    ).encode() + BODY
+    remaining = requests
+
+    async def client() -> None:
+        nonlocal remaining
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining > 0:
+                remaining -= 1
+                writer.write(request)
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head.startswith(b"HTTP/1.1 200"):
+                    raise RuntimeError(f"Unexpected response: {head.splitlines()[0]!r}")
+                await reader.readexactly(_content_length(head))
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+def _content_length(head: bytes) -> int:
+    for line in head.lower().split(b"\r\n"):
+        if line.startswith(b"content-length:"):
+            return int(line.split(b":", 1)[1])
+    return 0
+
+
+def print_results(requests: int, results: dict[str, float], baseline: str) -> None:
+    print(f"{'adapter':<26} {'req/s':>10} {'us/req':>8} {'speedup':>8}")
+    for name, elapsed in results.items():
+        speedup = results[baseline] / elapsed
+        print(f"{name:<26} {requests / elapsed:>10.0f} {elapsed / requests * 1e6:>8.1f} {speedup:>7.2f}x")
@@ -0,0 +1,82 @@
+"""
+Compare webhook request overhead of ``FastAPIAdapter`` and ``ASGIAdapter``.
+
+Both apps are driven in-process through the ASGI interface, so the numbers exclude the HTTP server and show only
+adapter, routing and engine cost. The dispatcher does nothing.
+
+    python benchmarks/asgi_adapters.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from _common import BODY, SECRET_TOKEN, build_engine, print_results
+from fastapi import FastAPI
+
+from aiogram_webhook import FastAPIAdapter
+from aiogram_webhook.web.asgi import ASGIAdapter, ASGIWebhookApp
+
+
+def http_scope() -> dict[str, Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "https",
+        "path": "/webhook",
+        "raw_path": b"/webhook",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"example.com"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(BODY)).encode()),
+            (b"x-telegram-bot-api-secret-token", SECRET_TOKEN.encode()),
+        ],
+        "client": ("149.154.167.197", 40000),
+        "server": ("127.0.0.1", 8080),
+    }
+
+
+async def run(app: Any, requests: int) -> float:
+    statuses: list[int] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(http_scope(), receive, send)
+    elapsed = time.perf_counter() - started
+
+    if set(statuses) != {200}:
+        raise RuntimeError(f"Unexpected response statuses: {sorted(set(statuses))}")
+    return elapsed
+
+
+async def main(requests: int) -> None:
+    fastapi_app = FastAPI()
+    build_engine(FastAPIAdapter()).register(fastapi_app)
+
+    asgi_app = ASGIWebhookApp()
+    build_engine(ASGIAdapter()).register(asgi_app)
+
+    apps = {"FastAPIAdapter": fastapi_app, "ASGIAdapter": asgi_app}
+    for app in apps.values():
+        await run(app, min(requests, 1000))
+
+    results = {name: await run(app, requests) for name, app in apps.items()}
+    print_results(requests, results, baseline="FastAPIAdapter")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,148 @@
+"""
+Measure peak memory while HTTP adapters answer webhooks with a large document reply.
+
+The dispatcher answers every update with ``SendDocument`` carrying one file, and the client sends ``--concurrency``
+requests at once. Every scenario runs in a fresh process that samples its resident set size from ``/proc`` (Linux
+only) while replies are written; the script reports how far RSS rose above the footprint before the first request,
+so the numbers show per-reply buffering rather than import cost.
+
+    python benchmarks/file_replies.py --size-mb 32 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from _common import BODY, SECRET_TOKEN, NullDispatcher, build_engine
+from aiogram.methods import SendDocument
+from aiogram.types import BufferedInputFile, FSInputFile
+from aiohttp import web
+
+from aiogram_webhook import AiohttpAdapter
+from aiogram_webhook.web.ingress import IngressAdapter, IngressServer
+
+Address = tuple[str, int]
+
+ADAPTERS = ("AiohttpAdapter", "IngressAdapter")
+FILES = ("FSInputFile", "BufferedInputFile")
+
+
+@asynccontextmanager
+async def serve(adapter: str, dispatcher: NullDispatcher) -> AsyncIterator[Address]:
+    if adapter == "IngressAdapter":
+        server = IngressServer()
+        build_engine(IngressAdapter(), dispatcher).register(server)
+        await server.start("127.0.0.1", 0)
+        try:
+            yield server.addresses[0][:2]
+        finally:
+            await server.stop()
+        return
+
+    app = web.Application()
+    build_engine(AiohttpAdapter(), dispatcher).register(app)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    try:
+        yield runner.addresses[0][:2]
+    finally:
+        await runner.cleanup()
+
+
+async def fetch(host: str, port: int) -> int:
+    """Send one webhook and read the reply in 64 KiB pieces without keeping it. Returns the body size."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        (
+            f"POST /webhook HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(BODY)}\r\nX-Telegram-Bot-Api-Secret-Token: {SECRET_TOKEN}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        + BODY
+    )
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 200"):
+        raise RuntimeError(f"Unexpected response: {head.splitlines()[0]!r}")
+
+    received = 0
+    while chunk := await reader.read(64 * 1024):
+        received += len(chunk)
+    writer.close()
+    return received
+
+
+def resident_set_size() -> int:
+    with Path("/proc/self/statm").open() as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def sample_peak(peak: list[int], stopped: asyncio.Event) -> None:
+    while not stopped.is_set():
+        peak[0] = max(peak[0], resident_set_size())
+        await asyncio.sleep(0.002)
+
+
+async def run_scenario(adapter: str, file: str, path: Path, size: int, concurrency: int) -> dict[str, float]:
+    document = FSInputFile(path) if file == "FSInputFile" else None
+    dispatcher = NullDispatcher()
+
+    async with serve(adapter, dispatcher) as (host, port):
+        baseline = resident_set_size()
+        peak, stopped = [baseline], asyncio.Event()
+        sampler = asyncio.create_task(sample_peak(peak, stopped))
+
+        # BufferedInputFile.from_file() is how a handler usually builds one: the whole file is read into memory.
+        dispatcher.reply = SendDocument(chat_id=1, document=document or BufferedInputFile.from_file(path))
+        started = time.perf_counter()
+        sizes = await asyncio.gather(*(fetch(host, port) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        stopped.set()
+        await sampler
+
+    if min(sizes) < size:
+        raise RuntimeError("Reply is shorter than the document.")
+    return {"peak_mb": (peak[0] - baseline) / 1024**2, "seconds": elapsed}
+
+
+def main(size_mb: int, concurrency: int) -> None:
+    print(f"{'adapter':<18} {'file':<18} {'peak RSS +MB':>12} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "document.bin"
+        path.write_bytes(b"\0" * size_mb * 1024**2)
+
+        for adapter in ADAPTERS:
+            for file in FILES:
+                output = subprocess.run(  # noqa: S603
+                    [sys.executable, __file__, "--scenario", adapter, file, str(path), str(concurrency)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                result = json.loads(output)
+                print(f"{adapter:<18} {file:<18} {result['peak_mb']:>12.1f} {result['seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--scenario"]:
+        adapter, file, path, concurrency = sys.argv[2:6]
+        document = Path(path)
+        result = asyncio.run(run_scenario(adapter, file, document, document.stat().st_size, int(concurrency)))
+        print(json.dumps(result))
+        sys.exit()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=8)
+    arguments = parser.parse_args()
+    main(arguments.size_mb, arguments.concurrency)
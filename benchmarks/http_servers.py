@@ -0,0 +1,119 @@
+"""
+Compare webhook throughput of the HTTP server adapters over real loopback sockets.
+
+Every server listens on loopback and is loaded over keep-alive connections by a minimal client in the same process,
+so client cost is identical for all of them and the difference is server, adapter and engine overhead. FastAPI is
+served by uvicorn and is skipped when uvicorn is not installed. The dispatcher does nothing.
+
+    python benchmarks/http_servers.py --requests 10000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import socket
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+from _common import build_engine, hammer, print_results
+from aiohttp import web
+
+from aiogram_webhook import AiohttpAdapter
+from aiogram_webhook.web.aiohttp_server import AiohttpServerAdapter, AiohttpServerApp
+from aiogram_webhook.web.ingress import IngressAdapter, IngressServer
+
+Address = tuple[str, int]
+
+
+@asynccontextmanager
+async def aiohttp_application() -> AsyncIterator[Address]:
+    app = web.Application()
+    build_engine(AiohttpAdapter()).register(app)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    try:
+        yield runner.addresses[0][:2]
+    finally:
+        await runner.cleanup()
+
+
+@asynccontextmanager
+async def aiohttp_server() -> AsyncIterator[Address]:
+    app = AiohttpServerApp(access_log=None)
+    build_engine(AiohttpServerAdapter()).register(app)
+
+    await app.start("127.0.0.1", 0)
+    try:
+        yield app.addresses[0][:2]
+    finally:
+        await app.stop()
+
+
+def ingress(http_parser: str) -> Callable[[], AbstractAsyncContextManager[Address]]:
+    @asynccontextmanager
+    async def serve() -> AsyncIterator[Address]:
+        server = IngressServer(http_parser=http_parser)  # ty:ignore[invalid-argument-type]
+        build_engine(IngressAdapter()).register(server)
+
+        await server.start("127.0.0.1", 0)
+        try:
+            yield server.addresses[0][:2]
+        finally:
+            await server.stop()
+
+    return serve
+
+
+@asynccontextmanager
+async def fastapi_uvicorn() -> AsyncIterator[Address]:
+    import uvicorn  # noqa: PLC0415
+    from fastapi import FastAPI  # noqa: PLC0415
+
+    from aiogram_webhook import FastAPIAdapter  # noqa: PLC0415
+
+    app = FastAPI()
+    build_engine(FastAPIAdapter()).register(app)
+
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        host, port = sock.getsockname()[:2]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, lifespan="off", access_log=False, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+    try:
+        yield host, port
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def main(requests: int, concurrency: int) -> None:
+    servers: dict[str, Callable[[], AbstractAsyncContextManager[Address]]] = {
+        "AiohttpAdapter": aiohttp_application,
+        "AiohttpServerAdapter": aiohttp_server,
+        "IngressAdapter/builtin": ingress("builtin"),
+    }
+    if importlib.util.find_spec("httptools") is not None:
+        servers["IngressAdapter/httptools"] = ingress("httptools")
+    if importlib.util.find_spec("uvicorn") is not None:
+        servers["FastAPIAdapter/uvicorn"] = fastapi_uvicorn
+
+    results = {}
+    for name, serve in servers.items():
+        async with serve() as (host, port):
+            await hammer(host, port, min(requests, 1000), concurrency)
+            results[name] = await hammer(host, port, requests, concurrency)
+
+    print_results(requests, results, baseline="AiohttpAdapter")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.requests, arguments.concurrency))
@@ -0,0 +1,72 @@
+"""
+Compare ``IPCheck`` lookups against a linear scan over the same networks.
+
+The linear scan is what ``IPCheck`` did before it compiled its allowlist: a set of single addresses checked first,
+then ``any(address in network ...)`` over every network. Client addresses are drawn from a fixed pool, so address
+parsing is cached for both and the difference is the membership test.
+
+    python benchmarks/ip_allowlist.py --networks 5000 --lookups 5000
+"""
+
+import argparse
+import random
+import time
+from ipaddress import IPv4Address, IPv4Network, ip_address
+
+from aiogram_webhook.security.checks.ip import IPCheck
+
+
+def random_networks(count: int, rng: random.Random) -> list[IPv4Network]:
+    return [
+        IPv4Network((rng.getrandbits(32), prefix), strict=False)
+        for prefix in (rng.randint(16, 30) for _ in range(count))
+    ]
+
+
+def linear_lookup(networks: list[IPv4Network], clients: list[str], lookups: int) -> float:
+    addresses: frozenset[IPv4Address] = frozenset()
+    parsed = {client: ip_address(client) for client in clients}
+
+    started = time.perf_counter()
+    for index in range(lookups):
+        address = parsed[clients[index % len(clients)]]
+        if address not in addresses:
+            any(address in network for network in networks)
+    return time.perf_counter() - started
+
+
+def ranges_lookup(networks: list[IPv4Network], clients: list[str], lookups: int) -> float:
+    check = IPCheck(*networks, include_default=False)
+    parse_ip = check._parse_ip  # noqa: SLF001
+    ranges = check._ranges  # noqa: SLF001
+
+    started = time.perf_counter()
+    for index in range(lookups):
+        ranges.contains(*parse_ip(clients[index % len(clients)]))
+    return time.perf_counter() - started
+
+
+def main(network_count: int, lookups: int) -> None:
+    rng = random.Random(0)  # noqa: S311
+    networks = random_networks(network_count, rng)
+    clients = [str(IPv4Address(rng.getrandbits(32))) for _ in range(128)]
+
+    started = time.perf_counter()
+    IPCheck(*networks, include_default=False)
+    build_ms = (time.perf_counter() - started) * 1e3
+
+    linear = linear_lookup(networks, clients, lookups)
+    ranges = ranges_lookup(networks, clients, lookups)
+
+    print(f"{network_count} networks, allowlist built in {build_ms:.1f} ms")
+    print(f"{'lookup':<14} {'us/lookup':>10} {'speedup':>8}")
+    print(f"{'linear scan':<14} {linear / lookups * 1e6:>10.3f} {1:>7.2f}x")
+    print(f"{'IPRanges':<14} {ranges / lookups * 1e6:>10.3f} {linear / ranges:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--networks", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    arguments = parser.parse_args()
+    main(arguments.networks, arguments.lookups)
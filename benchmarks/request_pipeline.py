@@ -0,0 +1,92 @@
+"""
+Compare the per-request cost of ``handle_request`` and the handler ``register()`` compiles for the engine.
+
+Requests are built once and fed straight to the handlers, so the numbers exclude HTTP parsing and the web framework
+and show only the engine pipeline: route matching, security, target and bot resolution, and reading the update.
+The dispatcher does nothing.
+
+    python benchmarks/request_pipeline.py --requests 100000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from _common import BODY, SECRET_TOKEN, NullDispatcher
+from aiogram import Bot
+
+from aiogram_webhook import SingleBotEngine
+from aiogram_webhook.route import Route
+from aiogram_webhook.security import IPCheck, Security, StaticSecretToken
+from aiogram_webhook.web.ingress import IngressAdapter, IngressRequest, IngressWebRequest
+
+Handler = Callable[[IngressWebRequest], Awaitable[Any]]
+
+CONFIGURATIONS: dict[str, Security | None] = {
+    "no security": None,
+    "secret token": Security(secret_token=StaticSecretToken(SECRET_TOKEN)),
+    "secret token + IP check": Security(IPCheck(), secret_token=StaticSecretToken(SECRET_TOKEN)),
+}
+
+
+def build_request() -> IngressWebRequest:
+    return IngressWebRequest(
+        IngressRequest(
+            method="POST",
+            path="/webhook",
+            query_string=b"",
+            headers=[
+                (b"content-type", b"application/json"),
+                (b"x-telegram-bot-api-secret-token", SECRET_TOKEN.encode()),
+            ],
+            body=BODY,
+            client_ip="149.154.167.197",
+            path_params={},
+        )
+    )
+
+
+async def run(handler: Handler, request: IngressWebRequest, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await handler(request)
+    elapsed = time.perf_counter() - started
+
+    if response.status_code != 200:
+        raise RuntimeError(f"Unexpected response status: {response.status_code}")
+    return elapsed
+
+
+async def main(requests: int) -> None:
+    request = build_request()
+
+    print(f"{'configuration':<26} {'generic us':>11} {'compiled us':>12} {'saved us':>9} {'speedup':>8}")
+    for name, security in CONFIGURATIONS.items():
+        engine = SingleBotEngine(
+            NullDispatcher(),  # ty:ignore[invalid-argument-type]
+            Bot("42:BENCHMARK"),
+            web=IngressAdapter(),
+            route=Route(base_url="https://example.com", path="/webhook"),
+            security=security,
+            handle_in_background=False,
+        )
+        compiled = engine._compile_handler()  # noqa: SLF001
+
+        await run(engine.handle_request, request, min(requests, 1000))
+        await run(compiled, request, min(requests, 1000))
+        generic = await run(engine.handle_request, request, requests) / requests * 1e6
+        specialized = await run(compiled, request, requests) / requests * 1e6
+
+        print(
+            f"{name:<26} {generic:>11.2f} {specialized:>12.2f} {generic - specialized:>9.2f} "
+            f"{generic / specialized:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.requests))
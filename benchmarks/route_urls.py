@@ -0,0 +1,72 @@
+"""
+Compare building webhook URLs for a fleet of bots one ``build_url`` call at a time and with ``build_urls``.
+
+``yarl`` builds every URL through ``yarl``, as ``build_url`` did before routes precompiled their URL; ``build_url``
+and ``build_urls`` use the precompiled parts.
+
+    python benchmarks/route_urls.py --bots 100000
+"""
+
+import argparse
+import asyncio
+import time
+from urllib.parse import quote
+
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.route import BotIdParam, Route
+
+BASE_URL = "https://example.com/api"
+
+
+def build_route() -> Route:
+    return Route(
+        base_url=BASE_URL,
+        path="/webhook/{bot_id}",
+        params={"bot_id": BotIdParam()},
+        query={"source": "telegram"},
+    )
+
+
+async def through_yarl(route: Route, targets: list[Target]) -> float:
+    base_url, query = route._base_url, route._query  # noqa: SLF001
+    started = time.perf_counter()
+    for target in targets:
+        path = f"webhook/{quote(str(target.bot_id), safe='')}"
+        str(base_url.joinpath(path, encoded=True).with_query(query.build_items({})))
+    return time.perf_counter() - started
+
+
+async def one_by_one(route: Route, targets: list[Target]) -> float:
+    started = time.perf_counter()
+    for target in targets:
+        await route.build_url(target)
+    return time.perf_counter() - started
+
+
+async def bulk(route: Route, targets: list[Target]) -> float:
+    started = time.perf_counter()
+    await route.build_urls(targets)
+    return time.perf_counter() - started
+
+
+async def main(bots: int) -> None:
+    route = build_route()
+    targets = [Target(bot_id=bot_id, bot_token=f"{bot_id}:TOKEN") for bot_id in range(1, bots + 1)]
+
+    await through_yarl(route, targets[:1000])
+    results = {
+        "yarl": await through_yarl(route, targets),
+        "build_url": await one_by_one(route, targets),
+        "build_urls": await bulk(route, targets),
+    }
+
+    print(f"{'method':<12} {'us/url':>8} {'speedup':>8}")
+    for name, elapsed in results.items():
+        print(f"{name:<12} {elapsed / bots * 1e6:>8.3f} {results['yarl'] / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=100000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.bots))
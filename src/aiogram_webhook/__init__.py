@@ -1,16 +1,17 @@
 from aiogram_webhook.configs.bot import BotConfig
 from aiogram_webhook.configs.webhook import WebhookConfig
+from aiogram_webhook.engines.bot_id import BotIdEngine
 from aiogram_webhook.engines.single import SingleBotEngine
 from aiogram_webhook.engines.token import TokenEngine
 from aiogram_webhook.web.aiohttp import AiohttpAdapter
 
-__all__ = ["AiohttpAdapter", "BotConfig", "SingleBotEngine", "TokenEngine", "WebhookConfig"]
+__all__ = ["AiohttpAdapter", "BotConfig", "BotIdEngine", "SingleBotEngine", "TokenEngine", "WebhookConfig"]
 
 
 try:
     from aiogram_webhook.web.fastapi import FastAPIAdapter  # noqa: F401
 
-    __all__.insert(2, "FastAPIAdapter")
+    __all__.insert(3, "FastAPIAdapter")
 except ModuleNotFoundError as exc:
     if exc.name != "fastapi":
         raise
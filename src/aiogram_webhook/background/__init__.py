@@ -0,0 +1,17 @@
+from aiogram_webhook.background.deadlines import Deadlines, InFlightUpdate
+from aiogram_webhook.background.journal import JournalEntry, UpdateJournal
+from aiogram_webhook.background.lanes import Lane, PriorityLanes
+from aiogram_webhook.background.spill import SpilledUpdate, SpillFile
+from aiogram_webhook.background.workers import WorkerPool
+
+__all__ = (
+    "Deadlines",
+    "InFlightUpdate",
+    "JournalEntry",
+    "Lane",
+    "PriorityLanes",
+    "SpillFile",
+    "SpilledUpdate",
+    "UpdateJournal",
+    "WorkerPool",
+)
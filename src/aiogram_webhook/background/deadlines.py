@@ -0,0 +1,153 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from collections.abc import Awaitable, Mapping
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from aiogram_webhook.background.errors import UpdateDeadlineExceededError
+from aiogram_webhook.logs import get_logger, log_webhook_error
+from aiogram_webhook.utils.update import get_update_type
+
+logger = get_logger("background")
+
+ResultT = TypeVar("ResultT")
+
+_DEADLINE_MESSAGE = "Update deadline exceeded"
+
+
+@dataclass(frozen=True, slots=True)
+class InFlightUpdate:
+    """Background update that is being dispatched right now."""
+
+    bot_id: int
+    update_id: int | None
+    update_type: str | None
+    started_at: float
+    """``time.monotonic()`` value when dispatch started."""
+    timeout: float | None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since dispatch started."""
+        return time.monotonic() - self.started_at
+
+
+class Deadlines:
+    """
+    Per-update time limits for background dispatch.
+
+    Overdue dispatches are cancelled, counted and logged; they never hold a task until shutdown.
+    """
+
+    def __init__(self, default: float | None = None, *, per_type: Mapping[str, float | None] | None = None) -> None:
+        """
+        :param default: Time limit in seconds for updates without a per-type limit. ``None`` means no limit.
+        :param per_type: Time limits keyed by top-level update type. ``None`` disables the limit for that type.
+        """
+        for timeout in (default, *(per_type or {}).values()):
+            if timeout is not None and timeout <= 0:
+                raise ValueError("Deadline timeouts must be greater than zero.")
+
+        self.default = default
+        self.per_type: dict[str, float | None] = dict(per_type or {})
+
+        self._in_flight: dict[int, InFlightUpdate] = {}
+        self._keys = itertools.count()
+        self._timeouts = 0
+        self._timeouts_by_type: Counter[str | None] = Counter()
+
+    @property
+    def timeouts(self) -> int:
+        """Total number of dispatches cancelled by a deadline."""
+        return self._timeouts
+
+    @property
+    def timeouts_by_type(self) -> dict[str | None, int]:
+        """Number of cancelled dispatches per update type."""
+        return dict(self._timeouts_by_type)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of updates being dispatched right now."""
+        return len(self._in_flight)
+
+    def slowest(self, limit: int = 10) -> list[InFlightUpdate]:
+        """Return the longest-running in-flight updates, oldest first."""
+        return heapq.nsmallest(limit, self._in_flight.values(), key=lambda item: item.started_at)
+
+    def timeout_for(self, update_type: str | None) -> float | None:
+        if update_type is not None and update_type in self.per_type:
+            return self.per_type[update_type]
+        return self.default
+
+    async def run(self, awaitable: Awaitable[ResultT], *, bot_id: int, update: Mapping[str, Any]) -> ResultT | None:
+        """
+        Await a dispatch within the deadline of its update type.
+
+        :param awaitable: Dispatch of the update.
+        :param bot_id: Bot the update belongs to.
+        :param update: Raw update.
+        :return: Dispatch result, or ``None`` when the deadline cancelled the dispatch.
+        """
+        update_type = get_update_type(update)
+        timeout = self.timeout_for(update_type)
+        record = InFlightUpdate(
+            bot_id=bot_id,
+            update_id=update.get("update_id"),
+            update_type=update_type,
+            started_at=time.monotonic(),
+            timeout=timeout,
+        )
+
+        key = next(self._keys)
+        self._in_flight[key] = record
+
+        # Cancel the current task from a timer instead of wrapping it in ``asyncio.wait_for``:
+        # no extra task per update, and a ``TimeoutError`` raised by the handler itself is not miscounted.
+        expired = False
+        task = asyncio.current_task()
+        handle = None
+
+        def expire() -> None:
+            nonlocal expired
+            expired = True
+            if task is not None:
+                task.cancel(_DEADLINE_MESSAGE)
+
+        if timeout is not None:
+            handle = asyncio.get_running_loop().call_later(timeout, expire)
+
+        try:
+            return await awaitable
+        except asyncio.CancelledError as exc:
+            # A shutdown that cancels the task at the same moment must still stop it, as with asyncio.timeout().
+            if not expired or (task is not None and _cancelled_elsewhere(task, exc)):
+                raise
+        finally:
+            if handle is not None:
+                handle.cancel()
+            del self._in_flight[key]
+
+        self._timeouts += 1
+        self._timeouts_by_type[update_type] += 1
+        log_webhook_error(
+            logger,
+            UpdateDeadlineExceededError(
+                target_bot_id=bot_id,
+                update_id=record.update_id,
+                update_type=update_type,
+                timeout=timeout,
+            ),
+        )
+        return None
+
+
+def _cancelled_elsewhere(task: "asyncio.Task[Any]", exc: asyncio.CancelledError) -> bool:
+    """Withdraw the deadline's cancellation and tell whether the task was cancelled by someone else as well."""
+    if hasattr(task, "uncancel"):
+        return task.uncancel() > 0
+    # Python 3.10 keeps no cancellation count; a later cancel() replaces the deadline's message.
+    return exc.args != (_DEADLINE_MESSAGE,)
@@ -0,0 +1,110 @@
+import logging
+
+from aiogram_webhook.errors import AiogramWebhookError
+
+
+class BackgroundError(AiogramWebhookError):
+    code = "background_error"
+
+
+class LaneFullError(BackgroundError):
+    code = "background_lane_full"
+    status_code = 503
+    public_detail = "Service unavailable"
+    log_level = logging.WARNING
+
+    def __init__(self, *, lane: str, max_size: int) -> None:
+        self.lane = lane
+        self.max_size = max_size
+
+        super().__init__(f"Background lane is full. Lane: {lane!r}. Max size: {max_size}.")
+
+
+class LanesClosedError(BackgroundError):
+    code = "background_lanes_closed"
+    status_code = 503
+    public_detail = "Service unavailable"
+    log_level = logging.DEBUG
+
+    def __init__(self) -> None:
+        super().__init__("Background lanes are closed and no longer accept updates.")
+
+
+class UpdateDeadlineExceededError(BackgroundError):
+    code = "background_update_deadline_exceeded"
+    log_level = logging.WARNING
+
+    def __init__(
+        self,
+        *,
+        target_bot_id: int,
+        update_id: int | None = None,
+        update_type: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self.target_bot_id = target_bot_id
+        self.update_id = update_id
+        self.update_type = update_type
+        self.timeout = timeout
+
+        message = f"Background update dispatch exceeded its deadline and was cancelled. Target bot id: {target_bot_id}."
+
+        if update_id is not None:
+            message += f" Update id: {update_id}."
+
+        if update_type is not None:
+            message += f" Update type: {update_type!r}."
+
+        if timeout is not None:
+            message += f" Timeout: {timeout}s."
+
+        super().__init__(message)
+
+
+class JournalWriteError(BackgroundError):
+    code = "background_journal_write_failed"
+    status_code = 503
+    public_detail = "Service unavailable"
+    log_level = logging.ERROR
+
+    def __init__(self, *, target_bot_id: int, original_error: BaseException | None = None) -> None:
+        self.target_bot_id = target_bot_id
+        self.original_error_type = type(original_error).__name__ if original_error is not None else None
+
+        message = f"Failed to persist webhook update to the update journal. Target bot id: {target_bot_id}."
+
+        if self.original_error_type is not None:
+            message += f" Original error type: {self.original_error_type}."
+
+        super().__init__(message)
+
+
+class WorkerBackpressureError(BackgroundError):
+    code = "background_worker_backpressure"
+    status_code = 503
+    public_detail = "Service unavailable"
+    log_level = logging.WARNING
+
+    def __init__(self, *, worker: int, buffered: int) -> None:
+        self.worker = worker
+        self.buffered = buffered
+
+        super().__init__(f"Worker process is not keeping up. Worker: {worker}. Buffered bytes: {buffered}.")
+
+
+class WorkerUnavailableError(BackgroundError):
+    code = "background_worker_unavailable"
+    status_code = 503
+    public_detail = "Service unavailable"
+    log_level = logging.ERROR
+
+    def __init__(self, *, worker: int, exitcode: int | None = None) -> None:
+        self.worker = worker
+        self.exitcode = exitcode
+
+        message = f"Worker process is not running. Worker: {worker}."
+
+        if exitcode is not None:
+            message += f" Exit code: {exitcode}."
+
+        super().__init__(message)
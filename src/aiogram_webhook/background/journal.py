@@ -0,0 +1,154 @@
+import asyncio
+import sqlite3
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Literal
+
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.utils._sqlite import SQLiteThread
+
+logger = get_logger("background")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS updates (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bot_id INTEGER NOT NULL,
+    bot_token TEXT NOT NULL,
+    payload BLOB NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class JournalEntry:
+    """Persisted update that has not been acknowledged yet."""
+
+    id: int
+    bot_id: int
+    bot_token: str
+    payload: bytes
+
+
+class UpdateJournal:
+    """
+    Local write-ahead queue of background updates backed by SQLite in WAL mode.
+
+    Updates are appended before Telegram gets ``200`` and deleted once dispatched. Appends and acknowledgements
+    issued while a commit is running are written together by the next commit, so one ``fsync`` covers every
+    concurrent request. All database work runs on a single dedicated thread. Entries hold bot tokens, so a new
+    database is created readable by its owner only.
+    """
+
+    def __init__(self, path: str | PathLike[str], *, synchronous: Literal["FULL", "NORMAL"] = "FULL") -> None:
+        """
+        :param path: SQLite database file.
+        :param synchronous: SQLite ``synchronous`` pragma. ``FULL`` survives power loss; ``NORMAL`` survives
+            process crashes only and is cheaper.
+        """
+        self.path = Path(path)
+        self.synchronous = synchronous
+
+        self.appended = 0
+        self.acked = 0
+        self.commits = 0
+
+        self._db = SQLiteThread(
+            self.path,
+            schema=_SCHEMA,
+            pragmas=(f"synchronous={synchronous}",),
+            thread_name="aiogram-webhook-journal",
+        )
+        self._appends: list[tuple[int, str, bytes]] = []
+        self._waiters: list[asyncio.Future[int]] = []
+        self._acks: list[int] = []
+        self._flushing: asyncio.Task[None] | None = None
+
+    async def open(self) -> None:
+        await self._db.open()
+
+    async def append(self, target: Target, payload: bytes) -> int:
+        """
+        Persist a raw update.
+
+        :param target: Bot the update belongs to.
+        :param payload: Raw update body.
+        :return: Journal entry id, used to acknowledge the update.
+        """
+        await self.open()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._appends.append((target.bot_id, target.bot_token, payload))
+        self._waiters.append(waiter)
+        self._schedule_flush()
+
+        return await waiter
+
+    def ack(self, entry_id: int) -> None:
+        """Mark an update as dispatched. Acknowledgements are written with the next commit."""
+        self._acks.append(entry_id)
+        self._schedule_flush()
+
+    async def pending(self) -> list[JournalEntry]:
+        """Return persisted updates that were never acknowledged, in arrival order."""
+        await self.open()
+        rows = await self._db.run(_select_pending)
+        return [JournalEntry(id=row[0], bot_id=row[1], bot_token=row[2], payload=row[3]) for row in rows]
+
+    async def close(self) -> None:
+        """Write outstanding acknowledgements, checkpoint the WAL, and close the database."""
+        if not self._db.is_open:
+            return
+
+        if self._flushing is not None:
+            await self._flushing
+        if self._appends or self._acks:
+            await self._flush()
+
+        await self._db.close(checkpoint=True)
+
+    def _schedule_flush(self) -> None:
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._appends or self._acks:
+            appends, waiters, acks = self._appends, self._waiters, self._acks
+            self._appends, self._waiters, self._acks = [], [], []
+
+            try:
+                entry_ids = await self._db.run(_commit, appends, acks)
+            except Exception as exc:
+                logger.exception("Failed to write update journal batch")
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                continue
+
+            self.appended += len(appends)
+            self.acked += len(acks)
+            self.commits += 1
+
+            for waiter, entry_id in zip(waiters, entry_ids, strict=True):
+                if not waiter.done():
+                    waiter.set_result(entry_id)
+
+
+def _commit(connection: sqlite3.Connection, appends: list[tuple[int, str, bytes]], acks: list[int]) -> list[int]:
+    connection.execute("BEGIN")
+    try:
+        entry_ids = [
+            connection.execute("INSERT INTO updates (bot_id, bot_token, payload) VALUES (?, ?, ?)", row).lastrowid
+            for row in appends
+        ]
+        connection.executemany("DELETE FROM updates WHERE id = ?", ((entry_id,) for entry_id in acks))
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+    return [entry_id for entry_id in entry_ids if entry_id is not None]
+
+
+def _select_pending(connection: sqlite3.Connection) -> list[tuple[int, int, str, bytes]]:
+    return connection.execute("SELECT id, bot_id, bot_token, payload FROM updates ORDER BY id").fetchall()
@@ -0,0 +1,248 @@
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Final, TypeAlias
+
+from aiogram_webhook.background.errors import LaneFullError, LanesClosedError
+from aiogram_webhook.logs import get_logger
+
+logger = get_logger("background")
+
+Job: TypeAlias = Callable[[], Awaitable[None]]
+
+
+@dataclass(frozen=True, slots=True)
+class Lane:
+    """Bounded queue for background updates of selected types."""
+
+    name: str
+    update_types: Iterable[str] = ()
+    """Top-level update types served by this lane. A lane without types receives every unmapped update."""
+    max_size: int = 1000
+    """Maximum number of queued updates. Updates beyond it are answered with ``503`` so Telegram retries them."""
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "update_types", frozenset(self.update_types))
+
+        if self.max_size < 1:
+            raise ValueError(f"Lane {self.name!r} max_size must be at least 1.")
+
+
+INTERACTIVE_UPDATE_TYPES: Final[frozenset[str]] = frozenset({
+    "callback_query",
+    "inline_query",
+    "chosen_inline_result",
+    "shipping_query",
+    "pre_checkout_query",
+})
+
+DEFAULT_LANES: Final[tuple[Lane, ...]] = (
+    Lane("interactive", INTERACTIVE_UPDATE_TYPES),
+    Lane("default"),
+)
+
+
+class PriorityLanes:
+    """
+    Priority queues for background updates served by a fixed pool of workers.
+
+    Lanes are listed from the highest priority to the lowest. A worker always takes the next update from
+    the highest non-empty lane, unless a lower lane was passed over ``max_skips`` times in a row.
+    """
+
+    def __init__(self, *lanes: Lane, workers: int = 16, max_skips: int = 8) -> None:
+        """
+        :param *lanes: Lanes ordered by priority. Defaults to an ``interactive`` lane followed by a ``default`` lane.
+        :param workers: Number of concurrent background workers.
+        :param max_skips: How many times a non-empty lane may be passed over before it is served (starvation guard).
+        """
+        lanes = lanes or DEFAULT_LANES
+
+        if workers < 1:
+            raise ValueError("PriorityLanes workers must be at least 1.")
+        if len({lane.name for lane in lanes}) != len(lanes):
+            raise ValueError("PriorityLanes lane names must be unique.")
+
+        lane_index: dict[str, int] = {}
+        for index, lane in enumerate(lanes):
+            for update_type in lane.update_types:
+                if update_type in lane_index:
+                    raise ValueError(f"Update type {update_type!r} is mapped to more than one lane.")
+                lane_index[update_type] = index
+
+        self.workers = workers
+        self.max_skips = max_skips
+
+        self._lanes = lanes
+        self._lane_index = lane_index
+        self._default_index = next((i for i, lane in enumerate(lanes) if not lane.update_types), len(lanes) - 1)
+        self._queues: tuple[deque[Job], ...] = tuple(deque() for _ in lanes)
+        self._skips = [0] * len(lanes)
+
+        self._workers: set[asyncio.Task[None]] = set()
+        self._room_waiters: list[asyncio.Future[None]] = []
+        self._ready = asyncio.Semaphore(0)
+        self._idle = asyncio.Event()
+        self._pending = 0
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of queued and running updates."""
+        return self._pending
+
+    def sizes(self) -> dict[str, int]:
+        """Return the number of queued updates per lane."""
+        return {lane.name: len(queue) for lane, queue in zip(self._lanes, self._queues, strict=True)}
+
+    def lane_for(self, update_type: str | None) -> Lane:
+        """Return the lane that serves the given update type."""
+        return self._lanes[self._index_for(update_type)]
+
+    def put(self, update_type: str | None, job: Job) -> None:
+        """
+        Queue a background job in the lane mapped to the update type.
+
+        :param update_type: Top-level update type.
+        :param job: Callable returning the awaitable that processes the update.
+        :raises LanesClosedError: If the lanes are closed.
+        :raises LaneFullError: If the lane is full.
+        """
+        queue = self._queues[self.ensure_room(update_type)]
+
+        if not self._workers:
+            self.start()
+
+        queue.append(job)
+        self._pending += 1
+        self._idle.clear()
+        self._ready.release()
+
+    async def put_waiting(self, update_type: str | None, job: Job) -> None:
+        """
+        Queue a background job, waiting while its lane is full.
+
+        Used for updates that were already acknowledged to Telegram, which would not redeliver them.
+
+        :param update_type: Top-level update type.
+        :param job: Callable returning the awaitable that processes the update.
+        :raises LanesClosedError: If the lanes are closed, before or while waiting.
+        """
+        index = self._index_for(update_type)
+        while not self._closed and len(self._queues[index]) >= self._lanes[index].max_size:
+            waiter = asyncio.get_running_loop().create_future()
+            self._room_waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._room_waiters:
+                    self._room_waiters.remove(waiter)
+
+        self.put(update_type, job)
+
+    def ensure_room(self, update_type: str | None) -> int:
+        """
+        Check that an update of the given type can be queued right now.
+
+        :param update_type: Top-level update type.
+        :return: Index of the lane serving the update type.
+        :raises LanesClosedError: If the lanes are closed.
+        :raises LaneFullError: If the lane is full.
+        """
+        if self._closed:
+            raise LanesClosedError
+
+        index = self._index_for(update_type)
+        lane = self._lanes[index]
+        if len(self._queues[index]) >= lane.max_size:
+            raise LaneFullError(lane=lane.name, max_size=lane.max_size)
+        return index
+
+    def start(self) -> None:
+        """Start workers. Called by the engine on startup and lazily on the first queued update."""
+        self._closed = False
+        if self._workers:
+            return
+
+        self._ready = asyncio.Semaphore(sum(len(queue) for queue in self._queues))
+        self._idle = asyncio.Event()
+        if not self._pending:
+            self._idle.set()
+
+        for _ in range(self.workers):
+            task = asyncio.create_task(self._work())
+            self._workers.add(task)
+            task.add_done_callback(self._workers.discard)
+
+    async def close(self, timeout: float | None = 10.0) -> None:
+        """
+        Stop accepting updates and wait for queued and running ones to finish.
+        Cancels remaining work if the timeout is reached.
+
+        :param timeout: Maximum time (in seconds) to wait before canceling.
+        """
+        self._closed = True
+        self._wake_room_waiters()
+        if not self._workers:
+            return
+
+        if self._pending:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Timeout reached. Cancelling %s pending background lane updates.", self._pending)
+
+        workers = tuple(self._workers)
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+
+        for queue in self._queues:
+            self._pending -= len(queue)
+            queue.clear()
+
+    def _wake_room_waiters(self) -> None:
+        # Every waiter retries; those whose lane is still full wait again.
+        waiters, self._room_waiters = self._room_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _index_for(self, update_type: str | None) -> int:
+        if update_type is None:
+            return self._default_index
+        return self._lane_index.get(update_type, self._default_index)
+
+    def _next_index(self) -> int:
+        first = next(index for index, queue in enumerate(self._queues) if queue)
+        chosen = first
+
+        for index in range(first + 1, len(self._queues)):
+            if not self._queues[index]:
+                continue
+
+            if chosen == first and self._skips[index] >= self.max_skips:
+                chosen = index
+            else:
+                self._skips[index] += 1
+
+        self._skips[chosen] = 0
+        return chosen
+
+    async def _work(self) -> None:
+        while True:
+            await self._ready.acquire()
+            index = self._next_index()
+            job = self._queues[index].popleft()
+            self._wake_room_waiters()
+
+            try:
+                await job()
+            except Exception:
+                logger.exception("Unhandled exception in background lane %r", self._lanes[index].name)
+            finally:
+                self._pending -= 1
+                if not self._pending:
+                    self._idle.set()
@@ -0,0 +1,114 @@
+import asyncio
+import itertools
+import json
+import os
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from aiogram import Bot
+
+from aiogram_webhook.logs import get_logger
+
+logger = get_logger("background")
+
+
+@dataclass(frozen=True, slots=True)
+class SpilledUpdate:
+    """Update that did not finish before the previous shutdown."""
+
+    bot_id: int
+    bot_token: str
+    update: dict[str, Any]
+
+
+class SpillFile:
+    """
+    Keeps the raw payload of every in-flight background update and writes the unfinished ones to disk on shutdown.
+
+    The file is a JSON-lines document read back and removed by the next startup. It holds bot tokens and is created
+    readable by its owner only.
+    """
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """
+        :param path: Spill file location. It is created on shutdown only when some updates did not finish.
+        """
+        self.path = Path(path)
+
+        self.spilled = 0
+        self.restored = 0
+
+        self._in_flight: dict[int, SpilledUpdate] = {}
+        self._keys = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def track(self, bot: Bot, update: dict[str, Any]) -> int:
+        """
+        Remember an update handed to background dispatch.
+
+        :return: Key passed to :meth:`done` once the update finished.
+        """
+        key = next(self._keys)
+        self._in_flight[key] = SpilledUpdate(bot_id=bot.id, bot_token=bot.token, update=update)
+        return key
+
+    def done(self, key: int) -> None:
+        self._in_flight.pop(key, None)
+
+    async def dump(self) -> int:
+        """
+        Write updates that are still tracked to the spill file and forget them.
+
+        :return: Number of spilled updates.
+        """
+        entries = list(self._in_flight.values())
+        self._in_flight.clear()
+        if not entries:
+            return 0
+
+        await asyncio.to_thread(self._write, entries)
+        self.spilled += len(entries)
+        logger.warning("Spilled %s unfinished webhook update(s) to %s", len(entries), self.path)
+        return len(entries)
+
+    async def load(self) -> list[SpilledUpdate]:
+        """Read and remove the spill file left by the previous shutdown."""
+        entries = await asyncio.to_thread(self._read)
+        self.restored += len(entries)
+        return entries
+
+    def _write(self, entries: list[SpilledUpdate]) -> None:
+        # Append so that a file not consumed by a failed startup is kept. Entries hold bot tokens, so a new file is
+        # readable by its owner only.
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        with open(descriptor, "a", encoding="utf-8") as file:  # noqa: PTH123
+            for entry in entries:
+                record = {"bot_id": entry.bot_id, "bot_token": entry.bot_token, "update": entry.update}
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _read(self) -> list[SpilledUpdate]:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                entries.append(
+                    SpilledUpdate(bot_id=record["bot_id"], bot_token=record["bot_token"], update=record["update"])
+                )
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping malformed line %s in spill file %s", number, self.path)
+
+        self.path.unlink()
+        return entries
@@ -0,0 +1,302 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Final
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import TelegramMethod
+
+from aiogram_webhook.background.errors import WorkerBackpressureError, WorkerUnavailableError
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.tasks import TaskTracker
+from aiogram_webhook.utils.update import get_update_chat_id
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+
+logger = get_logger("background")
+
+DispatcherFactory = Callable[[], Dispatcher]
+BotFactory = Callable[[str], Bot]
+
+# Frame: body length, token length, token bytes, raw update body.
+_HEADER: Final = struct.Struct("!IH")
+# Sent once by a worker after its dispatcher has started.
+_READY: Final = b"\x01"
+# Longest wait between two attempts to restart a worker that keeps failing at startup.
+_MAX_RESTART_DELAY: Final = 60.0
+
+
+def _encode_frame(bot_token: str, body: bytes) -> bytes:
+    token = bot_token.encode()
+    return _HEADER.pack(len(body), len(token)) + token + body
+
+
+class WorkerPool:
+    """
+    Pool of worker processes that dispatch background updates.
+
+    The HTTP process keeps routing, security and acknowledgement; raw update bodies are forwarded over Unix socket
+    pairs and every worker feeds them to its own :class:`~aiogram.Dispatcher`. Updates of one chat always go to the
+    same worker and are dispatched there in arrival order.
+
+    A worker process that dies is restarted on the next update routed to it; until it is ready again, its updates
+    are answered with ``503`` so Telegram retries them.
+    """
+
+    def __init__(
+        self,
+        dispatcher_factory: DispatcherFactory,
+        *,
+        processes: int | None = None,
+        bot_factory: BotFactory = Bot,
+        max_buffer: int = 16 * 1024 * 1024,
+        max_in_flight: int = 1024,
+        restart_delay: float = 1.0,
+        context: BaseContext | None = None,
+    ) -> None:
+        """
+        :param dispatcher_factory: Picklable callable that builds the dispatcher of a worker, with routers included.
+        :param processes: Number of worker processes. Defaults to the number of CPUs.
+        :param bot_factory: Picklable callable that builds a :class:`~aiogram.Bot` from a token inside a worker.
+        :param max_buffer: Bytes that may wait in the socket buffer of one worker before updates are answered
+            with ``503``.
+        :param max_in_flight: Updates one worker dispatches at a time. A busy worker stops reading, so its socket
+            buffer fills up and ``max_buffer`` applies.
+        :param restart_delay: Seconds before a worker that failed to restart is started again; doubled on every
+            further failure.
+        :param context: Multiprocessing context. Defaults to ``spawn``, which is safe with a running event loop.
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("WorkerPool needs at least one process.")
+        if max_in_flight < 1:
+            raise ValueError("WorkerPool max_in_flight must be at least 1.")
+
+        self.dispatcher_factory = dispatcher_factory
+        self.processes = processes
+        self.bot_factory = bot_factory
+        self.max_buffer = max_buffer
+        self.max_in_flight = max_in_flight
+        self.restart_delay = restart_delay
+        self.context = context or multiprocessing.get_context("spawn")
+
+        self.submitted = [0] * processes
+        self.restarts = [0] * processes
+
+        self._workers: list[BaseProcess] = []
+        self._writers: list[asyncio.StreamWriter] = []
+        self._restarting: dict[int, asyncio.Task[None]] = {}
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def worker_for(self, bot_id: int, update: dict[str, Any]) -> int:
+        """Return the index of the worker that serves the chat of an update."""
+        return hash((bot_id, get_update_chat_id(update))) % self.processes
+
+    async def start(self) -> None:
+        """Start the worker processes and wait until every dispatcher has run its startup handlers."""
+        if self.started:
+            return
+
+        readers = []
+        for index in range(self.processes):
+            process, reader, writer = await self._spawn(index)
+            readers.append(reader)
+            self._workers.append(process)
+            self._writers.append(writer)
+
+        for index, reader in enumerate(readers):
+            if not await _wait_ready(reader):
+                process = self._workers[index]
+                await self.close(timeout=0)
+                raise WorkerUnavailableError(worker=index, exitcode=process.exitcode)
+
+        logger.info("Started %s webhook worker process(es)", self.processes)
+
+    def submit(self, bot: Bot, update: dict[str, Any], body: bytes) -> int:
+        """
+        Forward a raw update to its worker without waiting for dispatch.
+
+        :param bot: Bot the update belongs to.
+        :param update: Parsed update, used for routing.
+        :param body: Raw update body sent to the worker.
+        :return: Index of the selected worker.
+        """
+        index = self.worker_for(bot.id, update)
+
+        if index >= len(self._writers):
+            raise WorkerUnavailableError(worker=index)
+
+        restarting = self._restarting.get(index)
+        if restarting is not None and not restarting.done():
+            raise WorkerUnavailableError(worker=index)
+
+        process = self._workers[index]
+        if not process.is_alive():
+            logger.warning("Worker process %s exited with code %s. Restarting it.", index, process.exitcode)
+            self._restarting[index] = asyncio.ensure_future(self._restart(index))
+            raise WorkerUnavailableError(worker=index, exitcode=process.exitcode)
+
+        writer = self._writers[index]
+        buffered = writer.transport.get_write_buffer_size()
+        if buffered > self.max_buffer:
+            raise WorkerBackpressureError(worker=index, buffered=buffered)
+
+        writer.write(_encode_frame(bot.token, body))
+        self.submitted[index] += 1
+        return index
+
+    async def close(self, timeout: float | None = 10.0) -> None:
+        """
+        Let workers finish queued updates, then stop them.
+
+        :param timeout: Seconds to wait for the workers, all at once, before those still running are terminated.
+        """
+        restarting = tuple(self._restarting.values())
+        for task in restarting:
+            task.cancel()
+        await asyncio.gather(*restarting, return_exceptions=True)
+        self._restarting.clear()
+
+        for writer in self._writers:
+            if writer.can_write_eof() and not writer.is_closing():
+                writer.write_eof()
+
+        await asyncio.gather(*(asyncio.to_thread(process.join, timeout) for process in self._workers))
+
+        stuck = [process for process in self._workers if process.is_alive()]
+        for process in stuck:
+            logger.warning("Worker process %s did not stop in time. Terminating it.", process.name)
+            process.terminate()
+        await asyncio.gather(*(asyncio.to_thread(process.join) for process in stuck))
+
+        for writer in self._writers:
+            writer.close()
+
+        self._workers.clear()
+        self._writers.clear()
+
+    async def _spawn(self, index: int) -> "tuple[BaseProcess, asyncio.StreamReader, asyncio.StreamWriter]":
+        parent, child = self.context.Pipe(duplex=True)
+        process = self.context.Process(
+            target=_worker_main,
+            args=(index, child, self.dispatcher_factory, self.bot_factory, self.max_in_flight),
+            name=f"aiogram-webhook-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child.close()
+
+        reader, writer = await asyncio.open_connection(sock=_take_socket(parent))
+        return process, reader, writer
+
+    async def _restart(self, index: int) -> None:
+        delay = self.restart_delay
+        while True:
+            self._writers[index].close()
+            try:
+                process, reader, self._writers[index] = await self._spawn(index)
+                self._workers[index] = process
+                if await _wait_ready(reader):
+                    break
+                logger.error("Worker process %s failed to restart with exit code %s", index, process.exitcode)
+            except Exception:
+                logger.exception("Failed to restart worker process %s", index)
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _MAX_RESTART_DELAY)
+
+        self.restarts[index] += 1
+        logger.info("Restarted webhook worker process %s", index)
+
+
+async def _wait_ready(reader: asyncio.StreamReader) -> bool:
+    try:
+        await reader.readexactly(len(_READY))
+    except asyncio.IncompleteReadError:
+        return False
+    return True
+
+
+def _take_socket(connection: Connection) -> socket.socket:
+    sock = socket.socket(fileno=os.dup(connection.fileno()))
+    connection.close()
+    return sock
+
+
+def _worker_main(
+    index: int,
+    connection: Connection,
+    dispatcher_factory: DispatcherFactory,
+    bot_factory: BotFactory,
+    max_in_flight: int,
+) -> None:
+    # The parent process owns shutdown: a worker stops once its socket is closed.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_serve_worker(index, connection, dispatcher_factory, bot_factory, max_in_flight))
+
+
+async def _serve_worker(
+    index: int,
+    connection: Connection,
+    dispatcher_factory: DispatcherFactory,
+    bot_factory: BotFactory,
+    max_in_flight: int,
+) -> None:
+    dispatcher = dispatcher_factory()
+    reader, writer = await asyncio.open_connection(sock=_take_socket(connection))
+
+    bots: dict[str, Bot] = {}
+    tails: dict[tuple[str, int | None], asyncio.Task[None]] = {}
+    tracker = TaskTracker()
+    # Reading stops while the worker is busy, so backpressure reaches the parent through the socket buffer.
+    slots = asyncio.Semaphore(max_in_flight)
+
+    await dispatcher.emit_startup(dispatcher=dispatcher, **dispatcher.workflow_data, worker_index=index)
+    writer.write(_READY)
+    try:
+        while True:
+            await slots.acquire()
+            try:
+                body_size, token_size = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+                token = (await reader.readexactly(token_size)).decode()
+                update = json.loads(await reader.readexactly(body_size))
+            except asyncio.IncompleteReadError:
+                break
+
+            bot = bots.get(token)
+            if bot is None:
+                bot = bots[token] = bot_factory(token)
+
+            key = (token, get_update_chat_id(update))
+            task = tracker.spawn(_dispatch_after(tails.get(key), dispatcher, bot, update))
+            tails[key] = task
+            task.add_done_callback(lambda done, key=key: tails.pop(key) if tails.get(key) is done else None)
+            task.add_done_callback(lambda _: slots.release())
+
+        await tracker.close(timeout=None)
+    finally:
+        await dispatcher.emit_shutdown(dispatcher=dispatcher, **dispatcher.workflow_data, worker_index=index)
+        for bot in bots.values():
+            await bot.session.close()
+
+
+async def _dispatch_after(
+    previous: asyncio.Task[None] | None, dispatcher: Dispatcher, bot: Bot, update: dict[str, Any]
+) -> None:
+    if previous is not None:
+        await asyncio.wait([previous])
+
+    result = await dispatcher.feed_raw_update(bot=bot, update=update)
+    if isinstance(result, TelegramMethod):
+        await dispatcher.silent_call_request(bot=bot, result=result)
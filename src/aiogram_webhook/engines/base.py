@@ -1,10 +1,22 @@
+import asyncio
+import json
 import warnings
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
 from typing import Any, Generic, TypeVar
 
 from aiogram import Bot, Dispatcher
 from aiogram.methods import TelegramMethod
 
+from aiogram_webhook.background.deadlines import Deadlines
+from aiogram_webhook.background.errors import BackgroundError, JournalWriteError
+from aiogram_webhook.background.journal import UpdateJournal
+from aiogram_webhook.background.lanes import PriorityLanes
+from aiogram_webhook.background.spill import SpillFile
+from aiogram_webhook.background.workers import WorkerPool
 from aiogram_webhook.engines.errors import (
     BotNotFoundError,
     InvalidJsonError,
@@ -13,12 +25,15 @@ from aiogram_webhook.engines.errors import (
 )
 from aiogram_webhook.engines.target import Target
 from aiogram_webhook.errors import AiogramWebhookError
+from aiogram_webhook.limits.errors import RateLimitExceededError
+from aiogram_webhook.limits.limiter import RateLimiter, RateLimitPolicy
 from aiogram_webhook.logs import get_logger, log_webhook_error
 from aiogram_webhook.route import Route
 from aiogram_webhook.route.params import RouteParams
 from aiogram_webhook.security import Security
 from aiogram_webhook.tasks import TaskTracker
 from aiogram_webhook.utils._payload import build_webhook_payload
+from aiogram_webhook.utils.update import get_update_type
 from aiogram_webhook.web.base import WebAdapter, WebRequest
 
 logger = get_logger("engines")
@@ -27,6 +42,24 @@ AppT = TypeVar("AppT")
 RawRequestT = TypeVar("RawRequestT")
 FrameworkResponseT = TypeVar("FrameworkResponseT")
 
+_NO_ROUTE_PARAMS: RouteParams = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class _Pipeline:
+    """Steps of request handling shared by :meth:`BaseWebhookEngine.handle_request` and the compiled handler."""
+
+    match: Callable[[WebRequest[Any]], Awaitable[RouteParams]] | None
+    """Async route matcher, or ``None`` to call ``match_sync``."""
+    match_sync: Callable[[WebRequest[Any]], RouteParams]
+    verify: Callable[..., Awaitable[None]] | None
+    verify_sync: Callable[..., None] | None
+    """Sync verifier, called instead of ``verify`` when set."""
+    rate_limit: Callable[[Target], Awaitable[float | None]] | None
+    static_target: tuple[Target, Bot] | None
+    """Target and bot of every request, or ``None`` to resolve them per request."""
+    feed: Callable[..., Awaitable[Any]]
+
 
 class BaseWebhookEngine(ABC, Generic[AppT, RawRequestT, FrameworkResponseT]):
     def __init__(
@@ -37,12 +70,37 @@ class BaseWebhookEngine(ABC, Generic[AppT, RawRequestT, FrameworkResponseT]):
         security: Security | None = None,
         handle_in_background: bool = True,
         shutdown_timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        lanes: PriorityLanes | None = None,
+        deadlines: Deadlines | None = None,
+        journal: UpdateJournal | None = None,
+        spill: SpillFile | None = None,
+        workers: WorkerPool | None = None,
     ) -> None:
+        background = {"lanes": lanes, "deadlines": deadlines, "journal": journal, "spill": spill, "workers": workers}
+        if not handle_in_background and (unused := [name for name, value in background.items() if value is not None]):
+            raise ValueError(
+                f"{', '.join(unused)} require handle_in_background=True: foreground updates are fed in the request."
+            )
+        if journal is not None and spill is not None:
+            raise ValueError("journal and spill both replay unfinished updates; configure only one of them.")
+        in_process = {"lanes": lanes, "deadlines": deadlines, "journal": journal, "spill": spill}
+        if workers is not None and (unsupported := [name for name, value in in_process.items() if value is not None]):
+            raise ValueError(
+                f"workers cannot be combined with {', '.join(unsupported)}: they apply to in-process dispatch."
+            )
+
         self.dispatcher = dispatcher
         self.web = web
         self.route = route
         self.security = security
         self.handle_in_background = handle_in_background
+        self.rate_limiter = rate_limiter
+        self.lanes = lanes
+        self.deadlines = deadlines
+        self.journal = journal
+        self.spill = spill
+        self.workers = workers
 
         self.shutdown_timeout = shutdown_timeout
         self._is_shutting_down = False
@@ -59,55 +117,313 @@ class BaseWebhookEngine(ABC, Generic[AppT, RawRequestT, FrameworkResponseT]):
         self.web.register(
             app=app,
             path=self.route.path,
-            handler=self.handle_request,
+            handler=self._compile_handler(),
             on_startup=self.on_startup,
             on_shutdown=self.on_shutdown,
         )
 
     async def handle_request(self, request: WebRequest[RawRequestT]) -> FrameworkResponseT:
+        return await self._handle(request, self._generic_pipeline())
+
+    def _compile_handler(self) -> Callable[[WebRequest[RawRequestT]], Awaitable[FrameworkResponseT]]:
+        """
+        Build the request handler :meth:`register` installs, specialized for the current configuration.
+
+        It runs the same steps as :meth:`handle_request`, but route matching, security and rate limiting are left
+        out when they have nothing to do, and a target and bot that do not depend on the request are resolved once.
+        Subclasses that override :meth:`handle_request`, :meth:`Route.match` or :meth:`Security.verify` keep
+        their override. Configuration changed after :meth:`register` is not picked up.
+        """
+        if type(self).handle_request is not BaseWebhookEngine.handle_request:
+            return self.handle_request
+        return partial(self._handle, pipeline=self._compile_pipeline())
+
+    async def _handle(self, request: WebRequest[RawRequestT], pipeline: _Pipeline) -> FrameworkResponseT:
+        if (banned := self._reject_banned(request)) is not None:
+            return banned
+
         try:
             if self._is_shutting_down:
                 raise RequestHandlingStoppedError
 
-            route_params = await self.route.match(request)
+            route_params = pipeline.match_sync(request) if pipeline.match is None else await pipeline.match(request)
+            if pipeline.static_target is None:
+                target, bot = await self._find_target(request, route_params), None
+            else:
+                target, bot = pipeline.static_target
 
-            target = await self._resolve_target(request=request, route_params=route_params)
-            if target is None:
-                raise TargetNotFoundError(route_param_names=route_params.keys())
+            if pipeline.verify_sync is not None:
+                pipeline.verify_sync(target=target, request=request, route_params=route_params)
+            elif pipeline.verify is not None:
+                await pipeline.verify(target=target, request=request, route_params=route_params)
 
-            if self.security is not None:
-                await self.security.verify(target=target, request=request, route_params=route_params)
+            delay = 0.0 if pipeline.rate_limit is None else await pipeline.rate_limit(target)
+            if delay is None:
+                return self.web.json_response(status_code=200, data={})
 
-            bot = await self._resolve_bot(target=target)
             if bot is None:
-                raise BotNotFoundError(target_bot_id=target.bot_id, target_type=target.__class__.__name__)
+                bot = await self._find_bot(target)
+            return await pipeline.feed(request, target, bot, await _read_update(request), delay)
 
-            try:
-                update = await request.json()
-            except ValueError as exc:
-                raise InvalidJsonError(original_error=exc) from exc
+        except AiogramWebhookError as exc:
+            return self._error_response(request, exc)
 
-            if self.handle_in_background:
-                self._get_task_tracker(bot).spawn(self._background_feed(bot, update))
-            else:
-                result = await self.dispatcher.feed_webhook_update(bot=bot, update=update)
-                if isinstance(result, TelegramMethod):
-                    return self.web.payload_response(status_code=200, payload=build_webhook_payload(bot, result))
+    def _generic_pipeline(self) -> _Pipeline:
+        return _Pipeline(
+            match=self.route.match,
+            match_sync=_no_route_params,
+            verify=None if self.security is None else self.security.verify,
+            verify_sync=None,
+            rate_limit=self._apply_rate_limit,
+            static_target=None,
+            feed=self._feed_background if self.handle_in_background else self._feed_foreground,
+        )
 
-            return self.web.json_response(status_code=200, data={})
+    def _compile_pipeline(self) -> _Pipeline:
+        match, match_sync = self._compile_route()
+        verify, verify_sync = self._compile_security()
+        return _Pipeline(
+            match=match,
+            match_sync=match_sync,
+            verify=verify,
+            verify_sync=verify_sync,
+            rate_limit=None if self.rate_limiter is None else self._apply_rate_limit,
+            static_target=self._static_target(),
+            feed=self._feed_background if self.handle_in_background else self._feed_foreground,
+        )
 
-        except AiogramWebhookError as exc:
+    def _reject_banned(self, request: WebRequest[RawRequestT]) -> FrameworkResponseT | None:
+        """:return: The response for a client banned by the security ban list, or ``None`` to handle the request."""
+        security = self.security
+        if security is None or security.bans is None or not security.is_banned(request):
+            return None
+        return self.web.json_response(status_code=security.bans.status_code, data=security.bans.response_payload)
+
+    def _error_response(self, request: WebRequest[RawRequestT], exc: AiogramWebhookError) -> FrameworkResponseT:
+        log_webhook_error(logger, exc)
+        if self.security is not None:
+            self.security.record_failure(request, exc)
+
+        return self.web.json_response(status_code=exc.status_code, data=exc.response_payload())
+
+    def _compile_route(
+        self,
+    ) -> tuple[
+        Callable[[WebRequest[RawRequestT]], Awaitable[RouteParams]] | None,
+        Callable[[WebRequest[RawRequestT]], RouteParams],
+    ]:
+        """:return: The async route matcher, or ``None`` when the sync one can be called instead."""
+        if type(self.route).match is not Route.match:
+            return self.route.match, _no_route_params
+        if self.route.matches_any_request:
+            return None, _no_route_params
+        if self.route.matches_synchronously:
+            return None, self.route.match_sync
+        return self.route.match, _no_route_params
+
+    def _compile_security(
+        self,
+    ) -> tuple[Callable[..., Awaitable[None]] | None, Callable[..., None] | None]:
+        """:return: The async and the sync verifier; at most one is set, none when security can be skipped."""
+        if self.security is None:
+            return None, None
+        if type(self.security).verify is not Security.verify:
+            return self.security.verify, None
+        if self.security.is_noop:
+            return None, None
+        if self.security.verifies_synchronously:
+            return None, self.security.verify_sync
+        return self.security.verify, None
+
+    def _static_target(self) -> tuple[Target, Bot] | None:
+        """
+        Get the target and bot every request resolves to, when they do not depend on the request.
+
+        :return: The target and bot, or ``None`` when they are resolved per request.
+        """
+        return None
+
+    async def _find_target(self, request: WebRequest[RawRequestT], route_params: RouteParams) -> Target:
+        target = await self._resolve_target(request=request, route_params=route_params)
+        if target is None:
+            raise TargetNotFoundError(route_param_names=route_params.keys())
+        return target
+
+    async def _find_bot(self, target: Target) -> Bot:
+        bot = await self._resolve_bot(target=target)
+        if bot is None:
+            raise BotNotFoundError(target_bot_id=target.bot_id, target_type=target.__class__.__name__)
+        return bot
+
+    async def _feed_background(
+        self, request: WebRequest[RawRequestT], target: Target, bot: Bot, update: dict[str, Any], delay: float
+    ) -> FrameworkResponseT:
+        await self._dispatch_background(request, target, bot, update, delay)
+        return self.web.json_response(status_code=200, data={})
+
+    async def _feed_foreground(
+        self,
+        request: WebRequest[RawRequestT],  # noqa: ARG002
+        target: Target,  # noqa: ARG002
+        bot: Bot,
+        update: dict[str, Any],
+        delay: float,  # noqa: ARG002
+    ) -> FrameworkResponseT:
+        result = await self.dispatcher.feed_webhook_update(bot=bot, update=update)
+        if isinstance(result, TelegramMethod):
+            return self.web.payload_response(status_code=200, payload=build_webhook_payload(bot, result))
+        return self.web.json_response(status_code=200, data={})
+
+    async def _apply_rate_limit(self, target: Target) -> float | None:
+        """
+        Apply the rate limiter to an incoming update.
+
+        Deferred foreground updates wait here, before the request body is read.
+
+        :return: Background dispatch delay in seconds, or ``None`` when the update must be acknowledged and dropped.
+        """
+        if self.rate_limiter is None:
+            return 0.0
+
+        delay = self.rate_limiter.acquire(target.bot_id)
+        if delay is None:
+            if self.rate_limiter.policy is not RateLimitPolicy.DROP:
+                raise RateLimitExceededError(target_bot_id=target.bot_id)
+
+            logger.debug("Dropped webhook update for bot %s: rate limit exceeded", target.bot_id)
+        elif delay and not self.handle_in_background:
+            await asyncio.sleep(delay)
+            return 0.0
+
+        return delay
+
+    async def _dispatch_background(
+        self, request: WebRequest[RawRequestT], target: Target, bot: Bot, update: dict[str, Any], delay: float
+    ) -> None:
+        if self.workers is None:
+            if self.lanes is not None and not delay:
+                # A full lane is rejected before anything is persisted; Telegram redelivers the update.
+                self.lanes.ensure_room(get_update_type(update))
+            journal_id = await self._persist_update(target, request)
+            self._spawn_background(bot, update, delay=delay, journal_id=journal_id)
+        elif delay:
+            self._get_task_tracker(bot).spawn(
+                self._submit_later(self.workers, bot, update, await request.read(), delay)
+            )
+        else:
+            self.workers.submit(bot, update, await request.read())
+
+    async def _submit_later(
+        self, workers: WorkerPool, bot: Bot, update: dict[str, Any], body: bytes, delay: float
+    ) -> None:
+        await asyncio.sleep(delay)
+
+        try:
+            workers.submit(bot, update, body)
+        except BackgroundError as exc:
+            log_webhook_error(logger, exc)
+
+    async def _persist_update(self, target: Target, request: WebRequest[RawRequestT]) -> int | None:
+        """Append the raw update to the journal before it is acknowledged."""
+        if self.journal is None:
+            return None
+
+        try:
+            return await self.journal.append(target, await request.read())
+        except Exception as exc:
+            raise JournalWriteError(target_bot_id=target.bot_id, original_error=exc) from exc
+
+    def _spawn_background(
+        self, bot: Bot, update: dict[str, Any], delay: float = 0.0, journal_id: int | None = None
+    ) -> None:
+        spill_key = self._track_spill(bot, update)
+        job = partial(self._background_feed, bot, update, journal_id=journal_id, spill_key=spill_key)
+
+        if self.lanes is None:
+            self._get_task_tracker(bot).spawn(job(delay=delay))
+        elif delay:
+            self._get_task_tracker(bot).spawn(self._enqueue_later(self.lanes, job, get_update_type(update), delay))
+        else:
+            try:
+                self.lanes.put(get_update_type(update), job)
+            except BackgroundError:
+                # The request is answered with an error and Telegram redelivers the update, so it must not be
+                # replayed from the journal or the spill file as well.
+                self._finish_update(journal_id, spill_key)
+                raise
+
+    async def _enqueue_later(
+        self, lanes: PriorityLanes, job: Callable[[], Awaitable[None]], update_type: str | None, delay: float
+    ) -> None:
+        await asyncio.sleep(delay)
+
+        # The update was already acknowledged, so a full lane is waited on rather than answered with an error.
+        # Closed lanes leave the journal entry or spilled update to be replayed on the next start.
+        try:
+            await lanes.put_waiting(update_type, job)
+        except BackgroundError as exc:
             log_webhook_error(logger, exc)
 
-            return self.web.json_response(status_code=exc.status_code, data=exc.response_payload())
+    def _track_spill(self, bot: Bot, update: dict[str, Any]) -> int | None:
+        if self.spill is None:
+            return None
+        return self.spill.track(bot, update)
+
+    async def _replay_spill(self, spill: SpillFile) -> None:
+        entries = await spill.load()
+        if entries:
+            logger.info("Replaying %s spilled webhook update(s)", len(entries))
+
+        for entry in entries:
+            bot = await self._resolve_bot(target=Target(bot_id=entry.bot_id, bot_token=entry.bot_token))
+            if bot is None:
+                logger.warning("Skipping spilled update for bot %s: bot was not found", entry.bot_id)
+                continue
+
+            spill_key = spill.track(bot, entry.update)
+            self._get_task_tracker(bot).spawn(self._background_feed(bot, entry.update, spill_key=spill_key))
+
+    async def _replay_journal(self, journal: UpdateJournal) -> None:
+        entries = await journal.pending()
+        if entries:
+            logger.info("Replaying %s journaled webhook update(s)", len(entries))
+
+        for entry in entries:
+            bot = await self._resolve_bot(target=Target(bot_id=entry.bot_id, bot_token=entry.bot_token))
+            if bot is None:
+                logger.warning("Skipping journaled update %s: bot %s was not found", entry.id, entry.bot_id)
+                continue
+
+            self._get_task_tracker(bot).spawn(
+                self._background_feed(bot, json.loads(entry.payload), journal_id=entry.id)
+            )
 
     async def on_startup(self, app: AppT, *args: Any, **kwargs: Any) -> None:
         await self._on_startup(app, *args, **kwargs)
+        if self.lanes is not None:
+            self.lanes.start()
+        if self.workers is not None:
+            await self.workers.start()
+        if self.spill is not None:
+            await self._replay_spill(self.spill)
+        if self.journal is not None:
+            await self._replay_journal(self.journal)
         self._is_shutting_down = False
 
     async def on_shutdown(self, app: AppT, *args: Any, **kwargs: Any) -> None:
         self._is_shutting_down = True
+        if self.lanes is not None:
+            await self.lanes.close(timeout=self.shutdown_timeout)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.shutdown_timeout
         await self._on_shutdown(app, *args, **kwargs)
+        if self.workers is not None:
+            # Workers get what is left of the timeout after delayed submissions were drained.
+            await self.workers.close(timeout=max(deadline - loop.time(), 0.0))
+        if self.spill is not None:
+            await self.spill.dump()
+        if self.journal is not None:
+            await self.journal.close()
 
     @abstractmethod
     async def _on_startup(self, app: AppT, *args: Any, **kwargs: Any) -> None:
@@ -127,7 +443,38 @@ class BaseWebhookEngine(ABC, Generic[AppT, RawRequestT, FrameworkResponseT]):
     def _get_task_tracker(self, bot: Bot) -> TaskTracker:
         raise NotImplementedError
 
-    async def _background_feed(self, bot: Bot, update: dict[str, Any]) -> None:
+    async def _background_feed(
+        self,
+        bot: Bot,
+        update: dict[str, Any],
+        delay: float = 0.0,
+        journal_id: int | None = None,
+        spill_key: int | None = None,
+    ) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+
+        cancelled = False
+        try:
+            if self.deadlines is None:
+                await self._process_update(bot, update)
+            else:
+                await self.deadlines.run(self._process_update(bot, update), bot_id=bot.id, update=update)
+        except asyncio.CancelledError:
+            # A cancelled update stays in the journal and the spill registry and is replayed on the next startup.
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                self._finish_update(journal_id, spill_key)
+
+    def _finish_update(self, journal_id: int | None, spill_key: int | None) -> None:
+        if journal_id is not None and self.journal is not None:
+            self.journal.ack(journal_id)
+        if spill_key is not None and self.spill is not None:
+            self.spill.done(spill_key)
+
+    async def _process_update(self, bot: Bot, update: dict[str, Any]) -> None:
         result = await self.dispatcher.feed_raw_update(bot=bot, update=update)
 
         if isinstance(result, TelegramMethod):
@@ -141,3 +488,14 @@ class BaseWebhookEngine(ABC, Generic[AppT, RawRequestT, FrameworkResponseT]):
             "webhook_engine": self,
             **kwargs,
         }
+
+
+def _no_route_params(request: WebRequest[Any]) -> RouteParams:  # noqa: ARG001
+    return _NO_ROUTE_PARAMS
+
+
+async def _read_update(request: WebRequest[Any]) -> dict[str, Any]:
+    try:
+        return await request.json()
+    except ValueError as exc:
+        raise InvalidJsonError(original_error=exc) from exc
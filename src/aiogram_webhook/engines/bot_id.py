@@ -0,0 +1,97 @@
+from typing import Generic
+
+from aiogram import Bot
+from aiogram.utils.token import extract_bot_id
+
+from aiogram_webhook.background.deadlines import Deadlines
+from aiogram_webhook.background.journal import UpdateJournal
+from aiogram_webhook.background.lanes import PriorityLanes
+from aiogram_webhook.background.spill import SpillFile
+from aiogram_webhook.background.workers import WorkerPool
+from aiogram_webhook.configs.bot import BotConfig
+from aiogram_webhook.configs.webhook import WebhookConfig
+from aiogram_webhook.engines.base import AppT, FrameworkResponseT, RawRequestT
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.engines.token import TokenEngine
+from aiogram_webhook.limits.limiter import RateLimiter
+from aiogram_webhook.route import Route
+from aiogram_webhook.route.params import RouteParams
+from aiogram_webhook.security import Security
+from aiogram_webhook.tokens import CachedTokenStore, TokenStore
+from aiogram_webhook.web.base import WebAdapter, WebRequest
+
+
+class BotIdEngine(TokenEngine[AppT, RawRequestT, FrameworkResponseT], Generic[AppT, RawRequestT, FrameworkResponseT]):
+    """
+    Multi-bot engine that routes on the bot id and looks the token up in a token store.
+
+    Tokens never appear in webhook URLs. Lookups go through a :class:`~aiogram_webhook.tokens.CachedTokenStore`,
+    which is put in front of ``tokens`` unless it already is one.
+    """
+
+    def __init__(
+        self,
+        dispatcher,
+        web: WebAdapter[AppT, RawRequestT, FrameworkResponseT],
+        route: Route,
+        tokens: TokenStore,
+        security: Security | None = None,
+        bot_config: BotConfig | None = None,
+        webhook_config: WebhookConfig | None = None,
+        handle_in_background: bool = True,
+        shutdown_timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        lanes: PriorityLanes | None = None,
+        deadlines: Deadlines | None = None,
+        journal: UpdateJournal | None = None,
+        spill: SpillFile | None = None,
+        workers: WorkerPool | None = None,
+    ) -> None:
+        super().__init__(
+            dispatcher=dispatcher,
+            web=web,
+            route=route,
+            security=security,
+            bot_config=bot_config,
+            webhook_config=webhook_config,
+            handle_in_background=handle_in_background,
+            shutdown_timeout=shutdown_timeout,
+            rate_limiter=rate_limiter,
+            lanes=lanes,
+            deadlines=deadlines,
+            journal=journal,
+            spill=spill,
+            workers=workers,
+        )
+
+        self.tokens = tokens if isinstance(tokens, CachedTokenStore) else CachedTokenStore(tokens)
+
+    async def add_bot(self, token: str, webhook_config: WebhookConfig | None = None) -> Bot:
+        """Store the bot token and set the bot's webhook."""
+        await self.tokens.set(extract_bot_id(token), token)
+        return await super().add_bot(token, webhook_config=webhook_config)
+
+    async def remove_bot(self, bot_id: int, delete_webhook: bool, drop_pending_updates: bool | None = None) -> bool:
+        """
+        Delete the bot token from the store and drop the bot.
+
+        :return: Whether the bot was loaded; its token is deleted either way.
+        """
+        removed = await super().remove_bot(bot_id, delete_webhook, drop_pending_updates)
+        await self.tokens.delete(bot_id)
+        return removed
+
+    async def _resolve_target(self, request: WebRequest[RawRequestT], route_params: RouteParams) -> Target | None:  # noqa: ARG002
+        bot_id = route_params.get("bot_id")
+        if not isinstance(bot_id, int) or isinstance(bot_id, bool):
+            return None
+
+        bot_token = await self.tokens.get(bot_id)
+        if bot_token is None:
+            return None
+
+        return Target(bot_id=bot_id, bot_token=bot_token)
+
+    async def _on_shutdown(self, app: AppT, *args, **kwargs) -> None:
+        await super()._on_shutdown(app, *args, **kwargs)
+        await self.tokens.close()
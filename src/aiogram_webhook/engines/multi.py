@@ -6,8 +6,14 @@ from typing import Any, Generic
 from aiogram import Bot
 
 from aiogram_webhook import WebhookConfig
+from aiogram_webhook.background.deadlines import Deadlines
+from aiogram_webhook.background.journal import UpdateJournal
+from aiogram_webhook.background.lanes import PriorityLanes
+from aiogram_webhook.background.spill import SpillFile
+from aiogram_webhook.background.workers import WorkerPool
 from aiogram_webhook.engines.base import AppT, BaseWebhookEngine, FrameworkResponseT, RawRequestT, logger
 from aiogram_webhook.engines.target import Target
+from aiogram_webhook.limits.limiter import RateLimiter
 from aiogram_webhook.route import Route
 from aiogram_webhook.security import Security
 from aiogram_webhook.tasks import TaskTracker
@@ -27,6 +33,12 @@ class BaseMultiBotEngine(
         webhook_config: WebhookConfig | None = None,
         handle_in_background: bool = True,
         shutdown_timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        lanes: PriorityLanes | None = None,
+        deadlines: Deadlines | None = None,
+        journal: UpdateJournal | None = None,
+        spill: SpillFile | None = None,
+        workers: WorkerPool | None = None,
     ) -> None:
         self._task_trackers: dict[int, TaskTracker] = {}
         self._bots: dict[int, Bot] = {}
@@ -38,6 +50,12 @@ class BaseMultiBotEngine(
             security=security,
             handle_in_background=handle_in_background,
             shutdown_timeout=shutdown_timeout,
+            rate_limiter=rate_limiter,
+            lanes=lanes,
+            deadlines=deadlines,
+            journal=journal,
+            spill=spill,
+            workers=workers,
         )
 
     async def _build_webhook_kwargs(
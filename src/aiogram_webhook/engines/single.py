@@ -2,9 +2,15 @@ from typing import Generic
 
 from aiogram import Bot
 
+from aiogram_webhook.background.deadlines import Deadlines
+from aiogram_webhook.background.journal import UpdateJournal
+from aiogram_webhook.background.lanes import PriorityLanes
+from aiogram_webhook.background.spill import SpillFile
+from aiogram_webhook.background.workers import WorkerPool
 from aiogram_webhook.configs.webhook import WebhookConfig
 from aiogram_webhook.engines.base import AppT, BaseWebhookEngine, FrameworkResponseT, RawRequestT, logger
 from aiogram_webhook.engines.target import Target
+from aiogram_webhook.limits.limiter import RateLimiter
 from aiogram_webhook.route import Route
 from aiogram_webhook.route.params import RouteParams
 from aiogram_webhook.tasks import TaskTracker
@@ -24,6 +30,12 @@ class SingleBotEngine(
         security=None,
         handle_in_background: bool = True,
         shutdown_timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        lanes: PriorityLanes | None = None,
+        deadlines: Deadlines | None = None,
+        journal: UpdateJournal | None = None,
+        spill: SpillFile | None = None,
+        workers: WorkerPool | None = None,
     ) -> None:
         self.bot = bot
         self._task_tracker = TaskTracker()
@@ -35,8 +47,23 @@ class SingleBotEngine(
             security=security,
             handle_in_background=handle_in_background,
             shutdown_timeout=shutdown_timeout,
+            rate_limiter=rate_limiter,
+            lanes=lanes,
+            deadlines=deadlines,
+            journal=journal,
+            spill=spill,
+            workers=workers,
         )
 
+    def _static_target(self) -> tuple[Target, Bot] | None:
+        # Subclasses that resolve per request keep the generic path.
+        if (
+            self._resolve_target.__func__ is not SingleBotEngine._resolve_target
+            or self._resolve_bot.__func__ is not SingleBotEngine._resolve_bot
+        ):
+            return None
+        return Target(bot_id=self.bot.id, bot_token=self.bot.token), self.bot
+
     async def _resolve_target(self, request: WebRequest[RawRequestT], route_params: RouteParams) -> Target | None:  # noqa: ARG002
         return Target(bot_id=self.bot.id, bot_token=self.bot.token)
 
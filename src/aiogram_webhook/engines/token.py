@@ -5,11 +5,17 @@ from aiogram import Bot
 from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.utils.token import TokenValidationError, extract_bot_id
 
+from aiogram_webhook.background.deadlines import Deadlines
+from aiogram_webhook.background.journal import UpdateJournal
+from aiogram_webhook.background.lanes import PriorityLanes
+from aiogram_webhook.background.spill import SpillFile
+from aiogram_webhook.background.workers import WorkerPool
 from aiogram_webhook.configs.bot import BotConfig
 from aiogram_webhook.configs.webhook import WebhookConfig
 from aiogram_webhook.engines.base import AppT, FrameworkResponseT, RawRequestT, logger
 from aiogram_webhook.engines.multi import BaseMultiBotEngine
 from aiogram_webhook.engines.target import Target
+from aiogram_webhook.limits.limiter import RateLimiter
 from aiogram_webhook.route import Route
 from aiogram_webhook.route.params import RouteParams
 from aiogram_webhook.web.base import WebAdapter, WebRequest
@@ -31,6 +37,12 @@ class TokenEngine(
         webhook_config: WebhookConfig | None = None,
         handle_in_background: bool = True,
         shutdown_timeout: float = 10.0,
+        rate_limiter: RateLimiter | None = None,
+        lanes: PriorityLanes | None = None,
+        deadlines: Deadlines | None = None,
+        journal: UpdateJournal | None = None,
+        spill: SpillFile | None = None,
+        workers: WorkerPool | None = None,
     ) -> None:
         super().__init__(
             dispatcher=dispatcher,
@@ -40,6 +52,12 @@ class TokenEngine(
             webhook_config=webhook_config,
             handle_in_background=handle_in_background,
             shutdown_timeout=shutdown_timeout,
+            rate_limiter=rate_limiter,
+            lanes=lanes,
+            deadlines=deadlines,
+            journal=journal,
+            spill=spill,
+            workers=workers,
         )
 
         self.bot_config = bot_config or BotConfig()
@@ -74,6 +92,9 @@ class TokenEngine(
             await tracker.close(timeout=self.shutdown_timeout)
         self._bots.pop(bot_id, None)
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.forget(bot_id)
+
         logger.info("Removed bot %s from token engine", bot_id)
 
         return True
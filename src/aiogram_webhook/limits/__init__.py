@@ -0,0 +1,3 @@
+from aiogram_webhook.limits.limiter import RateLimit, RateLimiter, RateLimitPolicy
+
+__all__ = ("RateLimit", "RateLimitPolicy", "RateLimiter")
@@ -0,0 +1,19 @@
+import logging
+
+from aiogram_webhook.errors import AiogramWebhookError
+
+
+class RateLimitError(AiogramWebhookError):
+    code = "rate_limit_error"
+
+
+class RateLimitExceededError(RateLimitError):
+    code = "rate_limit_exceeded"
+    status_code = 429
+    public_detail = "Too many requests"
+    log_level = logging.INFO
+
+    def __init__(self, *, target_bot_id: int) -> None:
+        self.target_bot_id = target_bot_id
+
+        super().__init__(f"Webhook rate limit exceeded. Target bot id: {target_bot_id}.")
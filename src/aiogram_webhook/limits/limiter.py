@@ -0,0 +1,166 @@
+import time
+from array import array
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from enum import Enum
+
+
+class RateLimitPolicy(str, Enum):
+    """What the engine does with an update that exceeds the bot rate limit."""
+
+    REJECT = "reject"
+    """Respond with ``429 Too Many Requests``; Telegram retries the update later."""
+    DROP = "drop"
+    """Acknowledge the update with ``200`` and discard it."""
+    DEFER = "defer"
+    """Acknowledge the update and dispatch it once the bucket refills."""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Token bucket settings for one bot."""
+
+    rate: float
+    """Sustained number of updates per second."""
+    burst: int = 1
+    """Maximum number of updates accepted at once after an idle period."""
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("Rate limit rate must be greater than zero.")
+        if self.burst < 1:
+            raise ValueError("Rate limit burst must be at least 1.")
+
+
+class RateLimiter:
+    """
+    Per-bot token bucket limiter keyed by ``Target.bot_id``.
+
+    Bucket state is stored in two flat ``array('d')`` columns (token balance and last refill time),
+    so every tracked bot costs a dict slot and 16 bytes regardless of its limit.
+    """
+
+    __slots__ = ("_clock", "_default", "_free", "_limits", "_slots", "_stamps", "_tokens", "max_deferred", "policy")
+
+    def __init__(
+        self,
+        default: RateLimit | None = None,
+        *,
+        limits: Mapping[int, RateLimit] | None = None,
+        policy: RateLimitPolicy = RateLimitPolicy.REJECT,
+        max_deferred: int = 100,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param default: Limit applied to bots without an explicit limit. ``None`` leaves them unlimited.
+        :param limits: Explicit per-bot limits keyed by bot id.
+        :param policy: Overflow policy for updates that exceed the limit.
+        :param max_deferred: Maximum number of deferred updates per bot when ``policy`` is ``DEFER``.
+        :param clock: Monotonic clock returning seconds.
+        """
+        if max_deferred < 0:
+            raise ValueError("max_deferred must not be negative.")
+
+        self.policy = policy
+        self.max_deferred = max_deferred
+        self._default = default
+        self._limits: dict[int, RateLimit] = dict(limits or {})
+        self._clock = clock
+
+        self._slots: dict[int, int] = {}
+        self._tokens = array("d")
+        self._stamps = array("d")
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        """Return the number of bots with tracked bucket state."""
+        return len(self._slots)
+
+    def get_limit(self, bot_id: int) -> RateLimit | None:
+        return self._limits.get(bot_id, self._default)
+
+    def set_limit(self, bot_id: int, limit: RateLimit | None) -> None:
+        """
+        Set an explicit limit for a bot.
+
+        :param bot_id: Bot id.
+        :param limit: New limit, or ``None`` to fall back to the default limit.
+        """
+        if limit is None:
+            self._limits.pop(bot_id, None)
+        else:
+            self._limits[bot_id] = limit
+
+        self.forget(bot_id)
+
+    def acquire(self, bot_id: int) -> float | None:
+        """
+        Take one token from the bot bucket.
+
+        :param bot_id: Bot id the update belongs to.
+        :return: ``0.0`` when the update may be dispatched now, a positive delay in seconds when it was deferred,
+            or ``None`` when the update exceeds the limit.
+        """
+        limit = self._limits.get(bot_id, self._default)
+        if limit is None:
+            return 0.0
+
+        now = self._clock()
+        slot = self._slots.get(bot_id)
+        if slot is None:
+            slot = self._allocate(bot_id, tokens=float(limit.burst), now=now)
+
+        tokens = min(float(limit.burst), self._tokens[slot] + (now - self._stamps[slot]) * limit.rate)
+        self._stamps[slot] = now
+
+        if tokens >= 1.0:
+            self._tokens[slot] = tokens - 1.0
+            return 0.0
+
+        if self.policy is RateLimitPolicy.DEFER and tokens - 1.0 >= -self.max_deferred:
+            # A negative balance reserves a future token; it is repaid at ``rate`` tokens per second.
+            self._tokens[slot] = tokens - 1.0
+            return (1.0 - tokens) / limit.rate
+
+        self._tokens[slot] = tokens
+        return None
+
+    def forget(self, bot_id: int) -> None:
+        """Drop bucket state for a bot, for example after the bot was removed."""
+        slot = self._slots.pop(bot_id, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def prune(self) -> int:
+        """
+        Drop buckets that have fully refilled.
+
+        A full bucket behaves exactly like a fresh one, so pruning never changes limiter decisions.
+
+        :return: Number of dropped buckets.
+        """
+        now = self._clock()
+        idle = []
+
+        for bot_id, slot in self._slots.items():
+            limit = self._limits.get(bot_id, self._default)
+            if limit is None or self._tokens[slot] + (now - self._stamps[slot]) * limit.rate >= limit.burst:
+                idle.append(bot_id)
+
+        for bot_id in idle:
+            self.forget(bot_id)
+
+        return len(idle)
+
+    def _allocate(self, bot_id: int, *, tokens: float, now: float) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self._tokens[slot] = tokens
+            self._stamps[slot] = now
+        else:
+            slot = len(self._tokens)
+            self._tokens.append(tokens)
+            self._stamps.append(now)
+
+        self._slots[bot_id] = slot
+        return slot
@@ -1,6 +1,6 @@
 from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Protocol, TypeAlias
+from typing import Any, Protocol, TypeAlias, runtime_checkable
 
 from aiogram_webhook.engines.target import Target
 
@@ -21,23 +21,60 @@ class RouteParam(Protocol):
         """
 
 
+@runtime_checkable
+class SyncRouteParam(Protocol):
+    """
+    Route param that builds and parses without I/O.
+
+    :class:`Route` detects it once at construction and calls these methods directly instead of awaiting the
+    :class:`RouteParam` ones, which must still be provided for callers that await them.
+    """
+
+    def build_sync(self, target: Target, params: RouteParams) -> str:
+        """
+        Build raw path param value for an outgoing URL.
+        """
+
+    def parse_sync(self, value: str, params: RouteParams) -> Any:
+        """
+        Parse incoming framework path param into a normalized route param value.
+        """
+
+
 @dataclass(frozen=True, slots=True)
 class RouteParamBinding:
     name: str
     param: RouteParam
+    sync_param: SyncRouteParam | None = None
+
+    @classmethod
+    def bind(cls, name: str, param: RouteParam) -> "RouteParamBinding":
+        return cls(name=name, param=param, sync_param=param if isinstance(param, SyncRouteParam) else None)
 
 
-class BotIdParam(RouteParam):
-    async def build(self, target: Target, params: RouteParams) -> str:  # noqa: ARG002
+class BotIdParam(RouteParam, SyncRouteParam):
+    async def build(self, target: Target, params: RouteParams) -> str:
+        return self.build_sync(target, params)
+
+    async def parse(self, value: str, params: RouteParams) -> int:
+        return self.parse_sync(value, params)
+
+    def build_sync(self, target: Target, params: RouteParams) -> str:  # noqa: ARG002
         return str(target.bot_id)
 
-    async def parse(self, value: str, params: RouteParams) -> int:  # noqa: ARG002
+    def parse_sync(self, value: str, params: RouteParams) -> int:  # noqa: ARG002
         return int(value)
 
 
-class BotTokenParam(RouteParam):
-    async def build(self, target: Target, params: RouteParams) -> str:  # noqa: ARG002
+class BotTokenParam(RouteParam, SyncRouteParam):
+    async def build(self, target: Target, params: RouteParams) -> str:
+        return self.build_sync(target, params)
+
+    async def parse(self, value: str, params: RouteParams) -> str:
+        return self.parse_sync(value, params)
+
+    def build_sync(self, target: Target, params: RouteParams) -> str:  # noqa: ARG002
         return target.bot_token
 
-    async def parse(self, value: str, params: RouteParams) -> str:  # noqa: ARG002
+    def parse_sync(self, value: str, params: RouteParams) -> str:  # noqa: ARG002
         return value
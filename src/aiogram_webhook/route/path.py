@@ -1,4 +1,6 @@
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from string import Formatter
 
 from yarl import URL
@@ -29,6 +31,19 @@ class PathTemplate:
         except ValueError as exc:
             raise RouteBuildInvalidPathTemplateError(path=self.value) from exc
 
+    def match(self, path: str) -> dict[str, str] | None:
+        """
+        Match a request path against the template.
+
+        :param path: Decoded request path.
+        :return: Path param values, or ``None`` when the path does not match.
+        """
+        if not self.param_names and "{" not in self.value:
+            return {} if path == self.value else None
+
+        match = compile_path_pattern(self.value).fullmatch(path)
+        return match.groupdict() if match is not None else None
+
 
 def normalize_path(path: str | URL) -> str:
     url = path if isinstance(path, URL) else URL(path)
@@ -85,3 +100,16 @@ def extract_path_param_names(path_template: str) -> tuple[str, ...]:
         names.append(field_name)
 
     return tuple(names)
+
+
+@lru_cache(maxsize=128)
+def compile_path_pattern(path_template: str) -> re.Pattern[str]:
+    """Compile a path template into a regular expression with one named group per path param segment."""
+    parts: list[str] = []
+
+    for literal, field_name, _, _ in Formatter().parse(path_template):
+        parts.append(re.escape(literal))
+        if field_name is not None:
+            parts.append(f"(?P<{field_name}>[^/]+)")
+
+    return re.compile("".join(parts))
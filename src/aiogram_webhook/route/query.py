@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from collections.abc import Mapping, Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import TypeAlias
 
 from aiogram_webhook.route.errors import (
@@ -62,10 +62,65 @@ QueryScalar: TypeAlias = QueryValue | str | int
 QueryInput: TypeAlias = QueryScalar | list[QueryScalar] | tuple[QueryScalar, ...]
 
 
+@dataclass(frozen=True, slots=True)
+class QueryCheck:
+    """
+    One precompiled step of :meth:`QuerySpec.match`.
+
+    Values of a param without :class:`Ref` are rendered once, when the spec is built.
+    """
+
+    name: str
+    values: tuple[QueryValue, ...]
+    expected: tuple[str, ...] | None
+    """Rendered values in declared order, or ``None`` when some value depends on route params."""
+    sorted_expected: list[str] | None
+    """Sorted rendered values for multi-value params, compared against the sorted request values."""
+
+    @classmethod
+    def compile(cls, name: str, values: tuple[QueryValue, ...]) -> "QueryCheck":
+        if any(value.required_params() for value in values):
+            return cls(name=name, values=values, expected=None, sorted_expected=None)
+
+        expected = tuple(value.render({}) for value in values)
+        return cls(
+            name=name,
+            values=values,
+            expected=expected,
+            sorted_expected=sorted(expected) if len(expected) > 1 else None,
+        )
+
+    def render(self, params: RouteParams) -> Sequence[str]:
+        if self.expected is not None:
+            return self.expected
+        return [value.render(params) for value in self.values]
+
+    def matches(self, actual: Sequence[str], params: RouteParams) -> bool:
+        expected = self.expected
+        if expected is None:
+            return query_values_match(actual, self.render(params))
+
+        if len(actual) != len(expected):
+            return False
+        if self.sorted_expected is None:
+            return actual[0] == expected[0]
+        return sorted(actual) == self.sorted_expected
+
+
 @dataclass(frozen=True, slots=True)
 class QuerySpec:
     items: tuple[tuple[str, tuple[QueryValue, ...]], ...]
     names: frozenset[str]
+    plan: tuple[QueryCheck, ...] = field(init=False, repr=False, compare=False)
+    """Checks run by :meth:`match`: constant params first, then params rendered from route params."""
+
+    def __post_init__(self) -> None:
+        checks = [QueryCheck.compile(name, values) for name, values in self.items]
+        object.__setattr__(
+            self,
+            "plan",
+            tuple(sorted(checks, key=lambda check: check.expected is None)),
+        )
 
     @classmethod
     def from_mapping(cls, query: Mapping[str, QueryInput] | None) -> "QuerySpec":
@@ -89,20 +144,22 @@ class QuerySpec:
         return tuple((name, value.render(params)) for name, values in self.items for value in values)
 
     def match(self, *, query_params: QueryParams, route_params: RouteParams, strict: bool = False) -> None:
-        for name, expected_values in self.items:
-            actual = [str(value) for value in query_params.getall(name, ())]
+        for check in self.plan:
+            actual = query_params.getall(check.name, ())
 
             if not actual:
-                raise MissingQueryParamError(query_param=name, available_query_params=query_params.keys())
-
-            expected = [value.render(route_params) for value in expected_values]
+                raise MissingQueryParamError(query_param=check.name, available_query_params=query_params.keys())
 
-            if not query_values_match(actual, expected):
-                raise QueryParamMismatchError(query_param=name, expected=expected, got=actual)
+            if not check.matches(actual, route_params):
+                raise QueryParamMismatchError(
+                    query_param=check.name,
+                    expected=check.render(route_params),
+                    got=actual,
+                )
 
-        if strict and (unexpected_query_params := set(query_params.keys()) - self.names):
+        if strict and not self.names.issuperset(query_params.keys()):
             raise UnexpectedQueryParamError(
-                query_params=unexpected_query_params,
+                query_params=set(query_params.keys()) - self.names,
                 expected_query_params=self.names,
             )
 
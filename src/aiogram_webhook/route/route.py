@@ -1,4 +1,5 @@
-from collections.abc import Mapping
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
 from typing import Any, TypeVar
 from urllib.parse import quote
 
@@ -11,19 +12,32 @@ from aiogram_webhook.route.errors import (
     MissingPathParamError,
     UnexpectedQueryParamError,
 )
-from aiogram_webhook.route.params import RouteParam, RouteParamBinding, RouteParams
+from aiogram_webhook.route.params import RouteParam, RouteParamBinding, RouteParams, SyncRouteParam
 from aiogram_webhook.route.path import PathTemplate
 from aiogram_webhook.route.query import QueryInput, QuerySpec
-from aiogram_webhook.route.url import prepare_base_url
+from aiogram_webhook.route.url import compile_url_parts, prepare_base_url
 from aiogram_webhook.web.base import WebRequest
 
 RawRequestT = TypeVar("RawRequestT")
 
+# Path param values yarl would not keep as one literal segment.
+_UNSAFE_SEGMENTS = frozenset(("", ".", ".."))
+
 
 class Route:
     """Universal web route."""
 
-    __slots__ = ("_base_url", "_path_params", "_path_template", "_query", "_strict_query")
+    __slots__ = (
+        "_base_url",
+        "_path_params",
+        "_path_template",
+        "_query",
+        "_strict_query",
+        "_sync_path_params",
+        "_url_cache",
+        "_url_cache_size",
+        "_url_parts",
+    )
 
     def __init__(
         self,
@@ -33,7 +47,17 @@ class Route:
         params: Mapping[str, RouteParam] | None = None,
         query: Mapping[str, QueryInput] | None = None,
         strict_query: bool = False,
+        url_cache_size: int = 0,
     ) -> None:
+        """
+        :param base_url: Public URL the route is served under.
+        :param path: Path template, for example ``"/webhook/{bot_id}"``.
+        :param params: Path param declarations keyed by name.
+        :param query: Query params webhook URLs carry and requests must match.
+        :param strict_query: Reject requests with query params that are not declared.
+        :param url_cache_size: How many built URLs to remember, evicting the least recently used one. Disabled by
+            default; only enable it when every path param builds the same value for a target every time.
+        """
         base_url = prepare_base_url(base_url)
         path_template = PathTemplate.from_input(path)
         route_params = dict(params or {})
@@ -41,8 +65,10 @@ class Route:
 
         validate_route_config(path_template=path_template, params=route_params, query=query_spec)
 
-        path_params = tuple(
-            RouteParamBinding(name=name, param=route_params[name]) for name in path_template.param_names
+        path_params = tuple(RouteParamBinding.bind(name, route_params[name]) for name in path_template.param_names)
+        # Params with synchronous variants are detected once; match_sync() needs all of them to have one.
+        sync_path_params = tuple(
+            (binding.name, param) for binding in path_params if (param := binding.sync_param) is not None
         )
 
         self._base_url = base_url
@@ -50,6 +76,10 @@ class Route:
         self._path_params = path_params
         self._query = query_spec
         self._strict_query = strict_query
+        self._sync_path_params = sync_path_params if len(sync_path_params) == len(path_params) else None
+        self._url_parts = compile_url_parts(base_url, path_template, query_spec)
+        self._url_cache: OrderedDict[Target, str] | None = OrderedDict() if url_cache_size > 0 else None
+        self._url_cache_size = url_cache_size
 
     @property
     def path(self) -> str:
@@ -60,39 +90,130 @@ class Route:
         """
         return self._path_template.value
 
+    @property
+    def matches_any_request(self) -> bool:
+        """Whether :meth:`match` accepts every request with empty route params, so it can be skipped."""
+        return not self._path_params and not self._query and not self._strict_query
+
+    @property
+    def matches_synchronously(self) -> bool:
+        """Whether every path param is a :class:`SyncRouteParam`, so :meth:`match_sync` can be used."""
+        return self._sync_path_params is not None
+
     async def build_url(self, target: Target) -> str:
-        if self._path_params:
-            route_params = {}
-            for binding in self._path_params:
-                route_params[binding.name] = await binding.param.build(target=target, params=route_params)
+        if (url := self._cached_url(target)) is not None:
+            return url
 
-            path = self._path_template.build({name: quote(value, safe="") for name, value in route_params.items()})
-        else:
-            path = self._path_template.value
-            route_params = {}
+        route_params: dict[str, Any] = {}
+        for binding in self._path_params:
+            if binding.sync_param is not None:
+                value = binding.sync_param.build_sync(target=target, params=route_params)
+            else:
+                value = await binding.param.build(target=target, params=route_params)
+            route_params[binding.name] = value
 
-        url = self._base_url.joinpath(path.lstrip("/"), encoded=True)
-        if self._query:
-            url = url.with_query(self._query.build_items(route_params))
-        return str(url)
+        return self._remember_url(target, self._render_url(route_params))
+
+    async def build_urls(self, targets: Iterable[Target]) -> list[str]:
+        """
+        Build the webhook URLs of many targets, in order.
+
+        When every path param is synchronous, no URL is awaited.
+        """
+        if self._sync_path_params is None:
+            return [await self.build_url(target) for target in targets]
+        return [self._build_url_sync(target, self._sync_path_params) for target in targets]
 
     async def match(self, request: WebRequest[RawRequestT]) -> RouteParams:
+        if self._sync_path_params is not None:
+            return self.match_sync(request)
+
         route_params: dict[str, Any] = {}
         request_path_params = request.path_params
 
         for binding in self._path_params:
-            if binding.name not in request_path_params:
-                raise MissingPathParamError(param=binding.name, available_params=request_path_params)
-
-            raw_value = request_path_params[binding.name]
+            raw_value = self._raw_path_param(binding.name, request_path_params)
             try:
-                route_params[binding.name] = await binding.param.parse(value=raw_value, params=route_params)
+                if binding.sync_param is not None:
+                    value = binding.sync_param.parse_sync(value=raw_value, params=route_params)
+                else:
+                    value = await binding.param.parse(value=raw_value, params=route_params)
             except (TypeError, ValueError) as exc:
                 raise InvalidPathParamError(param=binding.name, value=raw_value) from exc
+            route_params[binding.name] = value
+
+        self._match_query(request, route_params)
+        return route_params
+
+    def match_sync(self, request: WebRequest[RawRequestT]) -> RouteParams:
+        """
+        Match a request without awaiting.
 
+        :raises TypeError: If some path param is not a :class:`SyncRouteParam`.
+        """
+        if self._sync_path_params is None:
+            raise TypeError("Route has path params without a synchronous parser; use match() instead.")
+
+        route_params: dict[str, Any] = {}
+        request_path_params = request.path_params
+
+        for name, param in self._sync_path_params:
+            raw_value = self._raw_path_param(name, request_path_params)
+            try:
+                route_params[name] = param.parse_sync(value=raw_value, params=route_params)
+            except (TypeError, ValueError) as exc:
+                raise InvalidPathParamError(param=name, value=raw_value) from exc
+
+        self._match_query(request, route_params)
+        return route_params
+
+    def _build_url_sync(self, target: Target, sync_path_params: tuple[tuple[str, SyncRouteParam], ...]) -> str:
+        if (url := self._cached_url(target)) is not None:
+            return url
+
+        route_params: dict[str, Any] = {}
+        for name, param in sync_path_params:
+            route_params[name] = param.build_sync(target=target, params=route_params)
+
+        return self._remember_url(target, self._render_url(route_params))
+
+    def _render_url(self, route_params: RouteParams) -> str:
+        values = [quote(value, safe="") for value in route_params.values()]
+
+        parts = self._url_parts
+        if parts is not None and _UNSAFE_SEGMENTS.isdisjoint(values):
+            if len(values) == 1:
+                return f"{parts[0]}{values[0]}{parts[1]}"
+            return parts[0] + "".join(value + literal for value, literal in zip(values, parts[1:], strict=True))
+
+        path = self._path_template.build(dict(zip(route_params, values, strict=True)))
+        url = self._base_url.joinpath(path.lstrip("/"), encoded=True)
+        if self._query:
+            url = url.with_query(self._query.build_items(route_params))
+        return str(url)
+
+    def _cached_url(self, target: Target) -> str | None:
+        cache = self._url_cache
+        if cache is None or (url := cache.get(target)) is None:
+            return None
+        cache.move_to_end(target)
+        return url
+
+    def _remember_url(self, target: Target, url: str) -> str:
+        if self._url_cache is not None:
+            if len(self._url_cache) >= self._url_cache_size:
+                self._url_cache.popitem(last=False)
+            self._url_cache[target] = url
+        return url
+
+    @staticmethod
+    def _raw_path_param(name: str, request_path_params: Mapping[str, Any]) -> Any:
+        if name not in request_path_params:
+            raise MissingPathParamError(param=name, available_params=request_path_params)
+        return request_path_params[name]
+
+    def _match_query(self, request: WebRequest[RawRequestT], route_params: RouteParams) -> None:
         if self._query:
             self._query.match(query_params=request.query_params, route_params=route_params, strict=self._strict_query)
         elif self._strict_query and request.query_params:
             raise UnexpectedQueryParamError(query_params=request.query_params.keys(), expected_query_params=())
-
-        return route_params
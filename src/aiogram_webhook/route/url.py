@@ -1,6 +1,8 @@
 from yarl import URL
 
 from aiogram_webhook.route.errors import InvalidBaseUrlError
+from aiogram_webhook.route.path import PathTemplate
+from aiogram_webhook.route.query import QuerySpec
 
 
 def prepare_base_url(base_url: str | URL) -> URL:
@@ -16,3 +18,33 @@ def prepare_base_url(base_url: str | URL) -> URL:
         raise InvalidBaseUrlError(base_url=url, reason="URL fragment is not supported for route")
 
     return url
+
+
+def compile_url_parts(base_url: URL, path_template: PathTemplate, query: QuerySpec) -> tuple[str, ...] | None:
+    """
+    Split the URL a route builds into the literal parts around its path param values.
+
+    The URL is built through yarl once with a marker in place of every path param, so joining the parts with
+    quoted values gives the same string as building it through yarl.
+
+    :return: The literal parts, one more than there are path params, or ``None`` when query values depend on
+        route params and the URL must be built through yarl.
+    """
+    if query.required_params():
+        return None
+
+    markers = [f"__aiogram_webhook_param_{index}__" for index in range(len(path_template.param_names))]
+    path = path_template.build(dict(zip(path_template.param_names, markers, strict=True)))
+    url = base_url.joinpath(path.lstrip("/"), encoded=True)
+    if query:
+        url = url.with_query(query.build_items({}))
+
+    rest = str(url)
+    parts: list[str] = []
+    for marker in markers:
+        literal, found, rest = rest.partition(marker)
+        if not found:
+            return None
+        parts.append(literal)
+    parts.append(rest)
+    return tuple(parts)
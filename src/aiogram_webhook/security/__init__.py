@@ -1,6 +1,27 @@
-from aiogram_webhook.security.checks.check import SecurityCheck
+from aiogram_webhook.security.bans import BanList
+from aiogram_webhook.security.checks.check import SecurityCheck, SyncSecurityCheck
 from aiogram_webhook.security.checks.ip import IPCheck
-from aiogram_webhook.security.secret_token import SecretToken, StaticSecretToken
-from aiogram_webhook.security.security import Security
+from aiogram_webhook.security.proxies import TrustedProxies
+from aiogram_webhook.security.secret_token import (
+    CachedSecretToken,
+    DerivedSecretToken,
+    SecretToken,
+    StaticSecretToken,
+    SyncSecretToken,
+)
+from aiogram_webhook.security.security import CheckStats, Security
 
-__all__ = ("IPCheck", "SecretToken", "Security", "SecurityCheck", "StaticSecretToken")
+__all__ = (
+    "BanList",
+    "CachedSecretToken",
+    "CheckStats",
+    "DerivedSecretToken",
+    "IPCheck",
+    "SecretToken",
+    "Security",
+    "SecurityCheck",
+    "StaticSecretToken",
+    "SyncSecretToken",
+    "SyncSecurityCheck",
+    "TrustedProxies",
+)
@@ -0,0 +1,177 @@
+import math
+import time
+from collections.abc import Callable, Iterable
+
+from aiogram_webhook.errors import AiogramWebhookError
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.security.checks.ip import (
+    DEFAULT_TELEGRAM_NETWORKS,
+    IPAddress,
+    IPNetwork,
+    IPRanges,
+    parse_ip,
+    to_network,
+)
+from aiogram_webhook.security.errors import SecretTokenError, SecurityCheckError
+
+logger = get_logger("security")
+
+_PUBLIC_DETAILS = {403: "Forbidden", 404: "Not found"}
+
+
+class BanList:
+    """
+    Temporary bans for clients that keep failing verification.
+
+    Every counted failure adds one to a per-address score that halves every ``half_life`` seconds. A client whose
+    score reaches ``threshold`` is banned for ``ban_duration`` seconds, and the engine answers its requests before
+    matching the route or reading the body. Scores take one float per address, and at most ``max_tracked``
+    addresses are scored and banned at once, least recently failed first out.
+
+    Telegram's delivery networks and the ``exempt`` networks are never banned, since one address there carries
+    updates for many bots.
+    """
+
+    __slots__ = (
+        "_ban_duration",
+        "_bans",
+        "_clock",
+        "_exempt",
+        "_half_life",
+        "_hits",
+        "_max_tracked",
+        "_scores",
+        "_threshold_level",
+        "counts",
+        "response_payload",
+        "status_code",
+    )
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 10.0,
+        half_life: float = 60.0,
+        ban_duration: float = 600.0,
+        max_tracked: int = 65536,
+        status_code: int = 403,
+        counts: tuple[type[AiogramWebhookError], ...] = (SecretTokenError, SecurityCheckError),
+        exempt: Iterable[IPNetwork | IPAddress | str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param threshold: Decayed number of failures that gets a client banned.
+        :param half_life: Seconds after which a client's failure score is halved.
+        :param ban_duration: Seconds a ban lasts.
+        :param max_tracked: Maximum number of scored addresses, and separately of banned ones.
+        :param status_code: Status banned clients are answered with: ``403`` or ``404``.
+        :param counts: Errors that count as a failed verification.
+        :param exempt: Addresses or networks that are never banned, in addition to Telegram's networks.
+        :param clock: Monotonic clock returning seconds.
+        """
+        if threshold < 1:
+            raise ValueError("threshold must be at least 1.")
+        if half_life <= 0 or ban_duration <= 0:
+            raise ValueError("half_life and ban_duration must be greater than zero.")
+        if max_tracked < 1:
+            raise ValueError("max_tracked must be at least 1.")
+        if status_code not in _PUBLIC_DETAILS:
+            raise ValueError("status_code must be 403 or 404.")
+
+        self.status_code = status_code
+        self.response_payload = {"detail": _PUBLIC_DETAILS[status_code]}
+        self.counts = counts
+        self._half_life = half_life
+        self._ban_duration = ban_duration
+        self._max_tracked = max_tracked
+        self._clock = clock
+        self._exempt = IPRanges.from_networks([
+            *DEFAULT_TELEGRAM_NETWORKS,
+            *(network for item in exempt if (network := to_network(item)) is not None),
+        ])
+
+        # A score s at time t is stored as the single moment t + half_life * log2(s) when it decays to 1,
+        # so it reads back as 2 ** ((level - now) / half_life) and needs no separate timestamp.
+        self._threshold_level = half_life * math.log2(threshold)
+        self._scores: dict[str, float] = {}
+        self._bans: dict[str, float] = {}
+        self._hits = 0
+
+    @property
+    def banned(self) -> int:
+        """Number of currently banned addresses."""
+        now = self._clock()
+        for ip in [ip for ip, until in self._bans.items() if until <= now]:
+            del self._bans[ip]
+        return len(self._bans)
+
+    @property
+    def tracked(self) -> int:
+        """Number of addresses with a failure score."""
+        return len(self._scores)
+
+    @property
+    def hits(self) -> int:
+        """Number of requests rejected because their client was banned."""
+        return self._hits
+
+    def is_banned(self, ip: str | None) -> bool:
+        """Check whether a client is banned, counting a hit when it is."""
+        if ip is None:
+            return False
+
+        until = self._bans.get(ip)
+        if until is None:
+            return False
+        if until <= self._clock():
+            del self._bans[ip]
+            return False
+
+        self._hits += 1
+        return True
+
+    def record_failure(self, ip: str | None) -> bool:
+        """
+        Count a failed verification for a client.
+
+        :return: Whether the client got banned by this failure.
+        """
+        if ip is None or ip in self._bans or self.is_exempt(ip):
+            return False
+
+        now = self._clock()
+        level = self._scores.pop(ip, None)
+        score = 1.0 if level is None else 2 ** ((level - now) / self._half_life) + 1
+        level = now + self._half_life * math.log2(score)
+
+        if level - now < self._threshold_level:
+            _put_bounded(self._scores, ip, level, self._max_tracked)
+            return False
+
+        _put_bounded(self._bans, ip, now + self._ban_duration, self._max_tracked)
+        logger.warning("Banned client %s for %s s after repeated failed verification", ip, self._ban_duration)
+        return True
+
+    def is_exempt(self, ip: str) -> bool:
+        """Check whether an address is never banned; invalid addresses are not exempt."""
+        try:
+            version, value = parse_ip(ip)
+        except ValueError:
+            return False
+        return self._exempt.contains(version, value)
+
+    def unban(self, ip: str) -> None:
+        """Lift a client's ban and forget its failure score."""
+        self._bans.pop(ip, None)
+        self._scores.pop(ip, None)
+
+    def clear(self) -> None:
+        """Lift every ban and forget every failure score."""
+        self._bans.clear()
+        self._scores.clear()
+
+
+def _put_bounded(entries: dict[str, float], ip: str, value: float, maxsize: int) -> None:
+    if len(entries) >= maxsize:
+        del entries[next(iter(entries))]
+    entries[ip] = value
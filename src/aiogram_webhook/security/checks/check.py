@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Protocol, runtime_checkable
 
 from aiogram_webhook.engines.target import Target
 from aiogram_webhook.route.params import RouteParams
@@ -18,3 +18,25 @@ class SecurityCheck(Protocol):
         :return: True if the check passes (allow the request), False otherwise (reject).
         """
         raise NotImplementedError
+
+
+@runtime_checkable
+class SyncSecurityCheck(Protocol):
+    """
+    Security check that verifies without I/O.
+
+    :class:`~aiogram_webhook.security.Security` detects it once at construction and calls :meth:`verify_sync`
+    directly instead of awaiting :meth:`SecurityCheck.verify`, which must still be provided for callers that await
+    it.
+    """
+
+    def verify_sync(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        """
+        Perform a security check on the incoming webhook request.
+
+        :param target: The target bot that received the request.
+        :param request: The webhook request to verify.
+        :param route_params: Route parameters mapping for the request.
+        :return: True if the check passes (allow the request), False otherwise (reject).
+        """
+        raise NotImplementedError
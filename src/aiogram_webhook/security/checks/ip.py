@@ -1,14 +1,22 @@
+from bisect import bisect_right
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
 from functools import lru_cache
 from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address, ip_network
-from typing import Final
+from typing import TYPE_CHECKING, Final
+from weakref import finalize
 
 from aiogram_webhook.engines.target import Target
 from aiogram_webhook.route.params import RouteParams
-from aiogram_webhook.security.checks.check import SecurityCheck
+from aiogram_webhook.security.checks.check import SecurityCheck, SyncSecurityCheck
 from aiogram_webhook.web.base import WebRequest
 
+if TYPE_CHECKING:
+    from aiogram_webhook.security.proxies import TrustedProxies
+
 IPNetwork = IPv4Network | IPv6Network
 IPAddress = IPv4Address | IPv6Address
+Intervals = tuple[tuple[int, ...], tuple[int, ...]]
 
 
 DEFAULT_TELEGRAM_NETWORKS: Final[tuple[IPNetwork, ...]] = (
@@ -17,67 +25,206 @@ DEFAULT_TELEGRAM_NETWORKS: Final[tuple[IPNetwork, ...]] = (
 )
 
 
-class IPCheck(SecurityCheck):
+@lru_cache(maxsize=256)
+def parse_ip(ip_str: str) -> tuple[int, int]:
+    """
+    Parse an IP address; results are cached.
+
+    :return: The IP version and the integer value of the address.
+    :raises ValueError: If the string is not an IP address.
+    """
+    address = ip_address(ip_str)
+    return address.version, int(address)
+
+
+@dataclass(frozen=True, slots=True)
+class IPRanges:
+    """
+    Immutable set of IP networks compiled to sorted, merged integer intervals per address family.
+
+    Membership is a binary search over interval starts, so a lookup costs ``O(log n)`` integer comparisons however
+    many networks are configured.
+    """
+
+    v4: Intervals
+    v6: Intervals
+
+    @classmethod
+    def from_networks(cls, networks: Iterable[IPNetwork]) -> "IPRanges":
+        v4: list[tuple[int, int]] = []
+        v6: list[tuple[int, int]] = []
+        for network in networks:
+            interval = (int(network.network_address), int(network.broadcast_address))
+            (v4 if network.version == 4 else v6).append(interval)
+        return cls(v4=_merge(v4), v6=_merge(v6))
+
+    def __contains__(self, address: IPAddress) -> bool:
+        return self.contains(address.version, int(address))
+
+    def __len__(self) -> int:
+        return len(self.v4[0]) + len(self.v6[0])
+
+    def contains(self, version: int, value: int) -> bool:
+        """
+        Check whether an address given as its integer value belongs to one of the networks.
+
+        :param version: IP version of the address, 4 or 6.
+        :param value: Integer value of the address.
+        :return: True if the address is inside some network.
+        """
+        starts, ends = self.v4 if version == 4 else self.v6
+        index = bisect_right(starts, value) - 1
+        return index >= 0 and value <= ends[index]
+
+
+class ConnectionVerdicts:
+    """
+    Verdicts remembered per client connection (see :attr:`WebRequest.connection`).
+
+    Connection objects are keyed by ``id()``; a lookup is one dict access. An entry is removed by a finalizer when
+    its connection is garbage collected, before the id can be reused, and on lookup once a transport reports that
+    it is closing. Connections that cannot be weakly referenced are not remembered.
+    """
+
+    __slots__ = ("_connections",)
+
+    def __init__(self) -> None:
+        self._connections: dict[int, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def get(self, connection: Hashable) -> bool | None:
+        key = id(connection)
+        verdict = self._connections.get(key)
+        if verdict is not None and _is_closing(connection):
+            del self._connections[key]
+            return None
+        return verdict
+
+    def put(self, connection: Hashable, verdict: bool) -> None:
+        key = id(connection)
+        if key not in self._connections:
+            try:
+                finalize(connection, self._connections.pop, key, None)
+            except TypeError:
+                return
+        self._connections[key] = verdict
+
+
+def _is_closing(connection: object) -> bool:
+    is_closing = getattr(connection, "is_closing", None)
+    return is_closing is not None and is_closing()
+
+
+class IPCheck(SecurityCheck, SyncSecurityCheck):
     """
     Security check for validating client IP address against allowed networks and addresses.
 
     Allows requests only from specified IP networks.
     """
 
-    def __init__(self, *ip_entries: IPNetwork | IPAddress | str, include_default: bool = True) -> None:
+    def __init__(
+        self,
+        *ip_entries: IPNetwork | IPAddress | str,
+        include_default: bool = True,
+        per_connection: bool = False,
+    ) -> None:
         """
         Initialize the IPCheck with allowed IP addresses and networks.
 
         :param *ip_entries: IP addresses or networks to allow.
         :param include_default: Whether to include default Telegram IP networks.
+        :param per_connection: Whether to remember the verdict for each client connection, so later requests on a
+            keep-alive connection skip the IP lookup. Requests with a forwarding header are always checked.
+        """
+        self._per_connection = per_connection
+        self._proxies: TrustedProxies | None = None
+        self.rebuild(*ip_entries, include_default=include_default)
+
+    def rebuild(self, *ip_entries: IPNetwork | IPAddress | str, include_default: bool = True) -> None:
         """
-        self._networks: frozenset[IPNetwork] = frozenset()
-        self._addresses: frozenset[IPAddress] = frozenset()
+        Replace the allowlist.
 
-        networks = set(DEFAULT_TELEGRAM_NETWORKS) if include_default else set()
-        addresses = set()
+        The new lookup structure is built aside and swapped in with one assignment, so requests being verified
+        concurrently see either the old or the new allowlist and no lock is needed. Remembered per-connection
+        verdicts are dropped.
 
-        for item in ip_entries:
-            parsed = self._parse(item)
-            if parsed is None:
-                continue
-            if isinstance(parsed, (IPv4Network, IPv6Network)):
-                networks.add(parsed)
-            elif isinstance(parsed, (IPv4Address, IPv6Address)):
-                addresses.add(parsed)
+        :param *ip_entries: IP addresses or networks to allow.
+        :param include_default: Whether to include default Telegram IP networks.
+        """
+        networks = list(DEFAULT_TELEGRAM_NETWORKS) if include_default else []
+        networks.extend(network for item in ip_entries if (network := to_network(item)) is not None)
 
-        self._networks = frozenset(networks)
-        self._addresses = frozenset(addresses)
+        self._ranges = IPRanges.from_networks(networks)
+        self._verdicts = ConnectionVerdicts() if self._per_connection else None
 
-    async def verify(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:  # noqa: ARG002
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        raw_ip = forwarded_for.split(",", maxsplit=1)[0].strip() if forwarded_for else request.client_ip
+    def use_proxies(self, proxies: "TrustedProxies") -> None:
+        """
+        Resolve the client through trusted reverse proxies instead of taking the first ``X-Forwarded-For`` entry.
+
+        Called by :class:`Security` with its own ``proxies``, so the check, the ban list and error reports agree on
+        the client address.
 
+        :raises ValueError: If the check already uses other proxies.
+        """
+        if self._proxies is not None and self._proxies is not proxies:
+            raise ValueError("IPCheck is already used with other trusted proxies.")
+        self._proxies = proxies
+
+    async def verify(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        return self.verify_sync(target=target, request=request, route_params=route_params)
+
+    def verify_sync(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:  # noqa: ARG002
+        if self._proxies is not None:
+            if request.headers.get(self._proxies.header):
+                return self.allows(self._proxies.client_ip(request))
+        elif forwarded_for := request.headers.get("X-Forwarded-For"):
+            return self.allows(forwarded_for.split(",", maxsplit=1)[0].strip())
+
+        verdicts = self._verdicts
+        if verdicts is None or (connection := request.connection) is None:
+            return self.allows(request.client_ip)
+
+        verdict = verdicts.get(connection)
+        if verdict is None:
+            verdict = self.allows(request.client_ip)
+            verdicts.put(connection, verdict)
+        return verdict
+
+    def allows(self, raw_ip: str | None) -> bool:
+        """Check whether an address is in the allowlist; missing and invalid addresses are not."""
         if not raw_ip:
             return False
 
         try:
-            ip_addr = self._parse_ip(raw_ip)
+            version, value = self._parse_ip(raw_ip)
         except ValueError:
             return False
 
-        # Direct address match (faster check first)
-        if ip_addr in self._addresses:
-            return True
-
-        # Network match (short-circuit on first match)
-        return any(ip_addr in network for network in self._networks)
-
-    @staticmethod
-    @lru_cache(maxsize=256)
-    def _parse_ip(ip_str: str) -> IPv4Address | IPv6Address:
-        """Parse and cache IP address parsing results."""
-        return ip_address(ip_str)
-
-    @staticmethod
-    def _parse(item: IPAddress | IPNetwork | str) -> IPAddress | IPNetwork | None:
-        if isinstance(item, (IPv4Network, IPv6Network, IPv4Address, IPv6Address)):
-            return item
-        if isinstance(item, str):
-            return ip_network(item, strict=False) if "/" in item else ip_address(item)
-        return None
+        return self._ranges.contains(version, value)
+
+    _parse_ip = staticmethod(parse_ip)
+
+
+def to_network(item: IPAddress | IPNetwork | str) -> IPNetwork | None:
+    """Convert an allowlist entry to a network; single addresses become one-address networks."""
+    if isinstance(item, (IPv4Network, IPv6Network)):
+        return item
+    if isinstance(item, (IPv4Address, IPv6Address)):
+        return ip_network(item)
+    if isinstance(item, str):
+        return ip_network(item, strict=False)
+    return None
+
+
+def _merge(intervals: list[tuple[int, int]]) -> Intervals:
+    starts: list[int] = []
+    ends: list[int] = []
+    for start, end in sorted(intervals):
+        if starts and start <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return tuple(starts), tuple(ends)
@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+from aiogram_webhook.security.checks.ip import IPAddress, IPNetwork, IPRanges, parse_ip, to_network
+from aiogram_webhook.web.base import WebRequest
+
+
+class TrustedProxies:
+    """
+    Client IP resolution behind trusted reverse proxies.
+
+    The forwarding header is believed only when the connection comes from a trusted proxy. Its entries are walked
+    right to left, skipping trusted proxies, and the first other address is the client; when every entry is a
+    trusted proxy, the leftmost one is. Resolved addresses are cached per header value.
+    """
+
+    __slots__ = ("_header", "_parse_hops", "_ranges", "_resolve")
+
+    def __init__(
+        self,
+        *proxies: IPNetwork | IPAddress | str,
+        header: str = "X-Forwarded-For",
+        cache_size: int = 1024,
+    ) -> None:
+        """
+        :param *proxies: Addresses or networks of the reverse proxies in front of the application.
+        :param header: Forwarding header to read: ``X-Forwarded-For`` or the standard ``Forwarded``.
+        :param cache_size: How many distinct header values to remember.
+        """
+        self._ranges = IPRanges.from_networks(network for item in proxies if (network := to_network(item)) is not None)
+        self._header = header
+        self._parse_hops = _forwarded_hops if header.lower() == "forwarded" else _x_forwarded_for_hops
+        self._resolve = lru_cache(maxsize=cache_size)(self._walk)
+
+    @property
+    def header(self) -> str:
+        return self._header
+
+    def is_trusted(self, ip: str) -> bool:
+        """Check whether an address belongs to a trusted proxy; invalid addresses are not trusted."""
+        try:
+            version, value = parse_ip(ip)
+        except ValueError:
+            return False
+        return self._ranges.contains(version, value)
+
+    def client_ip(self, request: WebRequest) -> str | None:
+        """
+        Resolve the address of the client that sent the request.
+
+        :return: The client address, or ``None`` when it is unknown or the forwarding header is malformed.
+        """
+        peer = request.client_ip
+        if peer is None or not self.is_trusted(peer):
+            return peer
+
+        values = request.headers.getall(self._header, ())
+        if not values:
+            return peer
+        return self._resolve(values[0] if len(values) == 1 else ",".join(values))
+
+    def _walk(self, value: str) -> str | None:
+        client = None
+        for hop in reversed(self._parse_hops(value)):
+            try:
+                version, number = parse_ip(hop)
+            except ValueError:
+                return None
+
+            client = hop
+            if not self._ranges.contains(version, number):
+                break
+        return client
+
+
+def _x_forwarded_for_hops(value: str) -> list[str]:
+    return [hop for hop in (item.strip() for item in value.split(",")) if hop]
+
+
+def _forwarded_hops(value: str) -> list[str]:
+    hops: list[str] = []
+    for element in value.split(","):
+        for pair in element.split(";"):
+            name, _, node = pair.strip().partition("=")
+            if name.lower() == "for":
+                hops.append(_node_address(node.strip().strip('"')))
+    return hops
+
+
+def _node_address(node: str) -> str:
+    # RFC 7239 nodes: "192.0.2.43", "192.0.2.43:47011" or "[2001:db8:cafe::17]:4711".
+    if node.startswith("["):
+        return node[1:].partition("]")[0]
+    return node.partition(":")[0]
@@ -1,12 +1,21 @@
+import hashlib
 import re
+import time
 from abc import ABC, abstractmethod
-from hmac import compare_digest
+from base64 import urlsafe_b64encode
+from collections.abc import Callable
+from functools import lru_cache, partial
+from hmac import HMAC, compare_digest
 from typing import Final
 
 from aiogram_webhook.engines.target import Target
+from aiogram_webhook.logs import get_logger
 from aiogram_webhook.route.params import RouteParams
+from aiogram_webhook.utils._single_flight import SingleFlight
 from aiogram_webhook.web.base import WebRequest
 
+logger = get_logger("security")
+
 SECRET_TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,256}$")
 SECRET_TOKEN_HEADER: Final[str] = "x-telegram-bot-api-secret-token"  # noqa: S105
 
@@ -41,7 +50,46 @@ class SecretToken(ABC):
         raise NotImplementedError
 
 
-class StaticSecretToken(SecretToken):
+class SyncSecretToken(SecretToken):
+    """
+    Base class for secret tokens known without I/O.
+
+    :class:`~aiogram_webhook.security.Security` calls :meth:`verify_sync` directly instead of awaiting
+    :meth:`verify`; subclasses that customize verification override :meth:`verify_sync`.
+    """
+
+    async def verify(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        return self.verify_sync(target=target, request=request, route_params=route_params)
+
+    def verify_sync(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:  # noqa: ARG002
+        """
+        Verify the incoming secret token from the request without awaiting.
+
+        :param target: The target bot information.
+        :param request: The webhook request object.
+        :param route_params: Route parameters mapping.
+        :return: True if the token is valid, False otherwise.
+        """
+        incoming_secret_token = request.headers.get(SECRET_TOKEN_HEADER)
+        if incoming_secret_token is None:
+            return False
+        return compare_digest(incoming_secret_token, self.secret_token_sync(target=target))
+
+    async def secret_token(self, target: Target) -> str:
+        return self.secret_token_sync(target=target)
+
+    @abstractmethod
+    def secret_token_sync(self, target: Target) -> str:
+        """
+        Return the webhook secret token associated with the given bot token.
+
+        :param target: The target bot information.
+        :return: The secret token string for this bot.
+        """
+        raise NotImplementedError
+
+
+class StaticSecretToken(SyncSecretToken):
     """
     Static secret token implementation for webhook security.
 
@@ -54,7 +102,7 @@ class StaticSecretToken(SecretToken):
             raise ValueError("Invalid secret token format. Must be 1-256 characters, only A-Z, a-z, 0-9, _, -.")
         self.__secret_token = secret_token
 
-    async def secret_token(self, target: Target) -> str:  # noqa: ARG002
+    def secret_token_sync(self, target: Target) -> str:  # noqa: ARG002
         """
         Return the static secret token.
 
@@ -62,3 +110,148 @@ class StaticSecretToken(SecretToken):
         :return: The configured secret token.
         """
         return self.__secret_token
+
+
+class DerivedSecretToken(SyncSecretToken):
+    """
+    Per-bot secret tokens derived from one master key.
+
+    Each bot's secret is ``HMAC-SHA256(master_key, bot_id)`` in unpadded URL-safe base64, 43 characters from the
+    alphabet Telegram accepts, so no per-bot secret has to be stored. Derived secrets are memoized per key and bot.
+    While a master key is being rotated, secrets derived from the previous key are accepted too.
+    """
+
+    def __init__(
+        self,
+        master_key: bytes | str,
+        *,
+        previous_key: bytes | str | None = None,
+        cache_size: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param master_key: Key new secrets are derived from.
+        :param previous_key: Replaced key whose secrets are still accepted, until :meth:`rotate` is called.
+        :param cache_size: How many derived secrets to remember.
+        :param clock: Monotonic clock returning seconds.
+        """
+        self._master_key = _key_bytes(master_key)
+        self._previous_key = None if previous_key is None else _key_bytes(previous_key)
+        self._previous_until: float | None = None
+        self._clock = clock
+        self._derive = lru_cache(maxsize=cache_size)(_derive_secret)
+
+    def rotate(self, master_key: bytes | str, *, grace_period: float = 3600.0) -> None:
+        """
+        Switch to a new master key, accepting secrets derived from the current one for a while.
+
+        Webhooks registered afterwards get secrets derived from the new key; re-register existing ones within
+        ``grace_period``.
+
+        :param master_key: The new master key.
+        :param grace_period: Seconds the secrets derived from the current key are still accepted.
+        """
+        self._previous_key = self._master_key
+        self._previous_until = self._clock() + grace_period
+        self._master_key = _key_bytes(master_key)
+
+    def secret_token_sync(self, target: Target) -> str:
+        return self._derive(self._master_key, target.bot_id)
+
+    def verify_sync(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:  # noqa: ARG002
+        incoming_secret_token = request.headers.get(SECRET_TOKEN_HEADER)
+        if incoming_secret_token is None:
+            return False
+        if compare_digest(incoming_secret_token, self._derive(self._master_key, target.bot_id)):
+            return True
+
+        previous_key = self._previous_key
+        if previous_key is None or (self._previous_until is not None and self._clock() >= self._previous_until):
+            return False
+        return compare_digest(incoming_secret_token, self._derive(previous_key, target.bot_id))
+
+
+def _key_bytes(key: bytes | str) -> bytes:
+    if not key:
+        raise ValueError("Master key must not be empty.")
+    return key.encode() if isinstance(key, str) else key
+
+
+def _derive_secret(key: bytes, bot_id: int) -> str:
+    digest = HMAC(key, str(bot_id).encode(), hashlib.sha256).digest()
+    return urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class CachedSecretToken(SecretToken):
+    """
+    Caching wrapper for secret tokens loaded from a remote store.
+
+    Secrets are cached per bot id for ``ttl`` seconds. For ``stale_ttl`` seconds after that, the cached secret is
+    still returned while it is reloaded in the background; later requests wait for a fresh one. Concurrent misses
+    for one bot share a single load. Verification is the default header comparison, so a ``verify`` override on
+    the wrapped token is not used.
+    """
+
+    def __init__(
+        self,
+        source: SecretToken,
+        *,
+        ttl: float = 300.0,
+        stale_ttl: float = 60.0,
+        maxsize: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param source: The secret token to cache.
+        :param ttl: Seconds a loaded secret is used as is.
+        :param stale_ttl: Seconds after ``ttl`` during which the old secret is used while it is reloaded.
+        :param maxsize: Maximum number of cached secrets; the oldest loaded is dropped first.
+        :param clock: Monotonic clock returning seconds.
+        """
+        if ttl <= 0 or stale_ttl < 0:
+            raise ValueError("ttl must be greater than zero and stale_ttl must not be negative.")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+
+        self.source = source
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: dict[int, tuple[str, float]] = {}
+        self._loads: SingleFlight[int, str] = SingleFlight(self._store, name="webhook secret token", logger=logger)
+
+    def __len__(self) -> int:
+        """Return the number of cached secrets."""
+        return len(self._entries)
+
+    async def secret_token(self, target: Target) -> str:
+        entry = self._entries.get(target.bot_id)
+        if entry is not None:
+            secret, loaded_at = entry
+            age = self._clock() - loaded_at
+            if age < self._ttl:
+                return secret
+            if age < self._ttl + self._stale_ttl:
+                self._loads.start(target.bot_id, partial(self.source.secret_token, target=target))
+                return secret
+
+        return await self._loads.get(target.bot_id, partial(self.source.secret_token, target=target))
+
+    def invalidate(self, bot_id: int | None = None) -> None:
+        """
+        Drop a cached secret, so the next request loads it again.
+
+        :param bot_id: The bot whose secret to drop, or ``None`` to drop every secret.
+        """
+        if bot_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(bot_id, None)
+        self._loads.forget(bot_id)
+
+    def _store(self, bot_id: int, secret: str) -> None:
+        self._entries.pop(bot_id, None)
+        if len(self._entries) >= self._maxsize:
+            del self._entries[next(iter(self._entries))]
+        self._entries[bot_id] = (secret, self._clock())
@@ -1,29 +1,218 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
 from aiogram_webhook.engines.target import Target
+from aiogram_webhook.errors import AiogramWebhookError
 from aiogram_webhook.route.params import RouteParams
-from aiogram_webhook.security.checks.check import SecurityCheck
+from aiogram_webhook.security.bans import BanList
+from aiogram_webhook.security.checks.check import SecurityCheck, SyncSecurityCheck
+from aiogram_webhook.security.checks.ip import IPCheck
 from aiogram_webhook.security.errors import SecretTokenError, SecurityCheckError
+from aiogram_webhook.security.proxies import TrustedProxies
 from aiogram_webhook.security.secret_token import SecretToken
 from aiogram_webhook.web.base import WebRequest
 
+# Cost hints for checks that do not declare a ``cost`` attribute.
+SYNC_CHECK_COST = 1.0
+ASYNC_CHECK_COST = 100.0
+
+# Measured verifications between two adaptive reorderings.
+_REORDER_INTERVAL = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CheckStats:
+    """Measurements of one security check."""
+
+    check: SecurityCheck
+    cost: float
+    """Cost hint the check is ordered by."""
+    calls: int
+    rejections: int
+    total_time: float
+    """Seconds spent in the check across all calls."""
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejections / self.calls if self.calls else 0.0
+
+
+class _CheckEntry:
+    __slots__ = ("calls", "check", "cost", "rejections", "sync", "total_time")
+
+    def __init__(self, check: SecurityCheck) -> None:
+        self.check = check
+        self.sync = check if isinstance(check, SyncSecurityCheck) else None
+        self.cost: float = getattr(check, "cost", SYNC_CHECK_COST if self.sync is not None else ASYNC_CHECK_COST)
+        self.calls = 0
+        self.rejections = 0
+        self.total_time = 0.0
+
+    @property
+    def expected_cost(self) -> float:
+        # Expected cost per rejection; cheap checks that reject often go first. Smoothed so unmeasured checks keep
+        # their hinted order.
+        return self.cost * (self.calls + 2) / (self.rejections + 1)
+
+    async def verify(self, *, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        started = time.perf_counter()
+        if self.sync is not None:
+            ok = self.sync.verify_sync(target=target, request=request, route_params=route_params)
+        else:
+            ok = await self.check.verify(target=target, request=request, route_params=route_params)
+        self._record(ok=ok, elapsed=time.perf_counter() - started)
+        return ok
+
+    def verify_sync(self, *, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        if self.sync is None:
+            raise TypeError(f"{self.check.__class__.__name__} has no synchronous variant.")
+
+        started = time.perf_counter()
+        ok = self.sync.verify_sync(target=target, request=request, route_params=route_params)
+        self._record(ok=ok, elapsed=time.perf_counter() - started)
+        return ok
+
+    def _record(self, *, ok: bool, elapsed: float) -> None:
+        self.calls += 1
+        self.total_time += elapsed
+        if not ok:
+            self.rejections += 1
+
 
 class Security:
-    def __init__(self, *checks: SecurityCheck, secret_token: SecretToken | None = None) -> None:
+    """
+    Secret token and request checks for webhook requests.
+
+    The secret token is verified first, then the checks, cheapest first. A check's cost is its ``cost`` attribute,
+    or :data:`SYNC_CHECK_COST` for a :class:`SyncSecurityCheck` and :data:`ASYNC_CHECK_COST` otherwise; checks of
+    equal cost keep the order they were passed in.
+    """
+
+    def __init__(
+        self,
+        *checks: SecurityCheck,
+        secret_token: SecretToken | None = None,
+        proxies: TrustedProxies | None = None,
+        bans: BanList | None = None,
+        measure: bool = False,
+        adaptive: bool = False,
+        concurrent: bool = False,
+    ) -> None:
+        """
+        :param checks: Request checks.
+        :param secret_token: Telegram secret token provider and verifier.
+        :param proxies: Reverse proxies to resolve the client address through. Every :class:`IPCheck` among
+            ``checks`` resolves it through them as well.
+        :param bans: Ban list for clients that keep failing verification. Addresses allowed by an
+            :class:`IPCheck` among ``checks`` are never banned.
+        :param measure: Count calls and rejections and time every check; see :attr:`check_stats`.
+        :param adaptive: Measure the checks and periodically reorder them, so those that reject most per unit of
+            cost run first.
+        :param concurrent: Run the asynchronous checks concurrently, after the synchronous ones, and cancel the
+            rest once one rejects.
+        """
         self._secret_token = secret_token
         self._checks: tuple[SecurityCheck, ...] = checks
+        self._proxies = proxies
+        self._bans = bans
+        self._allowlists = tuple(check for check in checks if isinstance(check, IPCheck))
+        if proxies is not None:
+            for check in self._allowlists:
+                check.use_proxies(proxies)
+        self._adaptive = adaptive
+        self._concurrent = concurrent
+        self._measured = measure or adaptive
+        self._verifications = 0
+
+        self._entries = sorted((_CheckEntry(check) for check in checks), key=lambda entry: entry.cost)
+
+        # Synchronous variants are detected once; verify_sync() needs all of them to have one.
+        self._sync_secret_token = secret_token if isinstance(secret_token, SyncSecurityCheck) else None
+        self._sync_checks = tuple(entry.sync for entry in self._entries if entry.sync is not None)
+        self._verifies_synchronously = (secret_token is None or self._sync_secret_token is not None) and len(
+            self._sync_checks
+        ) == len(checks)
+
+    @property
+    def is_noop(self) -> bool:
+        """Whether :meth:`verify` accepts every request because neither a secret token nor checks are configured."""
+        return self._secret_token is None and not self._checks
+
+    @property
+    def bans(self) -> BanList | None:
+        return self._bans
+
+    @property
+    def verifies_synchronously(self) -> bool:
+        """Whether the secret token and every check are synchronous, so :meth:`verify_sync` can be used."""
+        return self._verifies_synchronously
 
     async def verify(self, *, target: Target, request: WebRequest, route_params: RouteParams) -> None:
+        if self._verifies_synchronously:
+            self.verify_sync(target=target, request=request, route_params=route_params)
+            return
+
         if self._secret_token is not None:
-            ok = await self._secret_token.verify(target=target, request=request, route_params=route_params)
+            if self._sync_secret_token is not None:
+                ok = self._sync_secret_token.verify_sync(target=target, request=request, route_params=route_params)
+            else:
+                ok = await self._secret_token.verify(target=target, request=request, route_params=route_params)
             if not ok:
                 raise SecretTokenError(target_bot_id=target.bot_id)
 
-        for check in self._checks:
-            ok = await check.verify(target=target, request=request, route_params=route_params)
-            if not ok:
-                raise SecurityCheckError(
-                    security_check=check.__class__.__name__,
-                    client_ip=str(request.client_ip) if request.client_ip is not None else None,
-                )
+        if self._measured:
+            self._count_verification()
+        if self._concurrent:
+            await self._verify_concurrently(target=target, request=request, route_params=route_params)
+            return
+
+        for entry in self._entries:
+            if not await self._verify_entry(entry, target=target, request=request, route_params=route_params):
+                raise self._check_failed(entry.check, request)
+
+    def verify_sync(self, *, target: Target, request: WebRequest, route_params: RouteParams) -> None:
+        """
+        Verify a request without awaiting.
+
+        :raises TypeError: If the secret token or some check is not a :class:`SyncSecurityCheck`.
+        """
+        if not self._verifies_synchronously:
+            raise TypeError("Security has checks without a synchronous variant; use verify() instead.")
+
+        if self._sync_secret_token is not None and not self._sync_secret_token.verify_sync(
+            target=target, request=request, route_params=route_params
+        ):
+            raise SecretTokenError(target_bot_id=target.bot_id)
+
+        if not self._measured:
+            for check in self._sync_checks:
+                if not check.verify_sync(target=target, request=request, route_params=route_params):
+                    raise self._check_failed(check, request)
+            return
+
+        self._count_verification()
+        for entry in self._entries:
+            if not entry.verify_sync(target=target, request=request, route_params=route_params):
+                raise self._check_failed(entry.check, request)
+
+    @property
+    def check_stats(self) -> tuple[CheckStats, ...]:
+        """Measurements of every check in the order they run; counters stay at zero unless checks are measured."""
+        return tuple(
+            CheckStats(
+                check=entry.check,
+                cost=entry.cost,
+                calls=entry.calls,
+                rejections=entry.rejections,
+                total_time=entry.total_time,
+            )
+            for entry in self._entries
+        )
 
     async def secret_token(self, target: Target) -> str | None:
         """
@@ -36,3 +225,85 @@ class Security:
             return None
 
         return await self._secret_token.secret_token(target=target)
+
+    def client_ip(self, request: WebRequest) -> str | None:
+        """
+        Get the client address of a request, resolved through the trusted proxies when they are configured.
+
+        :param request: The webhook request.
+        :return: The client address, or None if it is unknown.
+        """
+        if self._proxies is None:
+            return request.client_ip
+        return self._proxies.client_ip(request)
+
+    def is_banned(self, request: WebRequest) -> bool:
+        """
+        Check whether the client of a request is temporarily banned for failing verification too often.
+
+        :param request: The webhook request.
+        :return: True if the request must be rejected without further processing.
+        """
+        return self._bans is not None and self._bans.is_banned(self.client_ip(request))
+
+    def record_failure(self, request: WebRequest, error: AiogramWebhookError) -> None:
+        """
+        Count a rejected request against its client when the error is one the ban list counts.
+
+        Clients allowed by an :class:`IPCheck` are not counted.
+
+        :param request: The rejected webhook request.
+        :param error: The error the request was rejected with.
+        """
+        if self._bans is None or not isinstance(error, self._bans.counts):
+            return
+
+        ip = self.client_ip(request)
+        if ip is not None and not any(check.allows(ip) for check in self._allowlists):
+            self._bans.record_failure(ip)
+
+    async def _verify_entry(
+        self, entry: _CheckEntry, *, target: Target, request: WebRequest, route_params: RouteParams
+    ) -> bool:
+        if self._measured:
+            return await entry.verify(target=target, request=request, route_params=route_params)
+        if entry.sync is not None:
+            return entry.sync.verify_sync(target=target, request=request, route_params=route_params)
+        return await entry.check.verify(target=target, request=request, route_params=route_params)
+
+    async def _verify_concurrently(self, *, target: Target, request: WebRequest, route_params: RouteParams) -> None:
+        # Synchronous checks are cheap enough to reject a request before any asynchronous one is started.
+        for entry in self._entries:
+            if entry.sync is not None and not await self._verify_entry(
+                entry, target=target, request=request, route_params=route_params
+            ):
+                raise self._check_failed(entry.check, request)
+
+        checks = {
+            asyncio.ensure_future(
+                self._verify_entry(entry, target=target, request=request, route_params=route_params)
+            ): entry.check
+            for entry in self._entries
+            if entry.sync is None
+        }
+        pending = set(checks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.result():
+                        raise self._check_failed(checks[task], request)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled checks and retrieve every outcome, so no task is destroyed pending and no
+            # exception of a check that finished alongside the rejecting one goes unretrieved.
+            await asyncio.gather(*checks, return_exceptions=True)
+
+    def _count_verification(self) -> None:
+        self._verifications += 1
+        if self._adaptive and self._verifications % _REORDER_INTERVAL == 0:
+            self._entries = sorted(self._entries, key=lambda entry: entry.expected_cost)
+
+    def _check_failed(self, check: SecurityCheck | SyncSecurityCheck, request: WebRequest) -> SecurityCheckError:
+        return SecurityCheckError(security_check=check.__class__.__name__, client_ip=self.client_ip(request))
@@ -0,0 +1,4 @@
+from aiogram_webhook.tokens.sqlite import SQLiteTokenStore
+from aiogram_webhook.tokens.store import CachedTokenStore, MemoryTokenStore, TokenStore
+
+__all__ = ("CachedTokenStore", "MemoryTokenStore", "SQLiteTokenStore", "TokenStore")
@@ -0,0 +1,57 @@
+import sqlite3
+from os import PathLike
+from pathlib import Path
+
+from aiogram_webhook.tokens.store import TokenStore
+from aiogram_webhook.utils._sqlite import SQLiteThread
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bot_tokens (
+    bot_id INTEGER PRIMARY KEY,
+    token TEXT NOT NULL
+)
+"""
+
+
+class SQLiteTokenStore(TokenStore):
+    """
+    Token store backed by a local SQLite file in WAL mode.
+
+    Lookups are primary-key reads. All database work runs on a single dedicated thread; wrap the store in
+    :class:`~aiogram_webhook.tokens.CachedTokenStore` to keep hot lookups off it.
+    """
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        """
+        :param path: SQLite database file, created on first use.
+        """
+        self.path = Path(path)
+
+        self._db = SQLiteThread(self.path, schema=_SCHEMA, thread_name="aiogram-webhook-tokens")
+
+    async def open(self) -> None:
+        await self._db.open()
+
+    async def get(self, bot_id: int) -> str | None:
+        await self.open()
+        row = await self._db.run(_execute, "SELECT token FROM bot_tokens WHERE bot_id = ?", (bot_id,))
+        return None if row is None else row[0]
+
+    async def set(self, bot_id: int, token: str) -> None:
+        await self.open()
+        await self._db.run(
+            _execute,
+            "INSERT INTO bot_tokens (bot_id, token) VALUES (?, ?) ON CONFLICT (bot_id) DO UPDATE SET token = excluded.token",
+            (bot_id, token),
+        )
+
+    async def delete(self, bot_id: int) -> None:
+        await self.open()
+        await self._db.run(_execute, "DELETE FROM bot_tokens WHERE bot_id = ?", (bot_id,))
+
+    async def close(self) -> None:
+        await self._db.close()
+
+
+def _execute(connection: sqlite3.Connection, sql: str, parameters: tuple[object, ...]) -> tuple[str] | None:
+    return connection.execute(sql, parameters).fetchone()
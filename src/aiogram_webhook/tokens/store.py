@@ -0,0 +1,149 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from functools import partial
+
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.utils._single_flight import SingleFlight
+
+logger = get_logger("tokens")
+
+
+class TokenStore(ABC):
+    """Storage of bot tokens keyed by bot id."""
+
+    @abstractmethod
+    async def get(self, bot_id: int) -> str | None:
+        """
+        Look up a bot token.
+
+        :param bot_id: The bot id.
+        :return: The token, or ``None`` if the bot is unknown.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, bot_id: int, token: str) -> None:
+        """Store or replace a bot token."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, bot_id: int) -> None:
+        """Forget a bot token; unknown bots are ignored."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release resources held by the store."""
+        return
+
+
+class MemoryTokenStore(TokenStore):
+    """Token store backed by a dict, for tests and tokens loaded from configuration."""
+
+    def __init__(self, tokens: Mapping[int, str] | None = None) -> None:
+        self._tokens: dict[int, str] = dict(tokens or {})
+
+    async def get(self, bot_id: int) -> str | None:
+        return self._tokens.get(bot_id)
+
+    async def set(self, bot_id: int, token: str) -> None:
+        self._tokens[bot_id] = token
+
+    async def delete(self, bot_id: int) -> None:
+        self._tokens.pop(bot_id, None)
+
+
+class CachedTokenStore(TokenStore):
+    """
+    In-memory cache in front of another token store.
+
+    Found tokens are kept in an LRU of ``maxsize`` entries; unknown bot ids are remembered for ``negative_ttl``
+    seconds, so scanners probing random ids do not reach the store. Concurrent misses for one bot share a single
+    load. Writes go through to the store and update the cache.
+    """
+
+    def __init__(
+        self,
+        source: TokenStore,
+        *,
+        maxsize: int = 100_000,
+        negative_ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param source: The store to cache.
+        :param maxsize: Maximum number of cached tokens, and separately of cached unknown bot ids.
+        :param negative_ttl: Seconds an unknown bot id is remembered. ``0`` disables negative caching.
+        :param clock: Monotonic clock returning seconds.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        if negative_ttl < 0:
+            raise ValueError("negative_ttl must not be negative.")
+
+        self.source = source
+        self._maxsize = maxsize
+        self._negative_ttl = negative_ttl
+        self._clock = clock
+        self._tokens: OrderedDict[int, str] = OrderedDict()
+        self._missing: dict[int, float] = {}
+        self._loads: SingleFlight[int, str | None] = SingleFlight(self._store, name="token", logger=logger)
+
+    def __len__(self) -> int:
+        """Return the number of cached tokens."""
+        return len(self._tokens)
+
+    async def get(self, bot_id: int) -> str | None:
+        token = self._tokens.get(bot_id)
+        if token is not None:
+            self._tokens.move_to_end(bot_id)
+            return token
+
+        missing_until = self._missing.get(bot_id)
+        if missing_until is not None:
+            if missing_until > self._clock():
+                return None
+            del self._missing[bot_id]
+
+        return await self._loads.get(bot_id, partial(self.source.get, bot_id))
+
+    async def set(self, bot_id: int, token: str) -> None:
+        await self.source.set(bot_id, token)
+        self.invalidate(bot_id)
+        self._remember(bot_id, token)
+
+    async def delete(self, bot_id: int) -> None:
+        await self.source.delete(bot_id)
+        self.invalidate(bot_id)
+
+    async def close(self) -> None:
+        await self.source.close()
+
+    def invalidate(self, bot_id: int | None = None) -> None:
+        """
+        Drop cached lookups, so the next request reads the store again.
+
+        :param bot_id: The bot whose lookup to drop, or ``None`` to drop every lookup.
+        """
+        if bot_id is None:
+            self._tokens.clear()
+            self._missing.clear()
+        else:
+            self._tokens.pop(bot_id, None)
+            self._missing.pop(bot_id, None)
+        self._loads.forget(bot_id)
+
+    def _store(self, bot_id: int, token: str | None) -> None:
+        if token is not None:
+            self._remember(bot_id, token)
+        elif self._negative_ttl:
+            if len(self._missing) >= self._maxsize:
+                del self._missing[next(iter(self._missing))]
+            self._missing[bot_id] = self._clock() + self._negative_ttl
+
+    def _remember(self, bot_id: int, token: str) -> None:
+        self._tokens[bot_id] = token
+        self._tokens.move_to_end(bot_id)
+        if len(self._tokens) > self._maxsize:
+            self._tokens.popitem(last=False)
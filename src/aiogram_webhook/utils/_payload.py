@@ -1,15 +1,86 @@
+import asyncio
+import os
 import secrets
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 from aiogram import Bot
 from aiogram.methods import TelegramMethod
 from aiogram.methods.base import TelegramType
-from aiohttp import MultipartWriter
+from aiogram.types import BufferedInputFile, FSInputFile
+from aiohttp import MultipartWriter, Payload
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import AsyncIterablePayload
 
 if TYPE_CHECKING:
     from aiogram.types import InputFile
 
 
+@runtime_checkable
+class SendfileWriter(Protocol):
+    """Stream writer that can hand a file region to the kernel instead of copying it through Python."""
+
+    async def sendfile(self, file: IO[bytes], offset: int, count: int) -> None: ...
+
+
+class FilePayload(Payload):
+    """
+    Sized payload that streams a file from disk.
+
+    The size is taken when the payload is built, so replies carrying it get a ``Content-Length``. Writers that
+    implement :class:`SendfileWriter` get the file through ``sendfile``; any other writer gets it in pieces of
+    ``chunk_size`` bytes read in the default executor, so at most one chunk per reply is held in memory.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, chunk_size: int, **kwargs: Any) -> None:
+        super().__init__(Path(path), **kwargs)
+        self._size = self._value.stat().st_size
+        self._chunk_size = chunk_size
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self._value.read_bytes().decode(encoding, errors)
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        file = await loop.run_in_executor(None, self._value.open, "rb")
+        try:
+            if isinstance(writer, SendfileWriter):
+                await writer.sendfile(file, 0, self.size or 0)
+                return
+
+            remaining = self.size or 0
+            while remaining > 0:
+                chunk = await loop.run_in_executor(None, file.read, min(self._chunk_size, remaining))
+                if not chunk:
+                    break
+                await writer.write(chunk)
+                remaining -= len(chunk)
+        finally:
+            await loop.run_in_executor(None, file.close)
+
+
+class ChunkedBytesPayload(Payload):
+    """
+    In-memory payload written in slices of ``chunk_size`` bytes.
+
+    A whole buffer written at once lands in the transport's write buffer as another copy; slices let the writer
+    apply flow control between them.
+    """
+
+    def __init__(self, value: bytes, *, chunk_size: int, **kwargs: Any) -> None:
+        super().__init__(value, **kwargs)
+        self._size = len(value)
+        self._chunk_size = chunk_size
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> str:
+        return self._value.decode(encoding, errors)
+
+    async def write(self, writer: AbstractStreamWriter) -> None:
+        view = memoryview(self._value)
+        for offset in range(0, len(view), self._chunk_size):
+            await writer.write(view[offset : offset + self._chunk_size])
+
+
 def build_webhook_payload(bot: Bot, method: TelegramMethod[TelegramType]) -> MultipartWriter:
     """Convert a TelegramMethod to multipart payload."""
     writer = MultipartWriter(
@@ -29,8 +100,17 @@ def build_webhook_payload(bot: Bot, method: TelegramMethod[TelegramType]) -> Mul
         payload.set_content_disposition("form-data", name=key)
 
     for key, value in files.items():
-        file_payload = value.read(bot)
-        payload = writer.append(file_payload)
+        payload = writer.append_payload(_file_payload(bot, value))
         payload.set_content_disposition("form-data", name=key, filename=value.filename or key)
 
     return writer
+
+
+def _file_payload(bot: Bot, value: "InputFile") -> Payload:
+    # Local and in-memory files get sized payloads; anything else, such as URLs, is streamed as aiogram reads it.
+    if isinstance(value, FSInputFile):
+        return FilePayload(value.path, chunk_size=value.chunk_size)
+    if isinstance(value, BufferedInputFile):
+        return ChunkedBytesPayload(value.data, chunk_size=value.chunk_size)
+
+    return AsyncIterablePayload(value.read(bot))
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from functools import partial
+from typing import Generic, TypeVar
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class SingleFlight(Generic[KeyT, ValueT]):
+    """
+    Loads shared by every caller asking for the same key at once.
+
+    A finished load hands its value to ``store``, unless the key was forgotten while it ran; failed loads are
+    logged and not stored.
+    """
+
+    __slots__ = ("_loading", "_logger", "_name", "_store")
+
+    def __init__(self, store: Callable[[KeyT, ValueT], None], *, name: str, logger: logging.Logger) -> None:
+        """
+        :param store: Called with the key and the loaded value when a load finishes.
+        :param name: What is loaded, for log messages.
+        :param logger: Logger that failed loads are reported to.
+        """
+        self._store = store
+        self._name = name
+        self._logger = logger
+        self._loading: dict[KeyT, asyncio.Task[ValueT]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of running loads."""
+        return len(self._loading)
+
+    def start(self, key: KeyT, load: Callable[[], Awaitable[ValueT]]) -> "asyncio.Task[ValueT]":
+        """
+        Start loading a key, or join the load that is already running.
+
+        :param key: The key to load.
+        :param load: Loads the value; only called when no load of the key is running.
+        :return: The load task.
+        """
+        task = self._loading.get(key)
+        # A finished load stays here until its done callback runs; the store may have changed since.
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._fetch(key, load))
+            task.add_done_callback(partial(self._loaded, key))
+            self._loading[key] = task
+        return task
+
+    async def get(self, key: KeyT, load: Callable[[], Awaitable[ValueT]]) -> ValueT:
+        """Load a key, sharing the load with concurrent callers."""
+        # Shielded, so a cancelled caller does not cancel the load other callers wait for.
+        return await asyncio.shield(self.start(key, load))
+
+    def forget(self, key: KeyT | None = None) -> None:
+        """
+        Detach running loads, so they do not store their value and later callers start a new load.
+
+        :param key: The key whose load to detach, or ``None`` to detach every load.
+        """
+        if key is None:
+            self._loading.clear()
+        else:
+            self._loading.pop(key, None)
+
+    async def _fetch(self, key: KeyT, load: Callable[[], Awaitable[ValueT]]) -> ValueT:
+        value = await load()
+
+        # A load that was forgotten meanwhile must not put the old value back.
+        if self._loading.get(key) is asyncio.current_task():
+            self._store(key, value)
+        return value
+
+    def _loaded(self, key: KeyT, task: "asyncio.Task[ValueT]") -> None:
+        if self._loading.get(key) is task:
+            del self._loading[key]
+
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            self._logger.warning("Failed to load %s of bot %s: %s", self._name, key, exc)
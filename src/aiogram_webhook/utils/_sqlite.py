@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sqlite3
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TypeVar
+
+ResultT = TypeVar("ResultT")
+
+
+class SQLiteThread:
+    """
+    SQLite database in WAL mode whose connection is used from a single dedicated thread.
+
+    The database is opened on first use; a new database file is readable and writable by its owner only, and
+    SQLite gives its WAL files the same permissions. Functions passed to :meth:`run` are called on that thread with
+    the connection as their first argument.
+    """
+
+    __slots__ = ("_connection", "_executor", "_opening", "_pragmas", "_schema", "_thread_name", "path")
+
+    def __init__(self, path: Path, *, schema: str, pragmas: Iterable[str] = (), thread_name: str) -> None:
+        """
+        :param path: SQLite database file.
+        :param schema: Statement that creates the tables if they do not exist.
+        :param pragmas: Pragmas set on the connection after ``journal_mode=WAL``, such as ``synchronous=FULL``.
+        :param thread_name: Name prefix of the database thread.
+        """
+        self.path = path
+        self._schema = schema
+        self._pragmas = tuple(pragmas)
+        self._thread_name = thread_name
+
+        self._connection: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._opening: asyncio.Lock | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._connection is not None
+
+    async def open(self) -> None:
+        if self._connection is not None:
+            return
+
+        if self._opening is None:
+            self._opening = asyncio.Lock()
+
+        async with self._opening:
+            if self._connection is not None:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self._thread_name)
+            self._connection = await self._submit(self._connect)
+
+    async def run(self, func: Callable[..., ResultT], *args: object) -> ResultT:
+        """
+        Call a function with the connection on the database thread.
+
+        :raises RuntimeError: If the database is not open.
+        """
+        if self._connection is None:
+            raise RuntimeError(f"SQLite database {self.path} is not open.")
+        return await self._submit(func, self._connection, *args)
+
+    async def close(self, *, checkpoint: bool = False) -> None:
+        """
+        Close the database and stop its thread.
+
+        :param checkpoint: Move the WAL into the database file and truncate it first.
+        """
+        if self._connection is not None:
+            await self._submit(_close, self._connection, checkpoint)
+            self._connection = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _submit(self, func: Callable[..., ResultT], *args: object) -> ResultT:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+        connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        for pragma in self._pragmas:
+            connection.execute(f"PRAGMA {pragma}")
+        connection.execute(self._schema)
+        return connection
+
+
+def _close(connection: sqlite3.Connection, checkpoint: bool) -> None:
+    if checkpoint:
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    connection.close()
@@ -0,0 +1,36 @@
+from collections.abc import Mapping
+from typing import Any
+
+
+def get_update_type(update: Mapping[str, Any]) -> str | None:
+    """Return the top-level type of a raw Telegram update, for example ``"message"`` or ``"callback_query"``."""
+    for key in update:
+        if key != "update_id":
+            return key
+    return None
+
+
+def get_update_chat_id(update: Mapping[str, Any]) -> int | None:
+    """
+    Return the chat a raw Telegram update belongs to.
+
+    Updates without a chat, such as inline queries, fall back to the sender id. ``None`` means the update has neither.
+    """
+    update_type = get_update_type(update)
+    if update_type is None:
+        return None
+
+    event = update[update_type]
+    if not isinstance(event, Mapping):
+        return None
+
+    for source in (event, event.get("message")):
+        if isinstance(source, Mapping):
+            chat = source.get("chat")
+            if isinstance(chat, Mapping):
+                return chat.get("id")
+
+    user = event.get("from") or event.get("user")
+    if isinstance(user, Mapping):
+        return user.get("id")
+    return None
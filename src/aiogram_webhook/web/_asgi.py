@@ -0,0 +1,230 @@
+from collections.abc import Awaitable, Callable, Iterable, Iterator, MutableMapping
+from typing import Any, TypeAlias, TypeVar, overload
+from urllib.parse import parse_qsl
+
+from aiohttp.abc import AbstractStreamWriter
+from multidict import CIMultiDict, MultiMapping
+
+Scope: TypeAlias = MutableMapping[str, Any]
+Message: TypeAlias = MutableMapping[str, Any]
+Receive: TypeAlias = Callable[[], Awaitable[Message]]
+Send: TypeAlias = Callable[[Message], Awaitable[None]]
+ASGIApp: TypeAlias = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+DefaultT = TypeVar("DefaultT")
+
+COALESCE_BUFFER_SIZE = 64 * 1024
+"""Bytes :class:`ASGIStreamWriter` collects before it sends a body message."""
+MAX_SINGLE_SEND = 1024**2
+"""Largest pre-sized payload :class:`ASGIStreamWriter` sends as one message."""
+MAX_BODY_SIZE = 1024**2
+"""Default largest request body :func:`read_body` accepts."""
+
+_MISSING: Any = object()
+
+
+class BodyTooLargeError(Exception):
+    """Request body is larger than the accepted size; answered with ``413``."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"Request body exceeds {max_size} bytes.")
+        self.max_size = max_size
+
+
+class ASGIHeaders(MultiMapping[str]):
+    """
+    Read-only case-insensitive view over ASGI ``scope["headers"]``.
+
+    Nothing is copied or decoded up front: each lookup scans the raw header list, which is short for webhook
+    requests and usually read for one or two names only.
+    """
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, raw: Iterable[tuple[bytes, bytes]]) -> None:
+        self._raw = raw if isinstance(raw, list | tuple) else list(raw)
+
+    @overload
+    def getone(self, key: str) -> str: ...
+    @overload
+    def getone(self, key: str, default: DefaultT) -> str | DefaultT: ...
+    def getone(self, key: str, default: Any = _MISSING) -> Any:
+        name = key.lower().encode("latin-1")
+        for raw_name, raw_value in self._raw:
+            if raw_name == name:
+                return raw_value.decode("latin-1")
+
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    @overload
+    def getall(self, key: str) -> list[str]: ...
+    @overload
+    def getall(self, key: str, default: DefaultT) -> list[str] | DefaultT: ...
+    def getall(self, key: str, default: Any = _MISSING) -> Any:
+        name = key.lower().encode("latin-1")
+        values = [raw_value.decode("latin-1") for raw_name, raw_value in self._raw if raw_name == name]
+
+        if values:
+            return values
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.getone(key, default)
+
+    def __getitem__(self, key: str) -> str:
+        return self.getone(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.getone(key, None) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (raw_name.decode("latin-1") for raw_name, _ in self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}({list(self.items())!r})>"
+
+
+class ASGIQueryParams(MultiMapping[str]):
+    """Read-only view over an ASGI ``query_string``, parsed on first access."""
+
+    __slots__ = ("_items", "_query_string")
+
+    def __init__(self, query_string: bytes) -> None:
+        self._query_string = query_string
+        self._items: list[tuple[str, str]] | None = None
+
+    def _parsed(self) -> list[tuple[str, str]]:
+        if self._items is None:
+            if self._query_string:
+                self._items = parse_qsl(self._query_string.decode("latin-1"), keep_blank_values=True)
+            else:
+                self._items = []
+        return self._items
+
+    @overload
+    def getone(self, key: str) -> str: ...
+    @overload
+    def getone(self, key: str, default: DefaultT) -> str | DefaultT: ...
+    def getone(self, key: str, default: Any = _MISSING) -> Any:
+        for name, value in self._parsed():
+            if name == key:
+                return value
+
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    @overload
+    def getall(self, key: str) -> list[str]: ...
+    @overload
+    def getall(self, key: str, default: DefaultT) -> list[str] | DefaultT: ...
+    def getall(self, key: str, default: Any = _MISSING) -> Any:
+        values = [value for name, value in self._parsed() if name == key]
+
+        if values:
+            return values
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def __getitem__(self, key: str) -> str:
+        return self.getone(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self._parsed())
+
+    def __len__(self) -> int:
+        return len(self._parsed())
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}({self._parsed()!r})>"
+
+
+async def read_body(receive: Receive, max_size: int = MAX_BODY_SIZE) -> bytes:
+    """
+    Read the whole ASGI request body.
+
+    A body that arrives in one message is returned as is; a chunked body is collected into one buffer.
+
+    :param max_size: Largest accepted body in bytes. Reading stops as soon as it is exceeded.
+    :raises BodyTooLargeError: If the body is larger than ``max_size``.
+    """
+    message = await receive()
+    if message["type"] == "http.disconnect":
+        raise ConnectionResetError("Client disconnected before the request body was read.")
+
+    body: bytes = message.get("body", b"")
+    if len(body) > max_size:
+        raise BodyTooLargeError(max_size)
+    if not message.get("more_body", False):
+        return body
+
+    buffer = bytearray(body)
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise ConnectionResetError("Client disconnected before the request body was read.")
+
+        buffer += message.get("body", b"")
+        if len(buffer) > max_size:
+            raise BodyTooLargeError(max_size)
+        if not message.get("more_body", False):
+            return bytes(buffer)
+
+
+class ASGIStreamWriter(AbstractStreamWriter):
+    """
+    Stream writer that turns aiohttp payload writes into ASGI ``http.response.body`` messages.
+
+    Chunks are coalesced and sent once more than ``buffer_size`` bytes are buffered. A payload whose ``size`` is
+    known and at most :data:`MAX_SINGLE_SEND` bytes is held whole and sent in one message. :meth:`write_eof` must be
+    called last: it flushes the buffer as the final message with ``more_body`` unset.
+    """
+
+    __slots__ = ("_buffered", "_limit", "_parts", "_send")
+
+    def __init__(self, send: Send, *, size: int | None = None, buffer_size: int = COALESCE_BUFFER_SIZE) -> None:
+        self._send = send
+        self._limit = size if size is not None and buffer_size < size <= MAX_SINGLE_SEND else buffer_size
+        self._parts: list[bytes] = []
+        self._buffered = 0
+
+    async def write(self, chunk: bytes | bytearray | memoryview) -> None:
+        if not chunk:
+            return
+
+        part = chunk if isinstance(chunk, bytes) else bytes(chunk)
+        self._parts.append(part)
+        self._buffered += len(part)
+        if self._buffered > self._limit:
+            await self._flush(more_body=True)
+
+    async def write_eof(self, chunk: bytes = b"") -> None:
+        if chunk:
+            self._parts.append(chunk)
+        await self._flush(more_body=False)
+
+    async def drain(self) -> None:
+        return None
+
+    async def _flush(self, *, more_body: bool) -> None:
+        body = self._parts[0] if len(self._parts) == 1 else b"".join(self._parts)
+        self._parts = []
+        self._buffered = 0
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def enable_compression(self, encoding: str = "deflate", strategy: int | None = None) -> None:  # noqa: ARG002
+        return None
+
+    def enable_chunking(self) -> None:
+        return None
+
+    async def write_headers(self, status_line: str, headers: CIMultiDict[str]) -> None:  # noqa: ARG002
+        return None
@@ -0,0 +1,188 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from http import HTTPStatus
+from urllib.parse import unquote
+
+RawHeaders = list[tuple[bytes, bytes]]
+
+MAX_HEAD_SIZE = 16 * 1024
+
+
+class HTTPError(Exception):
+    """Malformed or unacceptable request; the connection is answered with ``status`` and closed."""
+
+    def __init__(self, status: int) -> None:
+        super().__init__(HTTPStatus(status).phrase)
+        self.status = status
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    """Complete HTTP request as read from the socket."""
+
+    method: str
+    path: str
+    query_string: bytes
+    headers: RawHeaders
+    body: bytes
+    keep_alive: bool
+
+
+MessageCallback = Callable[[Message], None]
+ContinueCallback = Callable[[], None]
+
+
+def render_head(status_code: int, headers: RawHeaders) -> bytes:
+    """Encode the status line and header block, without the terminating empty line."""
+    try:
+        reason = HTTPStatus(status_code).phrase.encode()
+    except ValueError:
+        reason = b""
+
+    lines = [b"HTTP/1.1 %d %s\r\n" % (status_code, reason)]
+    lines.extend(name + b": " + value + b"\r\n" for name, value in headers)
+    return b"".join(lines)
+
+
+def split_target(target: bytes) -> tuple[str, bytes]:
+    """Split a request target into a percent-decoded path and the raw query string."""
+    raw_path, _, query_string = target.partition(b"?")
+    path = raw_path.decode("latin-1")
+    return (unquote(path) if "%" in path else path), query_string
+
+
+@dataclass(slots=True)
+class _Head:
+    method: str
+    target: bytes
+    headers: RawHeaders
+    content_length: int
+    keep_alive: bool
+    expect_continue: bool
+
+    def message(self, body: bytes) -> Message:
+        path, query_string = split_target(self.target)
+        return Message(self.method, path, query_string, self.headers, body, self.keep_alive)
+
+
+class BuiltinParser:
+    """
+    Minimal HTTP/1.1 request parser for webhook traffic.
+
+    Only ``Content-Length`` bodies are accepted, which is what Telegram sends; chunked requests are answered with
+    ``411``. A request that arrives in one read is sliced straight out of the received bytes; a body split across
+    reads is joined once when complete.
+    """
+
+    __slots__ = ("_body", "_buffer", "_head", "_max_body_size", "_missing", "_on_continue", "_on_message")
+
+    def __init__(self, on_message: MessageCallback, on_continue: ContinueCallback, *, max_body_size: int) -> None:
+        self._on_message = on_message
+        self._on_continue = on_continue
+        self._max_body_size = max_body_size
+
+        self._buffer = b""
+        self._head: _Head | None = None
+        self._body: list[bytes] = []
+        self._missing = 0
+
+    def feed(self, data: bytes) -> None:
+        if self._head is not None:
+            data = self._feed_body(data)
+            if self._head is not None:
+                return
+
+        buffer = self._buffer + data if self._buffer else data
+        offset = 0
+        while offset < len(buffer):
+            end = buffer.find(b"\r\n\r\n", offset)
+            # A head that arrived whole in one read is limited too, not only one still being received.
+            if (end if end >= 0 else len(buffer)) - offset > MAX_HEAD_SIZE:
+                raise HTTPError(431)
+            if end < 0:
+                break
+
+            head = _parse_head(buffer[offset:end])
+            if head.content_length > self._max_body_size:
+                raise HTTPError(413)
+
+            offset = end + 4
+            body_end = offset + head.content_length
+            if body_end <= len(buffer):
+                self._on_message(head.message(buffer[offset:body_end]))
+                offset = body_end
+                continue
+
+            self._start_body(head, buffer[offset:])
+            offset = len(buffer)
+
+        self._buffer = buffer[offset:]
+
+    def _start_body(self, head: _Head, received: bytes) -> None:
+        if head.expect_continue:
+            self._on_continue()
+
+        self._head = head
+        self._body = [received] if received else []
+        self._missing = head.content_length - len(received)
+
+    def _feed_body(self, data: bytes) -> bytes:
+        if len(data) < self._missing:
+            self._body.append(data)
+            self._missing -= len(data)
+            return b""
+
+        head, body = self._head, self._body
+        body.append(data[: self._missing])
+        rest = data[self._missing :]
+        self._head, self._body, self._missing = None, [], 0
+
+        if head is not None:
+            self._on_message(head.message(b"".join(body)))
+        return rest
+
+
+def _parse_head(head: bytes) -> _Head:
+    request_line, *lines = head.split(b"\r\n")
+    try:
+        method, target, version = request_line.split(b" ")
+    except ValueError:
+        raise HTTPError(400) from None
+    if version not in {b"HTTP/1.1", b"HTTP/1.0"}:
+        raise HTTPError(505)
+
+    parsed = _Head(
+        method=method.decode("latin-1"),
+        target=target,
+        headers=[],
+        content_length=0,
+        keep_alive=version == b"HTTP/1.1",
+        expect_continue=False,
+    )
+    for line in lines:
+        name, separator, value = line.partition(b":")
+        if not separator or not name or name != name.strip():
+            raise HTTPError(400)
+        _apply_header(parsed, name.lower(), value.strip())
+    return parsed
+
+
+def _apply_header(head: _Head, name: bytes, value: bytes) -> None:
+    if name == b"content-length":
+        if not value.isdigit():
+            raise HTTPError(400)
+        content_length = int(value)
+        # Repeated lengths must agree, or the body boundary is ambiguous (request smuggling).
+        if content_length != head.content_length and any(seen == name for seen, _ in head.headers):
+            raise HTTPError(400)
+        head.content_length = content_length
+    elif name == b"transfer-encoding":
+        raise HTTPError(411)
+    elif name == b"connection":
+        # Responses never announce keep-alive, so HTTP/1.0 connections are always closed.
+        if b"close" in {token.strip() for token in value.lower().split(b",")}:
+            head.keep_alive = False
+    elif name == b"expect" and value.lower() == b"100-continue":
+        head.expect_continue = True
+
+    head.headers.append((name, value))
@@ -0,0 +1,81 @@
+import httptools
+
+from aiogram_webhook.web._http import ContinueCallback, HTTPError, Message, MessageCallback, RawHeaders, split_target
+
+
+class HttptoolsParser:
+    """Request parser on ``httptools`` (llhttp); also accepts chunked request bodies."""
+
+    __slots__ = (
+        "_body",
+        "_body_size",
+        "_headers",
+        "_max_body_size",
+        "_on_continue",
+        "_on_message",
+        "_parser",
+        "_url",
+    )
+
+    def __init__(self, on_message: MessageCallback, on_continue: ContinueCallback, *, max_body_size: int) -> None:
+        self._on_message = on_message
+        self._on_continue = on_continue
+        self._max_body_size = max_body_size
+        self._parser = httptools.HttpRequestParser(self)
+
+        self._url = b""
+        self._headers: RawHeaders = []
+        self._body: list[bytes] = []
+        self._body_size = 0
+
+    def feed(self, data: bytes) -> None:
+        try:
+            self._parser.feed_data(data)
+        except httptools.HttpParserCallbackError as exc:
+            if isinstance(exc.__context__, HTTPError):
+                raise exc.__context__ from None
+            raise
+        except httptools.HttpParserUpgrade:
+            raise HTTPError(400) from None
+        except httptools.HttpParserError:
+            raise HTTPError(400) from None
+
+    def on_message_begin(self) -> None:
+        self._url = b""
+        self._headers = []
+        self._body = []
+        self._body_size = 0
+
+    def on_url(self, url: bytes) -> None:
+        self._url += url
+
+    def on_header(self, name: bytes, value: bytes) -> None:
+        self._headers.append((name.lower(), value))
+
+    def on_headers_complete(self) -> None:
+        for name, value in self._headers:
+            if name == b"content-length" and value.isdigit() and int(value) > self._max_body_size:
+                raise HTTPError(413)
+            if name == b"expect" and value.lower() == b"100-continue":
+                self._on_continue()
+
+    def on_body(self, body: bytes) -> None:
+        self._body_size += len(body)
+        if self._body_size > self._max_body_size:
+            raise HTTPError(413)
+        self._body.append(body)
+
+    def on_message_complete(self) -> None:
+        path, query_string = split_target(self._url)
+        body = self._body[0] if len(self._body) == 1 else b"".join(self._body)
+        self._on_message(
+            Message(
+                method=self._parser.get_method().decode("latin-1"),
+                path=path,
+                query_string=query_string,
+                headers=self._headers,
+                body=body,
+                # Responses never announce keep-alive, so HTTP/1.0 connections are always closed.
+                keep_alive=self._parser.should_keep_alive() and self._parser.get_http_version() == "1.1",
+            )
+        )
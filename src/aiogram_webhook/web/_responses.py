@@ -0,0 +1,110 @@
+import asyncio
+import json
+import signal
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Any, Generic, Protocol, TypeVar
+
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.web.base import LifecycleCallback
+
+logger = get_logger("web")
+
+RawHeaders = list[tuple[bytes, bytes]]
+ValueT = TypeVar("ValueT")
+RequestT = TypeVar("RequestT")
+ResponseT = TypeVar("ResponseT")
+
+JSON_HEADER = (b"content-type", b"application/json")
+
+
+class WebhookServerApp(Protocol[RequestT, ResponseT]):
+    """Built-in app that serves webhook routes and runs lifecycle callbacks itself."""
+
+    on_startup: list[Callable[[], Awaitable[None]]]
+    on_shutdown: list[Callable[[], Awaitable[None]]]
+
+    def add_route(self, path: str, endpoint: Callable[[RequestT], Awaitable[ResponseT]]) -> None: ...
+
+
+class ServingApp(Protocol):
+    """Built-in server that listens on its own sockets."""
+
+    @property
+    def addresses(self) -> list[Any]: ...
+
+    async def start(self, host: str | None = None, port: int | None = None, **kwargs: Any) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+class RenderedResponses(Generic[ValueT]):
+    """
+    Responses rendered once and reused.
+
+    The engine answers with a handful of constant bodies, so a small table covers them; once ``maxsize`` entries
+    are stored, further responses are rendered on every call.
+    """
+
+    __slots__ = ("_maxsize", "_values")
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self._values: dict[Hashable, ValueT] = {}
+        self._maxsize = maxsize
+
+    def get(self, key: Hashable) -> ValueT | None:
+        return self._values.get(key)
+
+    def put(self, key: Hashable, value: ValueT) -> ValueT:
+        """Remember a rendered response while there is room and return it."""
+        if len(self._values) < self._maxsize:
+            self._values[key] = value
+        return value
+
+
+def json_key(status_code: int, data: dict[str, str] | None) -> Hashable:
+    """Key of a JSON response without extra headers in :class:`RenderedResponses`."""
+    return status_code, tuple(data.items()) if data is not None else None
+
+
+def encode_json(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def encode_headers(headers: Mapping[str, str]) -> RawHeaders:
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+def register_endpoint(
+    app: WebhookServerApp[RequestT, ResponseT],
+    path: str,
+    endpoint: Callable[[RequestT], Awaitable[ResponseT]],
+    *,
+    on_startup: LifecycleCallback,
+    on_shutdown: LifecycleCallback,
+) -> None:
+    """Add a webhook route to a built-in app and run the engine lifecycle callbacks with the app."""
+
+    async def startup() -> None:
+        await on_startup(app)
+
+    async def shutdown() -> None:
+        await on_shutdown(app)
+
+    app.add_route(path, endpoint)
+    app.on_startup.append(startup)
+    app.on_shutdown.append(shutdown)
+
+
+async def serve_until_stopped(app: ServingApp, host: str | None, port: int | None, **start_kwargs: Any) -> None:
+    """Start a built-in server, serve until ``SIGINT`` or ``SIGTERM``, then stop it."""
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+
+    await app.start(host, port, **start_kwargs)
+    logger.info("Serving webhooks on %s", ", ".join(map(str, app.addresses)))
+    try:
+        await stopped.wait()
+    finally:
+        await app.stop()
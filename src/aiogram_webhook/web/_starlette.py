@@ -1,37 +1,10 @@
 from collections.abc import Mapping
 
 from aiohttp import Payload
-from aiohttp.abc import AbstractStreamWriter
-from multidict import CIMultiDict
 from starlette.responses import Response
 from starlette.types import Receive, Scope, Send
 
-
-class _ASGIStreamWriter(AbstractStreamWriter):
-    __slots__ = ("_send",)
-
-    def __init__(self, send: Send) -> None:
-        self._send = send
-
-    async def write(self, chunk: bytes | bytearray | memoryview) -> None:
-        body = chunk if isinstance(chunk, bytes) else bytes(chunk)
-        await self._send({"type": "http.response.body", "body": body, "more_body": True})
-
-    async def write_eof(self, chunk: bytes = b"") -> None:
-        if chunk:
-            await self.write(chunk)
-
-    async def drain(self) -> None:
-        return None
-
-    def enable_compression(self, encoding: str = "deflate", strategy: int | None = None) -> None:  # noqa: ARG002
-        return None
-
-    def enable_chunking(self) -> None:
-        return None
-
-    async def write_headers(self, status_line: str, headers: CIMultiDict[str]) -> None:  # noqa: ARG002
-        return None
+from aiogram_webhook.web._asgi import ASGIStreamWriter
 
 
 class AiohttpPayloadResponse(Response):
@@ -51,5 +24,6 @@ class AiohttpPayloadResponse(Response):
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG002
         await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
-        await self.payload.write(_ASGIStreamWriter(send))
-        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        writer = ASGIStreamWriter(send, size=self.payload.size)
+        await self.payload.write(writer)
+        await writer.write_eof()
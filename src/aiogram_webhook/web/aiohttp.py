@@ -1,4 +1,4 @@
-from collections.abc import Mapping
+from collections.abc import Hashable, Mapping
 from typing import Any
 
 from aiohttp import Payload
@@ -38,9 +38,16 @@ class AiohttpWebRequest(WebRequest[Request]):
             return peer_name[0]
         return None
 
+    @property
+    def connection(self) -> Hashable | None:
+        return self._request.transport
+
     async def json(self) -> dict[str, Any]:
         return await self._request.json()
 
+    async def read(self) -> bytes:
+        return await self._request.read()
+
     @property
     def headers(self) -> Headers:
         return self._request.headers
@@ -0,0 +1,245 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from typing import Any
+
+from aiohttp import web
+
+from aiogram_webhook.logs import get_logger
+
+logger = get_logger("web")
+
+# A worker that ran this long before exiting did not crash at startup, so its restart backoff starts over.
+_STABLE_UPTIME = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerContext:
+    """Identity of one worker process, passed to the application factory."""
+
+    index: int
+    workers: int
+    restarts: int = 0
+    """How many times the worker with this index was restarted before this process."""
+
+    @property
+    def is_primary(self) -> bool:
+        """
+        Only the primary worker should run one-off tasks such as ``set_webhook()``.
+
+        It is the first process of worker ``0``; a restarted worker ``0`` is not primary, so one-off work is not
+        repeated.
+        """
+        return self.index == 0 and self.restarts == 0
+
+
+AppFactory = Callable[[WorkerContext], web.Application | Awaitable[web.Application]]
+
+
+def run_workers(
+    app_factory: AppFactory,
+    *,
+    host: str = "0.0.0.0",  # noqa: S104
+    port: int = 8080,
+    workers: int | None = None,
+    reuse_port: bool | None = None,
+    use_uvloop: bool = False,
+    restart: bool = True,
+    restart_delay: float = 0.5,
+    max_restart_delay: float = 30.0,
+    max_restarts: int = 10,
+    **run_app_kwargs: Any,
+) -> None:
+    """
+    Serve an aiohttp application from several forked worker processes on one port.
+
+    Every worker calls ``app_factory`` and builds its own application, engine and bot sessions. The call blocks
+    until ``SIGINT`` or ``SIGTERM``; workers then shut down gracefully.
+
+    A worker that exits unexpectedly is restarted after ``restart_delay`` seconds, doubled for every further exit
+    within 30 seconds of its start. A worker that keeps crashing that way ``max_restarts`` times in a row, for
+    example on a bad configuration or a port in use, stops every worker and the call raises :class:`RuntimeError`.
+
+    :param app_factory: Callable or coroutine function that builds the application of one worker.
+    :param host: Interface to listen on.
+    :param port: TCP port shared by all workers.
+    :param workers: Number of worker processes. Defaults to the number of CPUs.
+    :param reuse_port: Bind every worker with ``SO_REUSEPORT``. ``None`` uses it when the platform supports it;
+        otherwise the workers accept on one socket inherited from this process.
+    :param use_uvloop: Run workers on uvloop when it is installed.
+    :param restart: Restart workers that exit unexpectedly.
+    :param restart_delay: Seconds before the first restart of a worker.
+    :param max_restart_delay: Upper bound of the restart delay.
+    :param max_restarts: Consecutive restarts of a crashing worker before the runner gives up.
+    :param run_app_kwargs: Extra keyword arguments for :func:`aiohttp.web.run_app`, for example ``shutdown_timeout``.
+    """
+    workers = workers or os.cpu_count() or 1
+    if reuse_port is None:
+        reuse_port = hasattr(socket, "SO_REUSEPORT")
+
+    sock = None if reuse_port else _bind_shared_socket(host, port, run_app_kwargs.get("backlog", 128))
+    supervisor = _Supervisor(
+        partial(_run_worker, app_factory, host=host, port=port, sock=sock, use_uvloop=use_uvloop, **run_app_kwargs),
+        workers=workers,
+        restart=restart,
+        restart_delay=restart_delay,
+        max_restart_delay=max_restart_delay,
+        max_restarts=max_restarts,
+    )
+
+    previous_handlers = {signum: signal.signal(signum, supervisor.stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        supervisor.run()
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        if sock is not None:
+            sock.close()
+
+    if supervisor.crashed is not None:
+        raise RuntimeError(f"HTTP worker {supervisor.crashed} kept crashing; stopped all workers.")
+
+
+class _Supervisor:
+    def __init__(
+        self,
+        target: Callable[[WorkerContext], None],
+        *,
+        workers: int,
+        restart: bool,
+        restart_delay: float = 0.5,
+        max_restart_delay: float = 30.0,
+        max_restarts: int = 10,
+    ) -> None:
+        self.target = target
+        self.workers = workers
+        self.restart = restart
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.max_restarts = max_restarts
+        self.crashed: int | None = None
+        """Index of the worker whose crash loop stopped the runner."""
+
+        self._context = multiprocessing.get_context("fork")
+        self._processes: dict[int, BaseProcess] = {}
+        self._started_at: dict[int, float] = {}
+        self._restarts = [0] * workers
+        self._crashes = [0] * workers
+        self._due: dict[int, float] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        for index in range(self.workers):
+            self._start(index)
+        logger.info("Started %s HTTP worker process(es)", self.workers)
+
+        while self._processes or self._due:
+            next_due = min(self._due.values(), default=None)
+            timeout = None if next_due is None else max(next_due - time.monotonic(), 0.0)
+            wait([process.sentinel for process in self._processes.values()], timeout)
+            for index, process in list(self._processes.items()):
+                if not process.is_alive():
+                    self._reap(index, process)
+
+            now = time.monotonic()
+            for index, due in list(self._due.items()):
+                # stop() may run from a signal handler at any point; it clears the pending restarts.
+                if due <= now and self._due.pop(index, None) is not None and not self._stopping:
+                    self._restarts[index] += 1
+                    self._start(index)
+
+    def stop(self, *_: object) -> None:
+        if self._stopping:
+            return
+
+        self._stopping = True
+        self._due.clear()
+        logger.info("Stopping %s HTTP worker process(es)", len(self._processes))
+        for process in self._processes.values():
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+    def _start(self, index: int) -> None:
+        process = self._context.Process(
+            target=self.target,
+            args=(WorkerContext(index=index, workers=self.workers, restarts=self._restarts[index]),),
+            name=f"aiogram-webhook-http-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def _reap(self, index: int, process: BaseProcess) -> None:
+        process.join()
+        del self._processes[index]
+        if self._stopping:
+            return
+
+        logger.warning("HTTP worker %s exited with code %s", index, process.exitcode)
+        if not self.restart:
+            return
+
+        if time.monotonic() - self._started_at[index] >= _STABLE_UPTIME:
+            self._crashes[index] = 0
+        if self._crashes[index] >= self.max_restarts:
+            logger.error("HTTP worker %s crashed %s times in a row. Stopping all workers.", index, self._crashes[index])
+            self.crashed = index
+            self.stop()
+            return
+
+        delay = min(self.restart_delay * 2 ** self._crashes[index], self.max_restart_delay)
+        self._crashes[index] += 1
+        logger.info("Restarting HTTP worker %s in %s s", index, delay)
+        self._due[index] = time.monotonic() + delay
+
+
+def _bind_shared_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.create_server((host, port), backlog=backlog, reuse_port=False)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(
+    app_factory: AppFactory,
+    context: WorkerContext,
+    *,
+    host: str,
+    port: int,
+    sock: socket.socket | None,
+    use_uvloop: bool,
+    **run_app_kwargs: Any,
+) -> None:
+    # Own process group: a terminal Ctrl+C reaches the supervisor only, which then stops workers exactly once.
+    os.setpgrp()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+
+    run_app_kwargs.setdefault("print", print if context.is_primary else None)
+    if sock is None:
+        run_app_kwargs.update(host=host, port=port, reuse_port=True)
+    else:
+        run_app_kwargs.update(sock=sock)
+
+    web.run_app(app_factory(context), loop=_new_event_loop(use_uvloop=use_uvloop), **run_app_kwargs)
+
+
+def _new_event_loop(*, use_uvloop: bool) -> asyncio.AbstractEventLoop:
+    if use_uvloop:
+        try:
+            import uvloop  # noqa: PLC0415
+        except ModuleNotFoundError as exc:
+            if exc.name != "uvloop":
+                raise
+            logger.warning("uvloop is not installed. Falling back to the default event loop.")
+        else:
+            return uvloop.new_event_loop()
+
+    return asyncio.new_event_loop()
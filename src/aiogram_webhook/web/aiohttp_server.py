@@ -0,0 +1,203 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import Payload, web
+from aiohttp.web_request import BaseRequest
+from aiohttp.web_response import Response
+
+from aiogram_webhook.route.path import PathTemplate
+from aiogram_webhook.web._responses import RenderedResponses, encode_json, register_endpoint, serve_until_stopped
+from aiogram_webhook.web.base import (
+    Headers,
+    LifecycleCallback,
+    PathParams,
+    QueryParams,
+    WebAdapter,
+    WebHandler,
+    WebRequest,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class AiohttpServerRequest:
+    """Low-level aiohttp request with path params matched by the webhook route."""
+
+    request: BaseRequest
+    path_params: PathParams
+
+
+AiohttpServerEndpoint = Callable[[AiohttpServerRequest], Awaitable[web.StreamResponse]]
+
+
+class AiohttpServerWebRequest(WebRequest[AiohttpServerRequest]):
+    """Thin request wrapper over low-level aiohttp requests."""
+
+    __slots__ = ("_request",)
+
+    def __init__(self, request: AiohttpServerRequest) -> None:
+        self._request = request
+
+    @property
+    def raw(self) -> AiohttpServerRequest:
+        return self._request
+
+    @property
+    def client_ip(self) -> str | None:
+        transport = self._request.request.transport
+        if transport is None:
+            return None
+
+        if peer_name := transport.get_extra_info("peername"):
+            return peer_name[0]
+        return None
+
+    @property
+    def connection(self) -> Hashable | None:
+        return self._request.request.transport
+
+    async def json(self) -> dict[str, Any]:
+        return await self._request.request.json()
+
+    async def read(self) -> bytes:
+        return await self._request.request.read()
+
+    @property
+    def headers(self) -> Headers:
+        return self._request.request.headers
+
+    @property
+    def query_params(self) -> QueryParams:
+        return self._request.request.query
+
+    @property
+    def path_params(self) -> PathParams:
+        return self._request.path_params
+
+
+class AiohttpServerApp:
+    """
+    Webhook server on :class:`aiohttp.web.Server`, without ``Application``, router, middlewares or signals.
+
+    Requests are matched against the registered webhook paths only; everything else is answered with ``404``.
+    """
+
+    def __init__(self, **server_kwargs: Any) -> None:
+        """
+        :param server_kwargs: Keyword arguments for :class:`aiohttp.web.Server`, for example ``client_max_size``.
+        """
+        self.server_kwargs = server_kwargs
+        self.on_startup: list[Callable[[], Awaitable[None]]] = []
+        self.on_shutdown: list[Callable[[], Awaitable[None]]] = []
+
+        self._routes: list[tuple[PathTemplate, AiohttpServerEndpoint]] = []
+        self._runner: web.ServerRunner | None = None
+
+    @property
+    def addresses(self) -> list[Any]:
+        """Addresses the server listens on."""
+        return self._runner.addresses if self._runner is not None else []
+
+    def add_route(self, path: str, endpoint: AiohttpServerEndpoint) -> None:
+        self._routes.append((PathTemplate.from_input(path), endpoint))
+
+    async def start(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        *,
+        path: str | None = None,
+        shutdown_timeout: float = 60.0,
+        **site_kwargs: Any,
+    ) -> None:
+        """
+        Run startup callbacks and start listening.
+
+        :param host: TCP interface. Ignored when ``path`` is set.
+        :param port: TCP port. ``0`` picks a free port.
+        :param path: Unix socket path to listen on instead of TCP.
+        :param shutdown_timeout: Seconds to wait for in-flight requests on :meth:`stop`.
+        :param site_kwargs: Extra keyword arguments for the aiohttp site, for example ``reuse_port``.
+        """
+        for callback in self.on_startup:
+            await callback()
+
+        self._runner = web.ServerRunner(
+            web.Server(self._handle, **self.server_kwargs), shutdown_timeout=shutdown_timeout
+        )
+        await self._runner.setup()
+
+        if path is not None:
+            site: web.BaseSite = web.UnixSite(self._runner, path, **site_kwargs)
+        else:
+            site = web.TCPSite(self._runner, host, port, **site_kwargs)
+        await site.start()
+
+    async def stop(self) -> None:
+        """Stop listening, wait for in-flight requests, then run shutdown callbacks."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+        for callback in self.on_shutdown:
+            await callback()
+
+    def run(self, host: str | None = None, port: int | None = 8080, **start_kwargs: Any) -> None:
+        """Serve until ``SIGINT`` or ``SIGTERM``."""
+        asyncio.run(serve_until_stopped(self, host, port, **start_kwargs))
+
+    async def _handle(self, request: BaseRequest) -> web.StreamResponse:
+        path = request.path
+        for template, endpoint in self._routes:
+            path_params = template.match(path)
+            if path_params is None:
+                continue
+
+            if request.method != "POST":
+                return web.json_response(status=405, data={"detail": "Method not allowed"}, headers={"Allow": "POST"})
+            return await endpoint(AiohttpServerRequest(request=request, path_params=path_params))
+
+        return web.json_response(status=404, data={"detail": "Not found"})
+
+
+class AiohttpServerAdapter(WebAdapter[AiohttpServerApp, AiohttpServerRequest, Response]):
+    """Adapter for :class:`AiohttpServerApp`."""
+
+    def __init__(self) -> None:
+        self._bodies: RenderedResponses[bytes] = RenderedResponses()
+
+    def bind_request(self, request: AiohttpServerRequest) -> WebRequest[AiohttpServerRequest]:
+        return AiohttpServerWebRequest(request)
+
+    def register(
+        self,
+        app: AiohttpServerApp,
+        path: str,
+        handler: WebHandler[AiohttpServerRequest, Response],
+        *,
+        on_startup: LifecycleCallback,
+        on_shutdown: LifecycleCallback,
+    ) -> None:
+        async def endpoint(request: AiohttpServerRequest) -> Response:
+            return await handler(self.bind_request(request))
+
+        register_endpoint(app, path, endpoint, on_startup=on_startup, on_shutdown=on_shutdown)
+
+    def json_response(
+        self, status_code: int, data: dict[str, str] | None = None, headers: Mapping[str, str] | None = None
+    ) -> Response:
+        # Responses cannot be reused by aiohttp, so only their bodies are.
+        key = tuple(data.items()) if data is not None else None
+        body = self._bodies.get(key)
+        if body is None:
+            body = self._bodies.put(key, encode_json(data))
+
+        return Response(status=status_code, body=body, content_type="application/json", headers=headers)
+
+    def payload_response(
+        self, status_code: int, payload: Payload, headers: Mapping[str, str] | None = None
+    ) -> Response:
+        response_headers = dict(payload.headers)
+        response_headers.update(headers or {})
+        return Response(status=status_code, body=payload, headers=response_headers)
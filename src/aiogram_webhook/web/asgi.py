@@ -0,0 +1,280 @@
+import json
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import Payload
+
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.route.path import PathTemplate
+from aiogram_webhook.web._asgi import (
+    MAX_BODY_SIZE,
+    ASGIApp,
+    ASGIHeaders,
+    ASGIQueryParams,
+    ASGIStreamWriter,
+    BodyTooLargeError,
+    Receive,
+    Scope,
+    Send,
+    read_body,
+)
+from aiogram_webhook.web._responses import (
+    JSON_HEADER,
+    RawHeaders,
+    RenderedResponses,
+    encode_headers,
+    encode_json,
+    json_key,
+    register_endpoint,
+)
+from aiogram_webhook.web.base import (
+    Headers,
+    LifecycleCallback,
+    PathParams,
+    QueryParams,
+    WebAdapter,
+    WebHandler,
+    WebRequest,
+)
+
+logger = get_logger("web")
+
+
+@dataclass(frozen=True, slots=True)
+class ASGIRequest:
+    """Raw ASGI request: connection scope, receive channel and matched path params."""
+
+    scope: Scope
+    receive: Receive
+    path_params: PathParams
+    max_body_size: int = MAX_BODY_SIZE
+    """Largest body :meth:`ASGIWebRequest.read` accepts, in bytes."""
+
+
+class ASGIResponse:
+    """Complete ASGI response with encoded headers and body."""
+
+    __slots__ = ("body", "headers", "status_code")
+
+    def __init__(self, status_code: int, body: bytes = b"", headers: RawHeaders | None = None) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.headers = [*(headers or ()), (b"content-length", str(len(body)).encode())]
+
+    async def __call__(self, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.headers})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class ASGIPayloadResponse(ASGIResponse):
+    """Response streamed from a prebuilt aiohttp payload."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, status_code: int, payload: Payload, headers: RawHeaders | None = None) -> None:
+        self.status_code = status_code
+        self.body = b""
+        self.payload = payload
+        self.headers = headers or []
+
+        if payload.size is not None:
+            self.headers.append((b"content-length", str(payload.size).encode()))
+
+    async def __call__(self, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.headers})
+        writer = ASGIStreamWriter(send, size=self.payload.size)
+        await self.payload.write(writer)
+        await writer.write_eof()
+
+
+ASGIEndpoint = Callable[[ASGIRequest], Awaitable[ASGIResponse]]
+
+_NOT_FOUND = ASGIResponse(404, b'{"detail":"Not found"}', [JSON_HEADER])
+_METHOD_NOT_ALLOWED = ASGIResponse(405, b'{"detail":"Method not allowed"}', [JSON_HEADER, (b"allow", b"POST")])
+_PAYLOAD_TOO_LARGE = ASGIResponse(413, b'{"detail":"Payload too large"}', [JSON_HEADER])
+
+
+class ASGIWebRequest(WebRequest[ASGIRequest]):
+    """Request wrapper that reads everything straight from the ASGI scope."""
+
+    __slots__ = ("_body", "_request")
+
+    def __init__(self, request: ASGIRequest) -> None:
+        self._request = request
+        self._body: bytes | None = None
+
+    @property
+    def raw(self) -> ASGIRequest:
+        return self._request
+
+    @property
+    def client_ip(self) -> str | None:
+        client = self._request.scope.get("client")
+        return client[0] if client else None
+
+    async def json(self) -> dict[str, Any]:
+        return json.loads(await self.read())
+
+    async def read(self) -> bytes:
+        if self._body is None:
+            self._body = await read_body(self._request.receive, self._request.max_body_size)
+        return self._body
+
+    @property
+    def headers(self) -> Headers:
+        return ASGIHeaders(self._request.scope["headers"])
+
+    @property
+    def query_params(self) -> QueryParams:
+        return ASGIQueryParams(self._request.scope.get("query_string", b""))
+
+    @property
+    def path_params(self) -> PathParams:
+        return self._request.path_params
+
+
+class ASGIWebhookApp:
+    """
+    Minimal ASGI application serving webhook routes registered by :class:`ASGIAdapter`.
+
+    Requests that match no webhook route go to ``fallback`` when it is set, so the app can wrap any other ASGI
+    application; otherwise they are answered with ``404``.
+    """
+
+    def __init__(self, fallback: ASGIApp | None = None, *, max_body_size: int = MAX_BODY_SIZE) -> None:
+        """
+        :param fallback: ASGI application for every other request. Lifespan events are forwarded to it; webhook
+            callbacks run first when it receives startup and shutdown.
+        :param max_body_size: Largest accepted webhook request body in bytes; larger requests get ``413``.
+        """
+        self.fallback = fallback
+        self.max_body_size = max_body_size
+        self.on_startup: list[Callable[[], Awaitable[None]]] = []
+        self.on_shutdown: list[Callable[[], Awaitable[None]]] = []
+
+        self._routes: list[tuple[PathTemplate, ASGIEndpoint]] = []
+
+    def add_route(self, path: str, endpoint: ASGIEndpoint) -> None:
+        self._routes.append((PathTemplate.from_input(path), endpoint))
+
+    async def startup(self) -> None:
+        for callback in self.on_startup:
+            await callback()
+
+    async def shutdown(self) -> None:
+        for callback in self.on_shutdown:
+            await callback()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._handle_lifespan(scope, receive, send)
+        elif self.fallback is not None:
+            await self.fallback(scope, receive, send)
+
+    async def _handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path: str = scope["path"]
+        if (root_path := scope.get("root_path")) and path.startswith(root_path):
+            path = path[len(root_path) :] or "/"
+
+        for template, endpoint in self._routes:
+            path_params = template.match(path)
+            if path_params is None:
+                continue
+
+            if scope["method"] != "POST":
+                await _METHOD_NOT_ALLOWED(send)
+                return
+
+            request = ASGIRequest(
+                scope=scope, receive=receive, path_params=path_params, max_body_size=self.max_body_size
+            )
+            try:
+                response = await endpoint(request)
+            except ConnectionResetError:
+                logger.debug("Client disconnected before the webhook request was read")
+                return
+            except BodyTooLargeError as exc:
+                logger.warning("Rejected webhook request: %s", exc)
+                response = _PAYLOAD_TOO_LARGE
+
+            await response(send)
+            return
+
+        if self.fallback is not None:
+            await self.fallback(scope, receive, send)
+        else:
+            await _NOT_FOUND(send)
+
+    async def _handle_lifespan(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.fallback is not None:
+
+            async def receive_with_webhook_lifespan() -> dict[str, Any]:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await self.startup()
+                elif message["type"] == "lifespan.shutdown":
+                    await self.shutdown()
+                return message
+
+            await self.fallback(scope, receive_with_webhook_lifespan, send)
+            return
+
+        while True:
+            message = await receive()
+            phase = "startup" if message["type"] == "lifespan.startup" else "shutdown"
+            try:
+                await (self.startup() if phase == "startup" else self.shutdown())
+            except Exception as exc:
+                logger.exception("ASGI lifespan %s failed", phase)
+                await send({"type": f"lifespan.{phase}.failed", "message": str(exc)})
+                return
+
+            await send({"type": f"lifespan.{phase}.complete"})
+            if phase == "shutdown":
+                return
+
+
+class ASGIAdapter(WebAdapter[ASGIWebhookApp, ASGIRequest, ASGIResponse]):
+    """Framework-free ASGI adapter."""
+
+    def __init__(self) -> None:
+        self._responses: RenderedResponses[ASGIResponse] = RenderedResponses()
+
+    def bind_request(self, request: ASGIRequest) -> WebRequest[ASGIRequest]:
+        return ASGIWebRequest(request)
+
+    def register(
+        self,
+        app: ASGIWebhookApp,
+        path: str,
+        handler: WebHandler[ASGIRequest, ASGIResponse],
+        *,
+        on_startup: LifecycleCallback,
+        on_shutdown: LifecycleCallback,
+    ) -> None:
+        async def endpoint(request: ASGIRequest) -> ASGIResponse:
+            return await handler(self.bind_request(request))
+
+        register_endpoint(app, path, endpoint, on_startup=on_startup, on_shutdown=on_shutdown)
+
+    def json_response(
+        self, status_code: int, data: dict[str, str] | None = None, headers: Mapping[str, str] | None = None
+    ) -> ASGIResponse:
+        if headers:
+            return ASGIResponse(status_code, encode_json(data), [JSON_HEADER, *encode_headers(headers)])
+
+        key = json_key(status_code, data)
+        response = self._responses.get(key)
+        if response is None:
+            response = self._responses.put(key, ASGIResponse(status_code, encode_json(data), [JSON_HEADER]))
+        return response
+
+    def payload_response(
+        self, status_code: int, payload: Payload, headers: Mapping[str, str] | None = None
+    ) -> ASGIResponse:
+        response_headers = dict(payload.headers)
+        response_headers.update(headers or {})
+        return ASGIPayloadResponse(status_code, payload, encode_headers(response_headers))
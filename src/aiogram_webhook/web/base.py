@@ -1,9 +1,10 @@
+import json
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable, Mapping
+from collections.abc import Awaitable, Callable, Hashable, Mapping
 from typing import Any, Generic, Protocol, TypeAlias, TypeVar
 
 from aiohttp.payload import Payload
-from multidict import CIMultiDictProxy, MultiMapping
+from multidict import MultiMapping
 
 AppT = TypeVar("AppT")
 RawRequestT = TypeVar("RawRequestT")
@@ -12,7 +13,8 @@ FrameworkResponseT = TypeVar("FrameworkResponseT")
 LifecycleCallback: TypeAlias = Callable[..., Awaitable[None]]
 
 
-Headers = CIMultiDictProxy[str]
+Headers = MultiMapping[str]
+"""Read-only request headers; lookups are case-insensitive."""
 QueryParams = MultiMapping[str]
 PathParams = Mapping[str, str]
 
@@ -28,8 +30,27 @@ class WebRequest(Protocol[RawRequestT]):
     @property
     def client_ip(self) -> str | None: ...
 
+    @property
+    def connection(self) -> Hashable | None:
+        """
+        Return an object identifying the client connection, the same for every request on a keep-alive connection.
+
+        It must be weakly referenceable, so caches keyed by it drop entries with the connection. The default is
+        ``None``, meaning the connection is unknown: ASGI exposes no connection object, and a client address pair can
+        be reused by a later connection.
+        """
+        return None
+
     async def json(self) -> dict[str, Any]: ...
 
+    async def read(self) -> bytes:
+        """
+        Return the raw request body.
+
+        The default encodes :meth:`json` again; adapters that keep the body as received should return it instead.
+        """
+        return json.dumps(await self.json(), ensure_ascii=False, separators=(",", ":")).encode()
+
     @property
     def headers(self) -> Headers: ...
 
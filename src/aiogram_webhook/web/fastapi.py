@@ -5,8 +5,8 @@ from typing import Any
 from aiohttp import Payload
 from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.responses import JSONResponse
-from multidict import CIMultiDict, CIMultiDictProxy, MultiDict, MultiDictProxy
 
+from aiogram_webhook.web._asgi import ASGIHeaders, ASGIQueryParams
 from aiogram_webhook.web._starlette import AiohttpPayloadResponse
 from aiogram_webhook.web.base import (
     Headers,
@@ -38,16 +38,19 @@ class FastAPIWebRequest(WebRequest[Request]):
     async def json(self) -> dict[str, Any]:
         return await self._request.json()
 
+    async def read(self) -> bytes:
+        return await self._request.body()
+
     @property
     def headers(self) -> Headers:
         if self._headers is None:
-            self._headers = CIMultiDictProxy(CIMultiDict(self._request.headers.items()))
+            self._headers = ASGIHeaders(self._request.scope["headers"])
         return self._headers
 
     @property
     def query_params(self) -> QueryParams:
         if self._query_params is None:
-            self._query_params = MultiDictProxy[str](MultiDict(self._request.query_params.multi_items()))
+            self._query_params = ASGIQueryParams(self._request.scope.get("query_string", b""))
         return self._query_params
 
     @property
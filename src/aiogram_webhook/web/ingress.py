@@ -0,0 +1,525 @@
+import asyncio
+import json
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from dataclasses import dataclass
+from typing import IO, Any, Literal
+
+from aiohttp import Payload
+from aiohttp.abc import AbstractStreamWriter
+from multidict import CIMultiDict
+
+from aiogram_webhook.logs import get_logger
+from aiogram_webhook.route.path import PathTemplate
+from aiogram_webhook.web._asgi import ASGIHeaders, ASGIQueryParams
+from aiogram_webhook.web._http import BuiltinParser, HTTPError, Message, RawHeaders, render_head
+from aiogram_webhook.web._responses import (
+    JSON_HEADER,
+    RenderedResponses,
+    encode_headers,
+    encode_json,
+    json_key,
+    register_endpoint,
+    serve_until_stopped,
+)
+from aiogram_webhook.web.base import (
+    Headers,
+    LifecycleCallback,
+    PathParams,
+    QueryParams,
+    WebAdapter,
+    WebHandler,
+    WebRequest,
+)
+
+logger = get_logger("web")
+
+HTTPParser = Literal["auto", "httptools", "builtin"]
+
+_MAX_PIPELINED = 16
+_CONTINUE = b"HTTP/1.1 100 Continue\r\n\r\n"
+_END_KEEP_ALIVE = b"\r\n"
+_END_CLOSE = b"connection: close\r\n\r\n"
+
+
+@dataclass(frozen=True, slots=True)
+class IngressRequest:
+    """Request read by :class:`IngressServer`: raw headers and body as received, plus matched path params."""
+
+    method: str
+    path: str
+    query_string: bytes
+    headers: RawHeaders
+    body: bytes
+    client_ip: str | None
+    path_params: PathParams
+    connection: Hashable | None = None
+
+
+class IngressResponse:
+    """Complete response with the status line and headers encoded once."""
+
+    __slots__ = ("body", "head", "status_code")
+
+    def __init__(self, status_code: int, body: bytes = b"", headers: RawHeaders | None = None) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.head = render_head(status_code, [*(headers or ()), (b"content-length", b"%d" % len(body))])
+
+    async def write(self, writer: "_TransportWriter", *, keep_alive: bool) -> None:
+        writer.write_parts(self.head, _END_KEEP_ALIVE if keep_alive else _END_CLOSE, self.body)
+
+
+class IngressPayloadResponse(IngressResponse):
+    """Response streamed from a prebuilt aiohttp payload, chunked when its size is unknown."""
+
+    __slots__ = ("chunked", "payload")
+
+    def __init__(self, status_code: int, payload: Payload, headers: RawHeaders | None = None) -> None:
+        self.status_code = status_code
+        self.body = b""
+        self.payload = payload
+        self.chunked = payload.size is None
+
+        headers = headers or []
+        if self.chunked:
+            headers.append((b"transfer-encoding", b"chunked"))
+        else:
+            headers.append((b"content-length", b"%d" % payload.size))
+        self.head = render_head(status_code, headers)
+
+    async def write(self, writer: "_TransportWriter", *, keep_alive: bool) -> None:
+        writer.write_parts(self.head, _END_KEEP_ALIVE if keep_alive else _END_CLOSE)
+        if self.chunked:
+            writer.enable_chunking()
+        await self.payload.write(writer)
+        await writer.write_eof()
+
+
+IngressEndpoint = Callable[[IngressRequest], Awaitable[IngressResponse]]
+
+_NOT_FOUND = IngressResponse(404, b'{"detail":"Not found"}', [JSON_HEADER])
+_METHOD_NOT_ALLOWED = IngressResponse(405, b'{"detail":"Method not allowed"}', [JSON_HEADER, (b"allow", b"POST")])
+_INTERNAL_ERROR = IngressResponse(500, b'{"detail":"Internal server error"}', [JSON_HEADER])
+
+
+class IngressWebRequest(WebRequest[IngressRequest]):
+    """Request wrapper over the bytes read by :class:`IngressServer`; nothing is decoded until it is accessed."""
+
+    __slots__ = ("_request",)
+
+    def __init__(self, request: IngressRequest) -> None:
+        self._request = request
+
+    @property
+    def raw(self) -> IngressRequest:
+        return self._request
+
+    @property
+    def client_ip(self) -> str | None:
+        return self._request.client_ip
+
+    @property
+    def connection(self) -> Hashable | None:
+        return self._request.connection
+
+    async def json(self) -> dict[str, Any]:
+        return json.loads(self._request.body)
+
+    async def read(self) -> bytes:
+        return self._request.body
+
+    @property
+    def headers(self) -> Headers:
+        return ASGIHeaders(self._request.headers)
+
+    @property
+    def query_params(self) -> QueryParams:
+        return ASGIQueryParams(self._request.query_string)
+
+    @property
+    def path_params(self) -> PathParams:
+        return self._request.path_params
+
+
+class IngressServer:
+    """
+    Built-in HTTP/1.1 server for webhook ingress on plain :mod:`asyncio`.
+
+    It serves ``POST`` requests to registered webhook paths over keep-alive connections and nothing else: no
+    routing beyond webhook paths, middlewares, TLS or HTTP/2. Put it behind a reverse proxy that terminates TLS.
+    """
+
+    def __init__(
+        self,
+        *,
+        client_max_size: int = 1024**2,
+        keepalive_timeout: float = 75.0,
+        http_parser: HTTPParser = "auto",
+    ) -> None:
+        """
+        :param client_max_size: Largest accepted request body in bytes; larger requests get ``413``.
+        :param keepalive_timeout: Seconds an idle keep-alive connection stays open.
+        :param http_parser: ``"httptools"``, ``"builtin"``, or ``"auto"`` to use httptools when it is installed.
+            The built-in parser accepts ``Content-Length`` bodies only, which is what Telegram sends.
+        """
+        self.client_max_size = client_max_size
+        self.keepalive_timeout = keepalive_timeout
+        self.on_startup: list[Callable[[], Awaitable[None]]] = []
+        self.on_shutdown: list[Callable[[], Awaitable[None]]] = []
+        self.connections: set[_HTTPConnection] = set()
+        self.draining = False
+
+        self._parser_class = _parser_class(http_parser)
+        self._routes: list[tuple[PathTemplate, IngressEndpoint]] = []
+        self._server: asyncio.Server | None = None
+        self._shutdown_timeout = 60.0
+
+    @property
+    def addresses(self) -> list[Any]:
+        """Addresses the server listens on."""
+        if self._server is None:
+            return []
+        return [sock.getsockname() for sock in self._server.sockets]
+
+    def add_route(self, path: str, endpoint: IngressEndpoint) -> None:
+        self._routes.append((PathTemplate.from_input(path), endpoint))
+
+    async def start(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        *,
+        path: str | None = None,
+        shutdown_timeout: float = 60.0,
+        **server_kwargs: Any,
+    ) -> None:
+        """
+        Run startup callbacks and start listening.
+
+        :param host: TCP interface. Ignored when ``path`` is set.
+        :param port: TCP port. ``0`` picks a free port.
+        :param path: Unix socket path to listen on instead of TCP.
+        :param shutdown_timeout: Seconds to wait for in-flight requests on :meth:`stop`.
+        :param server_kwargs: Extra keyword arguments for :meth:`asyncio.loop.create_server`, for example
+            ``reuse_port`` or ``backlog``.
+        """
+        for callback in self.on_startup:
+            await callback()
+
+        loop = asyncio.get_running_loop()
+        self._shutdown_timeout = shutdown_timeout
+        self.draining = False
+        if path is not None:
+            self._server = await loop.create_unix_server(self._connection, path, **server_kwargs)
+        else:
+            self._server = await loop.create_server(self._connection, host, port, **server_kwargs)
+
+    async def stop(self) -> None:
+        """
+        Stop accepting connections, let in-flight requests finish, then run shutdown callbacks.
+
+        Idle keep-alive connections are closed at once; busy ones are closed after their current response, and
+        whatever is still running after ``shutdown_timeout`` is aborted.
+        """
+        if self._server is not None:
+            self._server.close()
+            self.draining = True
+
+            busy = [task for connection in list(self.connections) if (task := connection.close_when_idle())]
+            if busy:
+                _, pending = await asyncio.wait(busy, timeout=self._shutdown_timeout)
+                if pending:
+                    logger.warning("Aborting %s connection(s) still busy after shutdown timeout", len(pending))
+            for connection in list(self.connections):
+                connection.abort()
+
+            await self._server.wait_closed()
+            self._server = None
+
+        for callback in self.on_shutdown:
+            await callback()
+
+    def run(self, host: str | None = None, port: int | None = 8080, **start_kwargs: Any) -> None:
+        """Serve until ``SIGINT`` or ``SIGTERM``."""
+        asyncio.run(serve_until_stopped(self, host, port, **start_kwargs))
+
+    def _connection(self) -> "_HTTPConnection":
+        return _HTTPConnection(self, self._parser_class)
+
+    async def respond(
+        self, message: Message, client_ip: str | None, connection: Hashable | None = None
+    ) -> IngressResponse:
+        matched = self._match(message.path)
+        if matched is None:
+            return _NOT_FOUND
+        if message.method != "POST":
+            return _METHOD_NOT_ALLOWED
+
+        endpoint, path_params = matched
+        request = IngressRequest(
+            method=message.method,
+            path=message.path,
+            query_string=message.query_string,
+            headers=message.headers,
+            body=message.body,
+            client_ip=client_ip,
+            path_params=path_params,
+            connection=connection,
+        )
+        try:
+            return await endpoint(request)
+        except Exception:
+            logger.exception("Unhandled error while serving webhook request")
+            return _INTERNAL_ERROR
+
+    def _match(self, path: str) -> tuple[IngressEndpoint, PathParams] | None:
+        for template, endpoint in self._routes:
+            path_params = template.match(path)
+            if path_params is not None:
+                return endpoint, path_params
+        return None
+
+
+class _HTTPConnection(asyncio.Protocol):
+    """One client connection: parses requests, answers them in order and keeps the connection alive."""
+
+    _transport: asyncio.Transport
+    _writer: "_TransportWriter"
+
+    def __init__(self, server: IngressServer, parser_class: type[BuiltinParser]) -> None:
+        self._server = server
+        self._parser = parser_class(self._on_message, self._on_continue, max_body_size=server.client_max_size)
+        self._messages: deque[Message] = deque()
+        self._error: HTTPError | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._client_ip: str | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # ty:ignore[invalid-assignment]
+        self._writer = _TransportWriter(self._transport)
+        if (peer_name := transport.get_extra_info("peername")) and isinstance(peer_name, tuple):
+            self._client_ip = peer_name[0]
+
+        self._server.connections.add(self)
+        self._reset_idle_timer()
+
+    def connection_lost(self, exc: Exception | None) -> None:  # noqa: ARG002
+        self._server.connections.discard(self)
+        self._cancel_idle_timer()
+        self._writer.connection_lost()
+
+    def pause_writing(self) -> None:
+        self._writer.pause()
+
+    def resume_writing(self) -> None:
+        self._writer.resume()
+
+    def data_received(self, data: bytes) -> None:
+        self._cancel_idle_timer()
+        try:
+            self._parser.feed(data)
+        except HTTPError as exc:
+            # Requests parsed before the error are still answered; then the error response closes the connection.
+            self._error = exc
+            self._transport.pause_reading()
+            self._schedule()
+            return
+
+        if self._task is None:
+            self._reset_idle_timer()
+
+    def close_when_idle(self) -> asyncio.Task[None] | None:
+        """Close now when idle; otherwise return the task that closes the connection after its current response."""
+        if self._task is None:
+            self._transport.close()
+        return self._task
+
+    def abort(self) -> None:
+        self._transport.abort()
+
+    def _on_message(self, message: Message) -> None:
+        self._messages.append(message)
+        if len(self._messages) >= _MAX_PIPELINED:
+            self._transport.pause_reading()
+        self._schedule()
+
+    def _on_continue(self) -> None:
+        self._transport.write(_CONTINUE)
+
+    def _schedule(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._serve())
+
+    async def _serve(self) -> None:
+        try:
+            while self._messages and not self._transport.is_closing():
+                await self._answer(self._messages.popleft())
+            if self._error is not None:
+                self._fail(self._error)
+        except OSError as exc:
+            # ConnectionError covers resets and broken pipes; other OSErrors come from a failed sendfile.
+            logger.debug("Connection lost while writing the webhook response: %s", exc)
+            self._transport.close()
+        finally:
+            self._task = None
+
+        if self._server.draining:
+            self._transport.close()
+        elif not self._transport.is_closing():
+            self._reset_idle_timer()
+
+    async def _answer(self, message: Message) -> None:
+        response = await self._server.respond(message, self._client_ip, self)
+        keep_alive = message.keep_alive and not self._server.draining
+        await response.write(self._writer, keep_alive=keep_alive)
+        await self._writer.drain()
+
+        if not keep_alive:
+            self._transport.close()
+        elif len(self._messages) < _MAX_PIPELINED and not self._transport.is_reading():
+            self._transport.resume_reading()
+
+    def _fail(self, error: HTTPError) -> None:
+        response = IngressResponse(error.status, encode_json({"detail": str(error)}), [JSON_HEADER])
+        self._writer.write_parts(response.head, _END_CLOSE, response.body)
+        self._transport.close()
+
+    def _reset_idle_timer(self) -> None:
+        self._cancel_idle_timer()
+        self._idle_handle = asyncio.get_running_loop().call_later(self._server.keepalive_timeout, self._transport.close)
+
+    def _cancel_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+
+class _TransportWriter(AbstractStreamWriter):
+    """
+    Stream writer over an asyncio transport, honouring the protocol's write flow control.
+
+    File payloads are handed to :meth:`asyncio.loop.sendfile`, which uses ``os.sendfile`` on TCP sockets.
+    """
+
+    __slots__ = ("_chunked", "_drained", "_transport")
+
+    def __init__(self, transport: asyncio.WriteTransport) -> None:
+        self._transport = transport
+        self._chunked = False
+        self._drained: asyncio.Future[None] | None = None
+
+    def write_parts(self, *parts: bytes) -> None:
+        if not self._transport.is_closing():
+            self._transport.writelines(parts)
+
+    async def write(self, chunk: bytes | bytearray | memoryview) -> None:
+        if not chunk:
+            return
+        if self._chunked:
+            self.write_parts(b"%x\r\n" % len(chunk), bytes(chunk), b"\r\n")
+        else:
+            self.write_parts(bytes(chunk))
+        await self.drain()
+
+    async def sendfile(self, file: IO[bytes], offset: int, count: int) -> None:
+        if self._transport.is_closing():
+            raise ConnectionResetError("Connection lost while writing the response.")
+
+        if self._chunked:
+            self.write_parts(b"%x\r\n" % count)
+        await self.drain()
+        await asyncio.get_running_loop().sendfile(self._transport, file, offset, count)
+        if self._chunked:
+            self.write_parts(b"\r\n")
+
+    async def write_eof(self, chunk: bytes = b"") -> None:
+        await self.write(chunk)
+        if self._chunked:
+            self.write_parts(b"0\r\n\r\n")
+            self._chunked = False
+
+    async def drain(self) -> None:
+        if self._drained is not None:
+            await asyncio.shield(self._drained)
+
+    def pause(self) -> None:
+        if self._drained is None:
+            self._drained = asyncio.get_running_loop().create_future()
+
+    def resume(self) -> None:
+        if self._drained is not None:
+            self._drained.set_result(None)
+            self._drained = None
+
+    def connection_lost(self) -> None:
+        if self._drained is not None:
+            self._drained.set_exception(ConnectionResetError("Connection lost while writing the response."))
+            self._drained.exception()
+            self._drained = None
+
+    def enable_compression(self, encoding: str = "deflate", strategy: int | None = None) -> None:  # noqa: ARG002
+        return None
+
+    def enable_chunking(self) -> None:
+        self._chunked = True
+
+    async def write_headers(self, status_line: str, headers: CIMultiDict[str]) -> None:  # noqa: ARG002
+        return None
+
+
+class IngressAdapter(WebAdapter[IngressServer, IngressRequest, IngressResponse]):
+    """Adapter for the built-in :class:`IngressServer`."""
+
+    def __init__(self) -> None:
+        self._responses: RenderedResponses[IngressResponse] = RenderedResponses()
+
+    def bind_request(self, request: IngressRequest) -> WebRequest[IngressRequest]:
+        return IngressWebRequest(request)
+
+    def register(
+        self,
+        app: IngressServer,
+        path: str,
+        handler: WebHandler[IngressRequest, IngressResponse],
+        *,
+        on_startup: LifecycleCallback,
+        on_shutdown: LifecycleCallback,
+    ) -> None:
+        async def endpoint(request: IngressRequest) -> IngressResponse:
+            return await handler(self.bind_request(request))
+
+        register_endpoint(app, path, endpoint, on_startup=on_startup, on_shutdown=on_shutdown)
+
+    def json_response(
+        self, status_code: int, data: dict[str, str] | None = None, headers: Mapping[str, str] | None = None
+    ) -> IngressResponse:
+        if headers:
+            return IngressResponse(status_code, encode_json(data), [JSON_HEADER, *encode_headers(headers)])
+
+        key = json_key(status_code, data)
+        response = self._responses.get(key)
+        if response is None:
+            response = self._responses.put(key, IngressResponse(status_code, encode_json(data), [JSON_HEADER]))
+        return response
+
+    def payload_response(
+        self, status_code: int, payload: Payload, headers: Mapping[str, str] | None = None
+    ) -> IngressResponse:
+        response_headers = dict(payload.headers)
+        response_headers.update(headers or {})
+        return IngressPayloadResponse(status_code, payload, encode_headers(response_headers))
+
+
+def _parser_class(http_parser: HTTPParser) -> type[BuiltinParser]:
+    if http_parser == "builtin":
+        return BuiltinParser
+
+    try:
+        from aiogram_webhook.web._httptools import HttptoolsParser  # noqa: PLC0415
+    except ModuleNotFoundError as exc:
+        if exc.name != "httptools" or http_parser == "httptools":
+            raise
+        return BuiltinParser
+    return HttptoolsParser  # ty:ignore[invalid-return-type]
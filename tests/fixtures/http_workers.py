@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+from aiohttp import web
+
+from aiogram_webhook.web.aiohttp_runner import WorkerContext
+
+
+def build_marker_app(context: WorkerContext) -> web.Application:
+    """Application that records worker startup in the file named by ``AIOGRAM_WEBHOOK_TEST_MARKERS``."""
+    markers = Path(os.environ["AIOGRAM_WEBHOOK_TEST_MARKERS"])
+
+    def mark(line: str) -> None:
+        with markers.open("a", encoding="utf-8") as file:
+            file.write(f"{line}\n")
+
+    async def on_startup(_: web.Application) -> None:
+        mark(f"ready {context.index}")
+        if context.is_primary:
+            mark(f"webhook {context.index}")
+
+    async def worker(_: web.Request) -> web.Response:
+        return web.Response(text=str(context.index))
+
+    app = web.Application()
+    app.router.add_get("/worker", worker)
+    app.on_startup.append(on_startup)
+    return app
+
+
+def crash_at_startup(context: WorkerContext) -> None:
+    """Worker target that records its start in ``AIOGRAM_WEBHOOK_TEST_MARKERS`` and exits with an error."""
+    with Path(os.environ["AIOGRAM_WEBHOOK_TEST_MARKERS"]).open("a", encoding="utf-8") as file:
+        file.write(f"start {context.index} {context.restarts} {context.is_primary}\n")
+    raise SystemExit(3)
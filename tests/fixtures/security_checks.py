@@ -1,6 +1,6 @@
 from aiogram_webhook.engines.target import Target
 from aiogram_webhook.route.params import RouteParams
-from aiogram_webhook.security.checks.check import SecurityCheck
+from aiogram_webhook.security.checks.check import SecurityCheck, SyncSecurityCheck
 from aiogram_webhook.web.base import WebRequest
 
 
@@ -13,3 +13,12 @@ class RecordingCheck(SecurityCheck):
     async def verify(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
         self.calls.append(self.name)
         return self.result
+
+
+class SyncRecordingCheck(RecordingCheck, SyncSecurityCheck):
+    async def verify(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        raise AssertionError("Security must call verify_sync() for synchronous checks")
+
+    def verify_sync(self, target: Target, request: WebRequest, route_params: RouteParams) -> bool:
+        self.calls.append(self.name)
+        return self.result
@@ -1,3 +1,4 @@
+import json
 from collections.abc import Mapping
 from typing import Any
 
@@ -14,6 +15,7 @@ class DummyRequest:
         ip: str | None = None,
         json_data: dict[str, Any] | None = None,
         json_error: ValueError | None = None,
+        connection: Any = None,
     ) -> None:
         self.path_params = dict(path_params or {})
         self.query: MultiDict[str] = query or MultiDict()
@@ -21,6 +23,7 @@ class DummyRequest:
         self.ip = ip
         self.json_data = json_data or {}
         self.json_error = json_error
+        self.connection = connection
 
 
 class DummyWebRequest:
@@ -35,12 +38,19 @@ class DummyWebRequest:
     def client_ip(self) -> str | None:
         return self._request.ip
 
+    @property
+    def connection(self):
+        return self._request.connection
+
     async def json(self) -> dict[str, Any]:
         if self._request.json_error is not None:
             raise self._request.json_error
 
         return self._request.json_data
 
+    async def read(self) -> bytes:
+        return json.dumps(self._request.json_data).encode()
+
     @property
     def headers(self):
         return CIMultiDict(self._request.headers.items())
@@ -0,0 +1,32 @@
+import asyncio
+from pathlib import Path
+
+from aiogram import Dispatcher
+from aiogram.types import Message
+
+
+def build_recording_dispatcher(path: str) -> Dispatcher:
+    """Worker dispatcher factory that appends ``chat_id:text`` of every message to a file."""
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    def record(message: Message) -> None:
+        with Path(path).open("a", encoding="utf-8") as file:
+            file.write(f"{message.chat.id}:{message.text}\n")
+
+    return dispatcher
+
+
+def build_failing_dispatcher() -> Dispatcher:
+    raise RuntimeError("Dispatcher factory failed.")
+
+
+def build_hanging_dispatcher() -> Dispatcher:
+    """Worker dispatcher factory whose message handler never finishes."""
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    async def hang(message: Message) -> None:  # noqa: ARG001
+        await asyncio.Event().wait()
+
+    return dispatcher
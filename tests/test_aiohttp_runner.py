@@ -0,0 +1,87 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+from aiogram_webhook.web.aiohttp_runner import WorkerContext, _Supervisor
+from tests.fixtures.http_workers import crash_at_startup
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_worker_context_marks_first_worker_as_primary():
+    assert WorkerContext(index=0, workers=2).is_primary
+    assert not WorkerContext(index=1, workers=2).is_primary
+    assert not WorkerContext(index=0, workers=2, restarts=1).is_primary
+
+
+def test_supervisor_backs_off_and_gives_up_on_crash_loop(tmp_path, monkeypatch):
+    markers = tmp_path / "markers.txt"
+    monkeypatch.setenv("AIOGRAM_WEBHOOK_TEST_MARKERS", str(markers))
+    supervisor = _Supervisor(crash_at_startup, workers=1, restart=True, restart_delay=0.05, max_restarts=3)
+
+    started = time.monotonic()
+    supervisor.run()
+    elapsed = time.monotonic() - started
+
+    assert supervisor.crashed == 0
+    assert markers.read_text().splitlines() == [
+        "start 0 0 True",
+        "start 0 1 False",
+        "start 0 2 False",
+        "start 0 3 False",
+    ]
+    # Delays of 0.05, 0.1 and 0.2 seconds between the four starts.
+    assert elapsed >= 0.35
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("reuse_port", [True, False])
+async def test_run_workers_serves_one_port_and_runs_primary_startup_once(tmp_path, reuse_port):
+    if reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+        pytest.skip("SO_REUSEPORT is not supported on this platform.")
+
+    port = free_port()
+    markers = tmp_path / "markers.txt"
+    script = (
+        "from aiogram_webhook.web.aiohttp_runner import run_workers\n"
+        "from tests.fixtures.http_workers import build_marker_app\n"
+        f"run_workers(build_marker_app, host='127.0.0.1', port={port}, workers=2, reuse_port={reuse_port})\n"
+    )
+    env = {
+        **os.environ,
+        "AIOGRAM_WEBHOOK_TEST_MARKERS": str(markers),
+        "PYTHONPATH": os.pathsep.join((str(ROOT / "src"), str(ROOT))),
+    }
+    process = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=env)  # noqa: ASYNC220, S603
+
+    try:
+        for _ in range(300):
+            if markers.exists() and markers.read_text().count("ready") == 2:
+                break
+            await asyncio.sleep(0.1)
+
+        async with aiohttp.ClientSession() as session, session.get(f"http://127.0.0.1:{port}/worker") as response:
+            assert response.status == 200
+            assert await response.text() in {"0", "1"}
+    finally:
+        process.send_signal(signal.SIGTERM)
+        exit_code = await asyncio.to_thread(process.wait, 60)
+
+    lines = markers.read_text().splitlines()
+
+    assert exit_code == 0
+    assert sorted(lines) == ["ready 0", "ready 1", "webhook 0"]
@@ -0,0 +1,119 @@
+from typing import Any
+
+import aiohttp
+import pytest
+
+from aiogram_webhook.engines.base import BaseWebhookEngine
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.route import Route
+from aiogram_webhook.tasks import TaskTracker
+from aiogram_webhook.web.aiohttp_server import AiohttpServerAdapter, AiohttpServerApp
+from tests.fixtures.webhook_engine import DummyDispatcher
+
+
+def base_url(app: AiohttpServerApp) -> str:
+    host, port = app.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_server_adapter_passes_bound_request_to_registered_post_handler():
+    adapter = AiohttpServerAdapter()
+    app = AiohttpServerApp()
+    seen = {}
+
+    async def handler(request):
+        seen["client_ip"] = request.client_ip
+        seen["header"] = request.headers["X-Test"]
+        seen["query"] = request.query_params.getall("tag")
+        seen["path"] = request.path_params["bot_token"]
+        seen["json"] = await request.json()
+        return adapter.json_response(status_code=202, data={"ok": "yes"}, headers={"X-Reply": "done"})
+
+    async def noop(_app):
+        return None
+
+    adapter.register(app, "/webhook/{bot_token}", handler, on_startup=noop, on_shutdown=noop)
+    await app.start("127.0.0.1", 0)
+
+    try:
+        async with aiohttp.ClientSession(base_url(app)) as session:
+            async with session.post(
+                "/webhook/42:TEST?tag=first&tag=second", json={"update_id": 1}, headers={"X-Test": "yes"}
+            ) as response:
+                status, reply, body = response.status, response.headers["X-Reply"], await response.json()
+            async with session.post("/other", json={}) as response:
+                not_found = response.status
+            async with session.get("/webhook/42:TEST") as response:
+                wrong_method, allow = response.status, response.headers["Allow"]
+    finally:
+        await app.stop()
+
+    assert (status, reply, body) == (202, "done", {"ok": "yes"})
+    assert seen == {
+        "client_ip": "127.0.0.1",
+        "header": "yes",
+        "query": ["first", "second"],
+        "path": "42:TEST",
+        "json": {"update_id": 1},
+    }
+    assert not_found == 404
+    assert (wrong_method, allow) == (405, "POST")
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_server_app_runs_engine_lifecycle_around_serving(bot):
+    events = []
+
+    class SpyEngine(BaseWebhookEngine[Any, Any, Any]):
+        _task_tracker = TaskTracker()
+
+        async def _on_startup(self, app, *args, **kwargs) -> None:
+            events.append(("engine_startup", app))
+
+        async def _on_shutdown(self, app, *args, **kwargs) -> None:
+            events.append(("engine_shutdown", app))
+
+        async def _resolve_target(self, request, route_params) -> Target:
+            return Target(bot_id=bot.id, bot_token=bot.token)
+
+        async def _resolve_bot(self, target) -> Any:
+            return bot
+
+        def _get_task_tracker(self, bot) -> TaskTracker:
+            return self._task_tracker
+
+    engine = SpyEngine(
+        DummyDispatcher(),  # ty:ignore[invalid-argument-type]
+        web=AiohttpServerAdapter(),
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+    app = AiohttpServerApp()
+    engine.register(app)
+
+    await app.start("127.0.0.1", 0)
+    assert events == [("engine_startup", app)]
+
+    try:
+        async with (
+            aiohttp.ClientSession(base_url(app)) as session,
+            session.post("/webhook", json={"update_id": 1}) as response,
+        ):
+            status, body = response.status, await response.json()
+    finally:
+        await app.stop()
+
+    assert (status, body) == (200, {})
+    assert events == [("engine_startup", app), ("engine_shutdown", app)]
+
+
+def test_aiohttp_server_adapter_reuses_encoded_json_bodies():
+    adapter = AiohttpServerAdapter()
+
+    first = adapter.json_response(status_code=200, data={})
+    second = adapter.json_response(status_code=200, data={})
+
+    assert first is not second
+    assert first.body is second.body
+    assert first.content_type == "application/json"
@@ -24,6 +24,7 @@ def test_aiohttp_adapter_exposes_framework_request_data():
 
     assert request.raw is raw_request
     assert request.client_ip == "127.0.0.1"
+    assert request.connection is transport
     assert request.headers["X-Test"] == "yes"
     assert request.query_params.getall("tag") == ["first", "second"]
     assert request.path_params["bot_token"] == "42:TEST"
@@ -0,0 +1,247 @@
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from aiogram.methods import SendDocument
+from aiogram.types import BufferedInputFile
+from aiohttp import BytesPayload
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route as StarletteRoute
+from starlette.testclient import TestClient
+
+from aiogram_webhook.engines.base import BaseWebhookEngine
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.route import Route
+from aiogram_webhook.tasks import TaskTracker
+from aiogram_webhook.utils._payload import build_webhook_payload
+from aiogram_webhook.web._asgi import ASGIHeaders, ASGIQueryParams, ASGIStreamWriter, BodyTooLargeError, read_body
+from aiogram_webhook.web.asgi import ASGIAdapter, ASGIWebhookApp
+from tests.fixtures.multipart_payload import assert_attached_file, assert_multipart_fields
+from tests.fixtures.webhook_engine import DummyDispatcher
+
+
+async def noop_lifecycle(_app) -> None:
+    return None
+
+
+def test_asgi_headers_are_case_insensitive_view_over_raw_headers():
+    headers = ASGIHeaders([(b"x-test", b"one"), (b"content-type", b"application/json"), (b"x-test", b"two")])
+
+    assert headers["X-Test"] == "one"
+    assert headers.getall("x-TEST") == ["one", "two"]
+    assert headers.get("X-Missing") is None
+    assert "Content-Type" in headers
+    assert len(headers) == 3
+
+
+def test_asgi_query_params_keep_repeated_and_blank_values():
+    query = ASGIQueryParams(b"tag=first&tag=second&empty=&token=42%3ATEST")
+
+    assert query.getall("tag") == ["first", "second"]
+    assert query["empty"] == ""
+    assert query["token"] == "42:TEST"
+    assert list(query) == ["tag", "tag", "empty", "token"]
+    assert not ASGIQueryParams(b"")
+
+
+def test_asgi_adapter_passes_bound_request_to_registered_post_handler():
+    adapter = ASGIAdapter()
+    app = ASGIWebhookApp()
+    seen = {}
+
+    async def handler(request):
+        seen["client_ip"] = request.client_ip
+        seen["header"] = request.headers["X-Test"]
+        seen["query"] = request.query_params.getall("tag")
+        seen["path"] = request.path_params["bot_token"]
+        seen["json"] = await request.json()
+        seen["connection"] = request.connection
+
+        return adapter.json_response(status_code=202, data={"ok": "yes"}, headers={"X-Reply": "done"})
+
+    adapter.register(app, "/webhook/{bot_token}", handler, on_startup=noop_lifecycle, on_shutdown=noop_lifecycle)
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/webhook/42:TEST?tag=first&tag=second",
+            json={"update_id": 1},
+            headers={"X-Test": "yes"},
+        )
+        not_found = client.post("/other", json={})
+        wrong_method = client.get("/webhook/42:TEST")
+
+    assert response.status_code == 202
+    assert response.headers["X-Reply"] == "done"
+    assert response.json() == {"ok": "yes"}
+    assert seen == {
+        "client_ip": "testclient",
+        "header": "yes",
+        "query": ["first", "second"],
+        "path": "42:TEST",
+        "json": {"update_id": 1},
+        "connection": None,
+    }
+    assert not_found.status_code == 404
+    assert wrong_method.status_code == 405
+    assert wrong_method.headers["allow"] == "POST"
+
+
+def test_asgi_adapter_reuses_rendered_json_responses():
+    adapter = ASGIAdapter()
+
+    first = adapter.json_response(status_code=200, data={})
+    second = adapter.json_response(status_code=200, data={})
+
+    assert first is second
+    assert first.body == b"{}"
+    assert adapter.json_response(status_code=403, data={"detail": "Forbidden"}).body == b'{"detail":"Forbidden"}'
+
+
+def test_asgi_app_answers_oversized_webhook_body_with_413():
+    adapter = ASGIAdapter()
+    app = ASGIWebhookApp(max_body_size=16)
+    bodies = []
+
+    async def handler(request):
+        bodies.append(await request.read())
+        return adapter.json_response(status_code=200, data={})
+
+    adapter.register(app, "/webhook", handler, on_startup=noop_lifecycle, on_shutdown=noop_lifecycle)
+
+    with TestClient(app) as client:
+        accepted = client.post("/webhook", content=b"x" * 16)
+        rejected = client.post("/webhook", content=b"x" * 17)
+
+    assert accepted.status_code == 200
+    assert rejected.status_code == 413
+    assert bodies == [b"x" * 16]
+
+
+@pytest.mark.asyncio
+async def test_read_body_stops_reading_chunked_body_past_max_size():
+    messages = [{"type": "http.request", "body": b"x" * 8, "more_body": True} for _ in range(4)]
+    received = []
+
+    async def receive():
+        received.append(messages[len(received)])
+        return received[-1]
+
+    with pytest.raises(BodyTooLargeError):
+        await read_body(receive, max_size=12)
+
+    assert len(received) == 2
+
+
+def build_spy_engine(bot, adapter, events: list[tuple[str, Any]]) -> BaseWebhookEngine:
+    class SpyEngine(BaseWebhookEngine[Any, Any, Any]):
+        _task_tracker = TaskTracker()
+
+        async def _on_startup(self, app, *args, **kwargs) -> None:
+            events.append(("engine_startup", app))
+
+        async def _on_shutdown(self, app, *args, **kwargs) -> None:
+            events.append(("engine_shutdown", app))
+
+        async def _resolve_target(self, request, route_params) -> Target:
+            return Target(bot_id=bot.id, bot_token=bot.token)
+
+        async def _resolve_bot(self, target) -> Any:
+            return bot
+
+        def _get_task_tracker(self, bot) -> TaskTracker:
+            return self._task_tracker
+
+    return SpyEngine(
+        DummyDispatcher(),  # ty:ignore[invalid-argument-type]
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+
+
+def test_asgi_app_runs_engine_lifecycle_via_lifespan(bot):
+    events = []
+    engine = build_spy_engine(bot, ASGIAdapter(), events)
+    app = ASGIWebhookApp()
+    engine.register(app)
+
+    with TestClient(app) as client:
+        assert events == [("engine_startup", app)]
+        response = client.post("/webhook", json={"update_id": 1})
+
+    assert response.status_code == 200
+    assert response.json() == {}
+    assert events == [("engine_startup", app), ("engine_shutdown", app)]
+
+
+def test_asgi_app_wraps_fallback_app_and_its_lifespan(bot):
+    events = []
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        events.append(("fallback_startup", None))
+        yield
+
+    fallback = Starlette(
+        routes=[StarletteRoute("/health", lambda _request: PlainTextResponse("ok"))],
+        lifespan=lifespan,
+    )
+    engine = build_spy_engine(bot, ASGIAdapter(), events)
+    app = ASGIWebhookApp(fallback=fallback)
+    engine.register(app)
+
+    with TestClient(app) as client:
+        health = client.get("/health")
+        webhook = client.post("/webhook", json={"update_id": 1})
+
+    assert health.text == "ok"
+    assert webhook.status_code == 200
+    assert events == [("engine_startup", app), ("fallback_startup", None), ("engine_shutdown", app)]
+
+
+def test_asgi_adapter_streams_webhook_payload_with_attached_file(bot):
+    adapter = ASGIAdapter()
+    app = ASGIWebhookApp()
+
+    async def handler(_request):
+        method = SendDocument(chat_id=42, document=BufferedInputFile(b"hello", filename="hello.txt"))
+        return adapter.payload_response(status_code=200, payload=build_webhook_payload(bot=bot, method=method))
+
+    adapter.register(app, "/webhook", handler, on_startup=noop_lifecycle, on_shutdown=noop_lifecycle)
+
+    with TestClient(app) as client:
+        response = client.post("/webhook")
+
+    assert response.status_code == 200
+    parts = assert_multipart_fields(
+        response.headers["content-type"],
+        response.content,
+        {"method": "sendDocument", "chat_id": "42"},
+    )
+    assert_attached_file(parts, field="document", filename="hello.txt", body=b"hello")
+
+
+async def write_body_messages(*chunks: Any, payload: Any = None, **writer_kwargs: Any) -> list[tuple[bytes, bool]]:
+    sent = []
+
+    async def send(message):
+        sent.append((message["body"], message["more_body"]))
+
+    writer = ASGIStreamWriter(send, **writer_kwargs)
+    if payload is not None:
+        await payload.write(writer)
+    for chunk in chunks:
+        await writer.write(chunk)
+    await writer.write_eof()
+    return sent
+
+
+@pytest.mark.asyncio
+async def test_asgi_stream_writer_coalesces_small_chunks_and_sends_sized_payloads_at_once():
+    small = await write_body_messages(b"ab", bytearray(b"cd"), memoryview(b"ef"), b"ghij", buffer_size=5)
+    assert small == [(b"abcdef", True), (b"ghij", False)]
+
+    payload = BytesPayload(b"x" * 100)
+    sized = await write_body_messages(payload=payload, size=payload.size, buffer_size=10)
+    assert sized == [(b"x" * 100, False)]
@@ -0,0 +1,163 @@
+import pytest
+
+from aiogram_webhook.configs.bot import BotConfig
+from aiogram_webhook.engines.errors import BotNotFoundError, TargetNotFoundError
+from aiogram_webhook.engines.single import SingleBotEngine
+from aiogram_webhook.engines.token import TokenEngine
+from aiogram_webhook.route import BotTokenParam, Route
+from aiogram_webhook.route.errors import RouteMatchError
+from aiogram_webhook.security import BanList, IPCheck, Security, StaticSecretToken
+from aiogram_webhook.security.errors import SecretTokenError
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyDispatcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def secret_request(ip: str, secret: str, json_error: ValueError | None = None) -> DummyWebRequest:
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret}
+    return DummyWebRequest(DummyRequest(ip=ip, headers=headers, json_data={"update_id": 1}, json_error=json_error))
+
+
+def test_ban_list_bans_after_threshold_and_lifts_ban_after_duration():
+    clock = FakeClock()
+    bans = BanList(threshold=3, ban_duration=30, clock=clock)
+
+    assert [bans.record_failure("1.1.1.1") for _ in range(3)] == [False, False, True]
+    assert bans.is_banned("1.1.1.1")
+    assert not bans.is_banned("2.2.2.2")
+    assert not bans.is_banned(None)
+    assert (bans.banned, bans.tracked, bans.hits) == (1, 0, 1)
+
+    clock.now = 30
+    assert not bans.is_banned("1.1.1.1")
+    assert bans.banned == 0
+
+
+def test_ban_list_scores_decay_with_half_life():
+    clock = FakeClock()
+    bans = BanList(threshold=2, half_life=10, clock=clock)
+
+    bans.record_failure("1.1.1.1")
+    clock.now = 10
+    # The first failure has decayed to 0.5, so the second one leaves the score at 1.5.
+    assert not bans.record_failure("1.1.1.1")
+    clock.now = 10.1
+    assert bans.record_failure("1.1.1.1")
+
+
+def test_ban_list_evicts_least_recently_failed_addresses_when_full():
+    bans = BanList(threshold=2, max_tracked=2, clock=FakeClock())
+
+    for ip in ("1.1.1.1", "2.2.2.2", "3.3.3.3"):
+        bans.record_failure(ip)
+
+    assert bans.tracked == 2
+    assert not bans.record_failure("1.1.1.1")
+    assert bans.record_failure("3.3.3.3")
+
+    bans.unban("3.3.3.3")
+    assert not bans.is_banned("3.3.3.3")
+
+
+@pytest.mark.parametrize("ip", ["149.154.167.50", "91.108.4.1", "10.0.0.7"], ids=["telegram", "telegram-2", "exempt"])
+def test_ban_list_never_bans_telegram_or_exempt_networks(ip):
+    bans = BanList(threshold=1, exempt=["10.0.0.0/8"], clock=FakeClock())
+
+    assert not bans.record_failure(ip)
+    assert bans.is_exempt(ip)
+    assert not bans.is_banned(ip)
+    assert bans.tracked == 0
+
+
+def test_security_does_not_count_failures_of_ip_check_allowlist():
+    bans = BanList(threshold=1, clock=FakeClock())
+    security = Security(IPCheck("203.0.113.0/24", include_default=False), bans=bans)
+    error = SecretTokenError(target_bot_id=1)
+
+    security.record_failure(DummyWebRequest(DummyRequest(ip="203.0.113.9")), error)
+    assert not security.is_banned(DummyWebRequest(DummyRequest(ip="203.0.113.9")))
+
+    security.record_failure(DummyWebRequest(DummyRequest(ip="6.6.6.6")), error)
+    assert security.is_banned(DummyWebRequest(DummyRequest(ip="6.6.6.6")))
+
+
+def test_ban_list_counts_only_security_failures_by_default():
+    bans = BanList(threshold=1, clock=FakeClock())
+    security = Security(bans=bans)
+    request = DummyWebRequest(DummyRequest(ip="6.6.6.6"))
+
+    security.record_failure(request, TargetNotFoundError(route_param_names=("bot_token",)))
+    assert bans.tracked == 0
+    assert not security.is_banned(request)
+
+
+@pytest.mark.parametrize("status_code", [200, 500])
+def test_ban_list_rejects_unsupported_status_code(status_code):
+    with pytest.raises(ValueError, match="status_code"):
+        BanList(status_code=status_code)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compiled", [False, True], ids=["handle_request", "compiled"])
+async def test_engine_rejects_banned_client_before_reading_body(bot, adapter, compiled):
+    dispatcher = DummyDispatcher()
+    bans = BanList(threshold=2, clock=FakeClock())
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        security=Security(secret_token=StaticSecretToken("secret"), bans=bans),
+        handle_in_background=False,
+    )
+    handler = engine._compile_handler() if compiled else engine.handle_request
+
+    for _ in range(2):
+        response = await handler(secret_request("6.6.6.6", "wrong"))
+        assert response["status_code"] == 403  # ty:ignore[not-subscriptable]
+
+    response = await handler(secret_request("6.6.6.6", "secret", json_error=ValueError("unread body")))
+
+    assert response == {"kind": "json", "status_code": 403, "data": {"detail": "Forbidden"}, "headers": None}
+    assert dispatcher.webhook_update is None
+    assert bans.hits == 1
+
+    response = await handler(secret_request("1.1.1.1", "secret"))
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+
+
+@pytest.mark.asyncio
+async def test_token_engine_counts_unknown_tokens_and_answers_banned_clients_with_not_found(bot, adapter):
+    bans = BanList(
+        threshold=2,
+        status_code=404,
+        counts=(RouteMatchError, TargetNotFoundError, BotNotFoundError),
+        clock=FakeClock(),
+    )
+    engine = TokenEngine(
+        DummyDispatcher(),
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook/{bot_token}", params={"bot_token": BotTokenParam()}),
+        bot_config=BotConfig(session=bot.session),
+        security=Security(bans=bans),
+        handle_in_background=False,
+    )
+    handler = engine._compile_handler()
+
+    def token_request(token: str) -> DummyWebRequest:
+        return DummyWebRequest(DummyRequest(ip="6.6.6.6", path_params={"bot_token": token}))
+
+    statuses = [(await handler(token_request("not-a-token")))["status_code"] for _ in range(2)]  # ty:ignore[not-subscriptable]
+    response = await handler(token_request(bot.token))
+
+    assert statuses == [404, 404]
+    assert response == {"kind": "json", "status_code": 404, "data": {"detail": "Not found"}, "headers": None}
+    assert (bans.banned, bans.hits) == (1, 1)
+    assert engine.bots == {}
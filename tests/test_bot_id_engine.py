@@ -0,0 +1,79 @@
+import pytest
+
+from aiogram_webhook import BotIdEngine
+from aiogram_webhook.configs.bot import BotConfig
+from aiogram_webhook.route import BotIdParam, Route
+from aiogram_webhook.tokens import CachedTokenStore, MemoryTokenStore
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyDispatcher
+
+
+def bot_id_route() -> Route:
+    return Route(base_url="https://example.com", path="/webhook/{bot_id}", params={"bot_id": BotIdParam()})
+
+
+def bot_id_request(bot_id: str) -> DummyWebRequest:
+    return DummyWebRequest(DummyRequest(path_params={"bot_id": bot_id}, json_data={"update_id": 1}))
+
+
+@pytest.mark.asyncio
+async def test_bot_id_engine_resolves_token_from_store_and_builds_url_without_token(
+    bot, bot_id, bot_token, target, adapter
+):
+    dispatcher = DummyDispatcher()
+    engine = BotIdEngine(
+        dispatcher,
+        web=adapter,
+        route=bot_id_route(),
+        tokens=MemoryTokenStore({bot_id: bot_token}),
+        bot_config=BotConfig(session=bot.session),
+        handle_in_background=False,
+    )
+    handler = engine._compile_handler()
+
+    response = await handler(bot_id_request(str(bot_id)))
+
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    assert dispatcher.webhook_bot is engine.bots[bot_id]
+    assert dispatcher.webhook_bot.token == bot_token
+    assert isinstance(engine.tokens, CachedTokenStore)
+    assert await engine.route.build_url(target=target) == f"https://example.com/webhook/{bot_id}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path_bot_id", ["7", "not-an-id"], ids=["unknown", "invalid"])
+async def test_bot_id_engine_returns_not_found_for_unknown_or_invalid_bot_id(bot, adapter, path_bot_id):
+    dispatcher = DummyDispatcher()
+    engine = BotIdEngine(
+        dispatcher,
+        web=adapter,
+        route=bot_id_route(),
+        tokens=MemoryTokenStore(),
+        bot_config=BotConfig(session=bot.session),
+        handle_in_background=False,
+    )
+
+    response = await engine.handle_request(bot_id_request(path_bot_id))
+
+    assert response == {"kind": "json", "status_code": 404, "data": {"detail": "Not found"}, "headers": None}
+    assert dispatcher.webhook_update is None
+    assert engine.bots == {}
+
+
+@pytest.mark.asyncio
+async def test_bot_id_engine_remove_bot_deletes_token_from_store(bot, bot_id, bot_token, adapter):
+    tokens = MemoryTokenStore({bot_id: bot_token})
+    engine = BotIdEngine(
+        DummyDispatcher(),
+        web=adapter,
+        route=bot_id_route(),
+        tokens=tokens,
+        bot_config=BotConfig(session=bot.session),
+        handle_in_background=False,
+    )
+    await engine.handle_request(bot_id_request(str(bot_id)))
+
+    assert await engine.remove_bot(bot_id, delete_webhook=False) is True
+    assert await tokens.get(bot_id) is None
+    response = await engine.handle_request(bot_id_request(str(bot_id)))
+    assert response["status_code"] == 404  # ty:ignore[not-subscriptable]
@@ -60,6 +60,46 @@ def test_fastapi_adapter_passes_bound_request_to_registered_post_handler():
     assert seen["json"] == {"update_id": 1}
 
 
+def test_fastapi_request_reads_headers_and_query_from_asgi_scope_without_copying():
+    adapter = FastAPIAdapter()
+    app = FastAPI()
+    seen = {}
+
+    async def handler(request):
+        seen["same_headers"] = request.headers is request.headers
+        seen["raw_headers"] = request.headers._raw is request.raw.scope["headers"]
+        seen["secret"] = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
+        seen["forwarded"] = request.headers.getall("x-forwarded-for")
+        seen["missing"] = request.headers.get("X-Missing")
+        seen["query"] = dict(request.query_params)
+        return adapter.json_response(status_code=200, data={})
+
+    async def noop(_app):
+        return None
+
+    adapter.register(app, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+
+    with TestClient(app) as client:
+        client.post(
+            "/webhook?token=42%3ATEST&empty=",
+            json={"update_id": 1},
+            headers=[
+                ("X-Telegram-Bot-Api-Secret-Token", "secret"),
+                ("X-Forwarded-For", "1.1.1.1"),
+                ("X-Forwarded-For", "2.2.2.2"),
+            ],
+        )
+
+    assert seen == {
+        "same_headers": True,
+        "raw_headers": True,
+        "secret": "secret",
+        "forwarded": ["1.1.1.1", "2.2.2.2"],
+        "missing": None,
+        "query": {"token": "42:TEST", "empty": ""},
+    }
+
+
 def test_fastapi_adapter_registers_lifecycle_callbacks_via_router(bot):
     events = []
     adapter = FastAPIAdapter()
@@ -143,7 +183,7 @@ def test_fastapi_adapter_streams_webhook_payload_with_attached_file(bot):
         response = client.post("/webhook")
 
     assert response.status_code == 200
-    assert "content-length" not in response.headers  # payload.size is None for file attachments
+    assert response.headers["content-length"] == str(len(response.content))  # in-memory files are sized
     parts = assert_multipart_fields(
         response.headers["content-type"],
         response.content,
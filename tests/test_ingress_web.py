@@ -0,0 +1,373 @@
+import asyncio
+import importlib.util
+from typing import Any
+
+import aiohttp
+import pytest
+from aiogram.methods import SendDocument
+from aiogram.types import FSInputFile
+from aiohttp import BytesPayload
+
+from aiogram_webhook.engines.base import BaseWebhookEngine
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.route import Route
+from aiogram_webhook.tasks import TaskTracker
+from aiogram_webhook.utils._payload import build_webhook_payload
+from aiogram_webhook.web._http import MAX_HEAD_SIZE, BuiltinParser
+from aiogram_webhook.web.ingress import IngressAdapter, IngressResponse, IngressServer
+from tests.fixtures.multipart_payload import assert_attached_file, assert_multipart_fields
+from tests.fixtures.webhook_engine import DummyDispatcher
+
+PARSERS = [
+    "builtin",
+    pytest.param(
+        "httptools",
+        marks=pytest.mark.skipif(importlib.util.find_spec("httptools") is None, reason="httptools is not installed"),
+    ),
+]
+
+
+def base_url(server: IngressServer) -> str:
+    host, port = server.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+async def noop(_app):
+    return None
+
+
+def raw_request(path: str, body: bytes, *extra_headers: str) -> bytes:
+    headers = "".join(f"{header}\r\n" for header in extra_headers)
+    return f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n{headers}\r\n".encode() + body
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_parser", PARSERS)
+async def test_ingress_adapter_passes_bound_request_to_registered_post_handler(http_parser):
+    adapter = IngressAdapter()
+    server = IngressServer(http_parser=http_parser)
+    seen = {}
+
+    async def handler(request):
+        seen["client_ip"] = request.client_ip
+        seen["header"] = request.headers["X-Test"]
+        seen["query"] = request.query_params.getall("tag")
+        seen["path"] = request.path_params["bot_token"]
+        seen["json"] = await request.json()
+        return adapter.json_response(status_code=202, data={"ok": "yes"}, headers={"X-Reply": "done"})
+
+    adapter.register(server, "/webhook/{bot_token}", handler, on_startup=noop, on_shutdown=noop)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        async with aiohttp.ClientSession(base_url(server)) as session:
+            async with session.post(
+                "/webhook/42%3ATEST?tag=first&tag=second", json={"update_id": 1}, headers={"X-Test": "yes"}
+            ) as response:
+                status, reply, body = response.status, response.headers["X-Reply"], await response.json()
+            async with session.post("/other", json={}) as response:
+                not_found = response.status
+            async with session.get("/webhook/42:TEST") as response:
+                wrong_method, allow = response.status, response.headers["Allow"]
+    finally:
+        await server.stop()
+
+    assert (status, reply, body) == (202, "done", {"ok": "yes"})
+    assert seen == {
+        "client_ip": "127.0.0.1",
+        "header": "yes",
+        "query": ["first", "second"],
+        "path": "42:TEST",
+        "json": {"update_id": 1},
+    }
+    assert not_found == 404
+    assert (wrong_method, allow) == (405, "POST")
+
+
+@pytest.mark.asyncio
+async def test_ingress_requests_on_one_keep_alive_connection_share_the_connection_key():
+    adapter = IngressAdapter()
+    server = IngressServer()
+    connections = []
+
+    async def handler(request):
+        connections.append(request.connection)
+        return adapter.json_response(status_code=200, data={})
+
+    adapter.register(server, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        async with aiohttp.ClientSession(base_url(server)) as session:
+            for _ in range(2):
+                async with session.post("/webhook", data=b"{}") as response:
+                    await response.read()
+        async with aiohttp.ClientSession(base_url(server)) as session, session.post("/webhook", data=b"{}"):
+            pass
+    finally:
+        await server.stop()
+
+    first, second, other = connections
+    assert first is second
+    assert first is not None
+    assert other is not first
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_parser", PARSERS)
+async def test_ingress_server_answers_pipelined_requests_in_order_and_enforces_body_limit(http_parser):
+    adapter = IngressAdapter()
+    server = IngressServer(client_max_size=64, http_parser=http_parser)
+
+    async def handler(request):
+        update = await request.json()
+        await asyncio.sleep(0.01 if update["update_id"] == 1 else 0)
+        return adapter.json_response(status_code=200, data={"id": str(update["update_id"])})
+
+    adapter.register(server, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        reader, writer = await asyncio.open_connection(*server.addresses[0][:2])
+        pipelined = raw_request("/webhook", b'{"update_id": 1}') + raw_request("/webhook", b'{"update_id": 2}')
+        # Split mid-body so the second request arrives over two reads.
+        writer.write(pipelined[:-5])
+        await writer.drain()
+        await asyncio.sleep(0.01)
+        writer.write(pipelined[-5:] + raw_request("/webhook", b"x" * 65))
+        await writer.drain()
+
+        replies = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+    finally:
+        await server.stop()
+
+    first, second, too_large = replies.split(b"HTTP/1.1 ")[1:]
+    assert first.startswith(b"200 OK")
+    assert first.endswith(b'{"id":"1"}')
+    assert second.startswith(b"200 OK")
+    assert second.endswith(b'{"id":"2"}')
+    assert too_large.startswith(b"413 Request Entity Too Large")
+    assert b"connection: close" in too_large
+
+
+@pytest.mark.asyncio
+async def test_ingress_server_listens_on_unix_socket_and_streams_payload_responses(tmp_path):
+    adapter = IngressAdapter()
+    server = IngressServer()
+
+    async def handler(request):
+        payload = BytesPayload(await request.read(), content_type="text/plain")
+        return adapter.payload_response(status_code=200, payload=payload)
+
+    adapter.register(server, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+    socket_path = str(tmp_path / "ingress.sock")
+    await server.start(path=socket_path)
+
+    try:
+        async with (
+            aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=socket_path)) as session,
+            session.post("http://localhost/webhook", data=b"echo") as response,
+        ):
+            status, content_type, body = response.status, response.content_type, await response.read()
+    finally:
+        await server.stop()
+
+    assert (status, content_type, body) == (200, "text/plain", b"echo")
+
+
+@pytest.mark.asyncio
+async def test_ingress_server_sends_local_file_replies_with_content_length(bot, tmp_path):
+    adapter = IngressAdapter()
+    server = IngressServer()
+    path = tmp_path / "report.bin"
+    path.write_bytes(b"x" * 300_000)
+
+    async def handler(_request):
+        method = SendDocument(chat_id=42, document=FSInputFile(path))
+        return adapter.payload_response(status_code=200, payload=build_webhook_payload(bot=bot, method=method))
+
+    adapter.register(server, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        async with (
+            aiohttp.ClientSession(base_url(server)) as session,
+            session.post("/webhook", data=b"{}") as response,
+        ):
+            headers, body = response.headers, await response.read()
+    finally:
+        await server.stop()
+
+    assert int(headers["Content-Length"]) == len(body)
+    parts = assert_multipart_fields(headers["Content-Type"], body, {"method": "sendDocument", "chat_id": "42"})
+    assert_attached_file(parts, field="document", filename="report.bin", body=b"x" * 300_000)
+
+
+@pytest.mark.asyncio
+async def test_ingress_server_drains_in_flight_requests_before_shutdown(bot):
+    events = []
+    received = asyncio.Event()
+    release = asyncio.Event()
+
+    class SpyEngine(BaseWebhookEngine[Any, Any, Any]):
+        _task_tracker = TaskTracker()
+
+        async def _on_startup(self, app, *args, **kwargs) -> None:
+            events.append("engine_startup")
+
+        async def _on_shutdown(self, app, *args, **kwargs) -> None:
+            events.append("engine_shutdown")
+
+        async def _resolve_target(self, request, route_params) -> Target:
+            events.append("request")
+            received.set()
+            await release.wait()
+            return Target(bot_id=bot.id, bot_token=bot.token)
+
+        async def _resolve_bot(self, target) -> Any:
+            return bot
+
+        def _get_task_tracker(self, bot) -> TaskTracker:
+            return self._task_tracker
+
+    engine = SpyEngine(
+        DummyDispatcher(),  # ty:ignore[invalid-argument-type]
+        web=IngressAdapter(),
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+    server = IngressServer()
+    engine.register(server)
+    await server.start("127.0.0.1", 0)
+
+    idle_reader, idle_writer = await asyncio.open_connection(*server.addresses[0][:2])
+    reader, writer = await asyncio.open_connection(*server.addresses[0][:2])
+    writer.write(raw_request("/webhook", b'{"update_id": 1}'))
+    await writer.drain()
+    await asyncio.wait_for(received.wait(), timeout=5)
+
+    stopping = asyncio.create_task(server.stop())
+    await asyncio.sleep(0.05)
+    assert not stopping.done()
+    assert await asyncio.wait_for(idle_reader.read(), timeout=5) == b""
+
+    release.set()
+    reply = await asyncio.wait_for(reader.read(), timeout=5)
+    await stopping
+    idle_writer.close()
+    writer.close()
+
+    assert reply.startswith(b"HTTP/1.1 200 OK\r\n")
+    assert b"connection: close\r\n" in reply
+    assert reply.endswith(b"\r\n\r\n{}")
+    assert events == ["engine_startup", "request", "engine_shutdown"]
+
+
+def test_builtin_parser_reads_requests_fed_byte_by_byte_and_rejects_chunked_bodies():
+    messages, continued = [], []
+    parser = BuiltinParser(messages.append, lambda: continued.append(True), max_body_size=1024)
+
+    data = raw_request("/webhook?a=1", b'{"update_id": 1}', "Expect: 100-continue", "Connection: close")
+    for index in range(len(data)):
+        parser.feed(data[index : index + 1])
+
+    assert len(messages) == 1
+    message = messages[0]
+    assert (message.method, message.path, message.query_string, message.body) == (
+        "POST",
+        "/webhook",
+        b"a=1",
+        b'{"update_id": 1}',
+    )
+    assert (b"expect", b"100-continue") in message.headers
+    assert message.keep_alive is False
+    assert continued == [True]
+
+    with pytest.raises(Exception, match="Length Required"):
+        parser.feed(b"POST / HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("http_parser", PARSERS)
+async def test_ingress_server_rejects_conflicting_content_length_headers(http_parser):
+    adapter = IngressAdapter()
+    server = IngressServer(http_parser=http_parser)
+    handled = []
+
+    async def handler(request):
+        handled.append(await request.read())
+        return adapter.json_response(status_code=200, data={})
+
+    adapter.register(server, "/webhook", handler, on_startup=noop, on_shutdown=noop)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        reader, writer = await asyncio.open_connection(*server.addresses[0][:2])
+        writer.write(raw_request("/webhook", b'{"update_id": 1}', "Content-Length: 2"))
+        await writer.drain()
+
+        reply = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+    finally:
+        await server.stop()
+
+    assert reply.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+    assert handled == []
+
+
+def test_builtin_parser_accepts_repeated_equal_content_length():
+    messages = []
+    parser = BuiltinParser(messages.append, lambda: None, max_body_size=1024)
+
+    parser.feed(raw_request("/webhook", b"{}", "Content-Length: 2"))
+
+    assert [message.body for message in messages] == [b"{}"]
+
+
+def test_builtin_parser_limits_head_received_in_one_read():
+    parser = BuiltinParser(lambda _message: None, lambda: None, max_body_size=1024)
+
+    with pytest.raises(Exception, match="Request Header Fields Too Large"):
+        parser.feed(raw_request("/webhook", b"{}", f"X-Padding: {'x' * MAX_HEAD_SIZE}"))
+
+
+@pytest.mark.asyncio
+async def test_ingress_server_closes_connection_when_writing_the_response_fails():
+    class BrokenPipeResponse(IngressResponse):
+        async def write(self, writer, *, keep_alive):
+            raise BrokenPipeError
+
+    server = IngressServer()
+    unhandled = []
+    asyncio.get_running_loop().set_exception_handler(lambda _loop, context: unhandled.append(context))
+
+    async def endpoint(_request):
+        return BrokenPipeResponse(200)
+
+    server.add_route("/webhook", endpoint)
+    await server.start("127.0.0.1", 0)
+
+    try:
+        reader, writer = await asyncio.open_connection(*server.addresses[0][:2])
+        writer.write(raw_request("/webhook", b"{}"))
+        await writer.drain()
+
+        reply = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+    finally:
+        await server.stop()
+        asyncio.get_running_loop().set_exception_handler(None)
+
+    assert reply == b""
+    assert unhandled == []
+
+
+def test_ingress_adapter_reuses_rendered_json_responses():
+    adapter = IngressAdapter()
+
+    first = adapter.json_response(status_code=200, data={})
+    second = adapter.json_response(status_code=200, data={})
+
+    assert first is second
+    assert first.head.startswith(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n")
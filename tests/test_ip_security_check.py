@@ -1,6 +1,9 @@
+import gc
+from ipaddress import ip_address, ip_network
+
 import pytest
 
-from aiogram_webhook.security.checks.ip import IPCheck
+from aiogram_webhook.security.checks.ip import ConnectionVerdicts, IPCheck, IPRanges
 from tests.fixtures.web_request import DummyRequest, DummyWebRequest
 
 
@@ -42,3 +45,88 @@ async def test_ip_security_check_accepts_configured_client_sources(
     ip_check = IPCheck(*allowed_ips, include_default=False)
 
     assert await ip_check.verify(target=target, request=request, route_params={}) is expected
+
+
+def test_ip_ranges_merge_overlapping_and_adjacent_networks_per_family():
+    ranges = IPRanges.from_networks(
+        ip_network(value)
+        for value in ("10.0.0.0/24", "10.0.1.0/24", "10.0.0.128/25", "192.168.0.1/32", "2001:db8::/32", "::1/128")
+    )
+
+    assert len(ranges) == 4
+    assert ip_address("10.0.1.255") in ranges
+    assert ip_address("10.0.2.0") not in ranges
+    assert ip_address("192.168.0.1") in ranges
+    assert ip_address("192.168.0.0") not in ranges
+    assert ip_address("2001:db8:ffff::1") in ranges
+    assert ip_address("::2") not in ranges
+    assert ip_address("::ffff:10.0.0.1") not in ranges
+
+
+@pytest.mark.asyncio
+async def test_ip_security_check_rebuild_replaces_allowlist(target):
+    request = DummyWebRequest(DummyRequest(ip="10.1.2.3"))
+    ip_check = IPCheck("8.8.8.8", include_default=False)
+
+    assert await ip_check.verify(target=target, request=request, route_params={}) is False
+
+    ip_check.rebuild("10.0.0.0/8", include_default=False)
+
+    assert await ip_check.verify(target=target, request=request, route_params={}) is True
+
+
+class Connection:
+    """Weakly referenceable stand-in for a transport."""
+
+
+def test_ip_security_check_remembers_verdicts_per_connection(target):
+    ip_check = IPCheck("10.0.0.0/8", include_default=False, per_connection=True)
+    connection = Connection()
+
+    def verify(ip: str, connection, headers=None) -> bool:
+        request = DummyWebRequest(DummyRequest(ip=ip, headers=headers, connection=connection))
+        return ip_check.verify_sync(target=target, request=request, route_params={})
+
+    assert verify("10.0.0.1", connection) is True
+    # The client IP of a connection never changes; a different one here proves the lookup was skipped.
+    assert verify("8.8.8.8", connection) is True
+    assert verify("8.8.8.8", connection, headers={"X-Forwarded-For": "8.8.8.8"}) is False
+    assert len(ip_check._verdicts) == 1  # ty:ignore[invalid-argument-type]
+
+    del connection
+    gc.collect()
+    assert len(ip_check._verdicts) == 0  # ty:ignore[invalid-argument-type]
+
+    connection = Connection()
+    ip_check.rebuild("8.8.8.8", include_default=False)
+    assert verify("8.8.8.8", connection) is True
+
+
+def test_ip_security_check_does_not_remember_address_pairs(target):
+    ip_check = IPCheck("10.0.0.0/8", include_default=False, per_connection=True)
+
+    def verify(ip: str) -> bool:
+        request = DummyWebRequest(DummyRequest(ip=ip, connection=("10.0.0.1", 5000)))
+        return ip_check.verify_sync(target=target, request=request, route_params={})
+
+    # A later connection can reuse the same host and port; it must not inherit the earlier verdict.
+    assert verify("10.0.0.1") is True
+    assert verify("8.8.8.8") is False
+    assert len(ip_check._verdicts) == 0  # ty:ignore[invalid-argument-type]
+
+
+def test_connection_verdicts_drop_closing_transports():
+    class Transport:
+        closing = False
+
+        def is_closing(self) -> bool:
+            return self.closing
+
+    verdicts = ConnectionVerdicts()
+    transport = Transport()
+    verdicts.put(transport, verdict=True)
+
+    assert verdicts.get(transport) is True
+    transport.closing = True
+    assert verdicts.get(transport) is None
+    assert len(verdicts) == 0
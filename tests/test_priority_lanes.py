@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+
+from aiogram_webhook.background import Lane, PriorityLanes, UpdateJournal
+from aiogram_webhook.background.errors import LaneFullError, LanesClosedError
+from aiogram_webhook.engines.single import SingleBotEngine
+from tests.fixtures.shutdown import BlockingDispatcher
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyRoute
+
+
+def recording_job(name: str, calls: list[str]):
+    async def job() -> None:
+        calls.append(name)
+
+    return job
+
+
+def test_priority_lanes_map_update_types_and_fall_back_to_default_lane():
+    lanes = PriorityLanes(Lane("fast", {"callback_query"}), Lane("bulk"), Lane("posts", {"channel_post"}))
+
+    assert lanes.lane_for("callback_query").name == "fast"
+    assert lanes.lane_for("channel_post").name == "posts"
+    assert lanes.lane_for("message").name == "bulk"
+    assert lanes.lane_for(None).name == "bulk"
+
+
+def test_priority_lanes_reject_ambiguous_configuration():
+    with pytest.raises(ValueError, match="more than one lane"):
+        PriorityLanes(Lane("a", {"message"}), Lane("b", {"message"}))
+
+    with pytest.raises(ValueError, match="unique"):
+        PriorityLanes(Lane("a"), Lane("a"))
+
+
+@pytest.mark.asyncio
+async def test_priority_lanes_serve_high_priority_first_with_starvation_guard():
+    calls: list[str] = []
+    lanes = PriorityLanes(Lane("high", {"callback_query"}), Lane("low"), workers=1, max_skips=2)
+
+    for index in range(2):
+        lanes.put("message", recording_job(f"low-{index}", calls))
+    for index in range(4):
+        lanes.put("callback_query", recording_job(f"high-{index}", calls))
+
+    await lanes.close(timeout=1)
+
+    assert calls == ["high-0", "high-1", "low-0", "high-2", "high-3", "low-1"]
+    assert lanes.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_lanes_are_bounded_and_closed_after_shutdown():
+    release = asyncio.Event()
+    lanes = PriorityLanes(Lane("default", max_size=1), workers=1)
+
+    lanes.put("message", release.wait)
+    await asyncio.sleep(0)
+    lanes.put("message", release.wait)
+
+    with pytest.raises(LaneFullError):
+        lanes.put("message", release.wait)
+    assert lanes.sizes() == {"default": 1}
+
+    await lanes.close(timeout=0.01)
+
+    assert lanes.pending == 0
+    with pytest.raises(LanesClosedError):
+        lanes.put("message", release.wait)
+
+
+@pytest.mark.asyncio
+async def test_priority_lanes_put_waiting_waits_for_room_and_fails_on_close():
+    calls: list[str] = []
+    release = asyncio.Event()
+    lanes = PriorityLanes(Lane("default", max_size=1), workers=1)
+
+    lanes.put("message", release.wait)
+    await asyncio.sleep(0)
+    lanes.put("message", recording_job("queued", calls))
+    waiting = asyncio.create_task(lanes.put_waiting("message", recording_job("waited", calls)))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    release.set()
+    await asyncio.wait_for(waiting, timeout=1)
+    await lanes.close(timeout=1)
+    assert calls == ["queued", "waited"]
+
+    lanes = PriorityLanes(Lane("default", max_size=1), workers=1)
+    lanes.put("message", asyncio.Event().wait)
+    await asyncio.sleep(0)
+    lanes.put("message", release.wait)
+    waiting = asyncio.create_task(lanes.put_waiting("message", release.wait))
+    await asyncio.sleep(0)
+
+    await lanes.close(timeout=0.01)
+    with pytest.raises(LanesClosedError):
+        await waiting
+
+
+@pytest.mark.asyncio
+async def test_engine_answers_service_unavailable_when_lane_is_full(bot, adapter):
+    dispatcher = BlockingDispatcher()
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        lanes=PriorityLanes(Lane("default", max_size=1), workers=1),
+    )
+
+    def update_request(update_id: int) -> DummyWebRequest:
+        return DummyWebRequest(DummyRequest(json_data={"update_id": update_id, "message": {}}))
+
+    assert (await engine.handle_request(update_request(1)))["status_code"] == 200  # ty:ignore[not-subscriptable]
+    await asyncio.sleep(0)
+    assert (await engine.handle_request(update_request(2)))["status_code"] == 200  # ty:ignore[not-subscriptable]
+    response = await engine.handle_request(update_request(3))
+
+    dispatcher.release_updates.set()
+    await engine.on_shutdown(None)
+
+    assert response == {"kind": "json", "status_code": 503, "data": {"detail": "Service unavailable"}, "headers": None}
+    assert dispatcher.started_updates == 2
+
+
+@pytest.mark.asyncio
+async def test_engine_does_not_journal_updates_rejected_by_full_lane(tmp_path, bot, adapter):
+    dispatcher = BlockingDispatcher()
+    journal = UpdateJournal(tmp_path / "journal.sqlite3")
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        lanes=PriorityLanes(Lane("default", max_size=1), workers=1),
+        journal=journal,
+    )
+
+    def update_request(update_id: int) -> DummyWebRequest:
+        return DummyWebRequest(DummyRequest(json_data={"update_id": update_id, "message": {}}))
+
+    first = await engine.handle_request(update_request(1))
+    await asyncio.sleep(0)
+    # Both requests find room before either is journaled; the one that loses the lane rolls its entry back.
+    racing = await asyncio.gather(*(engine.handle_request(update_request(i)) for i in (2, 3)))
+    rejected = await engine.handle_request(update_request(4))
+    pending = await journal.pending()
+
+    dispatcher.release_updates.set()
+    await engine.on_shutdown(None)
+
+    statuses = [response["status_code"] for response in (first, *racing, rejected)]  # ty:ignore[not-subscriptable]
+    assert statuses == [200, 200, 503, 503]
+    assert [json.loads(entry.payload)["update_id"] for entry in pending] == [1, 2]
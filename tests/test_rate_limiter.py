@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from aiogram_webhook.configs.bot import BotConfig
+from aiogram_webhook.engines.token import TokenEngine
+from aiogram_webhook.limits import RateLimit, RateLimiter, RateLimitPolicy
+from tests.fixtures.webhook_engine import DummyDispatcher, DummyRoute
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rate_limiter_allows_burst_then_refills_at_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=2, burst=2), clock=clock)
+
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) is None
+
+    clock.now = 0.5
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) is None
+
+
+def test_rate_limiter_keeps_separate_buckets_and_explicit_limits_per_bot():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=1), limits={2: RateLimit(rate=1, burst=3)}, clock=clock)
+
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) is None
+    assert [limiter.acquire(2) for _ in range(4)] == [0.0, 0.0, 0.0, None]
+    assert RateLimiter(clock=clock).acquire(3) == 0.0
+
+
+def test_rate_limiter_defers_until_max_deferred_is_reached():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=4), policy=RateLimitPolicy.DEFER, max_deferred=2, clock=clock)
+
+    assert limiter.acquire(1) == 0.0
+    assert limiter.acquire(1) == pytest.approx(0.25)
+    assert limiter.acquire(1) == pytest.approx(0.5)
+    assert limiter.acquire(1) is None
+
+
+def test_rate_limiter_prunes_refilled_buckets_and_reuses_slots():
+    clock = FakeClock()
+    limiter = RateLimiter(RateLimit(rate=1), clock=clock)
+
+    limiter.acquire(1)
+    limiter.acquire(2)
+    clock.now = 0.5
+    limiter.acquire(3)
+    clock.now = 1.0
+
+    assert limiter.prune() == 2
+    assert len(limiter) == 1
+
+    limiter.acquire(4)
+    assert len(limiter._tokens) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("policy", "expected_response"),
+    [
+        (RateLimitPolicy.REJECT, {"kind": "json", "status_code": 429, "data": {"detail": "Too many requests"}}),
+        (RateLimitPolicy.DROP, {"kind": "json", "status_code": 200, "data": {}}),
+    ],
+    ids=["reject", "drop"],
+)
+async def test_token_engine_applies_rate_limit_overflow_policy(bot, adapter, update_request, policy, expected_response):
+    dispatcher = DummyDispatcher()
+    engine = TokenEngine(
+        dispatcher,
+        web=adapter,
+        route=DummyRoute({"bot_token": bot.token}),  # ty:ignore[invalid-argument-type]
+        bot_config=BotConfig(session=bot.session),
+        handle_in_background=False,
+        rate_limiter=RateLimiter(RateLimit(rate=0.001), policy=policy),
+    )
+
+    assert (await engine.handle_request(update_request))["status_code"] == 200  # ty:ignore[not-subscriptable]
+    dispatcher.webhook_update = None
+
+    response = await engine.handle_request(update_request)
+
+    assert response == {**expected_response, "headers": None}
+    assert dispatcher.webhook_update is None
+
+
+@pytest.mark.asyncio
+async def test_token_engine_acknowledges_and_dispatches_deferred_update_later(bot, adapter, update_request):
+    dispatcher = DummyDispatcher()
+    engine = TokenEngine(
+        dispatcher,
+        web=adapter,
+        route=DummyRoute({"bot_token": bot.token}),  # ty:ignore[invalid-argument-type]
+        bot_config=BotConfig(session=bot.session),
+        rate_limiter=RateLimiter(RateLimit(rate=50), policy=RateLimitPolicy.DEFER),
+    )
+
+    await engine.handle_request(update_request)
+    await asyncio.sleep(0)
+    dispatcher.webhook_update = None
+
+    response = await engine.handle_request(update_request)
+    await asyncio.sleep(0)
+
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    assert dispatcher.webhook_update is None
+
+    await asyncio.sleep(0.05)
+    assert dispatcher.webhook_update == update_request.raw.json_data
@@ -1,6 +1,10 @@
+from urllib.parse import quote
+
 import pytest
 from multidict import MultiDict
+from yarl import URL
 
+from aiogram_webhook.engines.target import Target
 from aiogram_webhook.route import BotIdParam, BotTokenParam, Const, Ref, Route
 from aiogram_webhook.route.errors import (
     InvalidPathParamError,
@@ -8,6 +12,7 @@ from aiogram_webhook.route.errors import (
     QueryParamMismatchError,
     UnexpectedQueryParamError,
 )
+from aiogram_webhook.route.path import PathTemplate
 from tests.fixtures.web_request import DummyRequest, DummyWebRequest
 
 
@@ -67,6 +72,22 @@ def test_route_normalizes_path_without_leading_slash():
     assert route.path == "/webhook/{bot_token}"
 
 
+@pytest.mark.parametrize(
+    ("template", "path", "expected"),
+    [
+        ("/webhook", "/webhook", {}),
+        ("/webhook", "/webhook/", None),
+        ("/webhook/{bot_token}", "/webhook/42:TEST", {"bot_token": "42:TEST"}),
+        ("/webhook/{bot_token}", "/webhook/42/TEST", None),
+        ("/bots/{bot_id}/hook.{kind}", "/bots/42/hook.json", {"bot_id": "42", "kind": "json"}),
+        ("/a.b/{{x}}", "/a.b/{x}", {}),
+        ("/a.b/{{x}}", "/aXb/{x}", None),
+    ],
+)
+def test_path_template_matches_request_paths(template, path, expected):
+    assert PathTemplate.from_input(template).match(path) == expected
+
+
 @pytest.mark.asyncio
 async def test_route_parses_declared_path_params(bot_token):
     route = Route(
@@ -80,6 +101,45 @@ async def test_route_parses_declared_path_params(bot_token):
     assert await route.match(request) == {"bot_token": bot_token}
 
 
+class SuffixParam:
+    """Async-only param that depends on an earlier param."""
+
+    async def build(self, target, params):
+        return f"{params['bot_id']}-x"
+
+    async def parse(self, value, params):
+        return f"{params['bot_id']}:{value}"
+
+
+@pytest.mark.asyncio
+async def test_route_mixes_sync_and_async_path_params(target):
+    route = Route(
+        base_url="https://example.com",
+        path="/webhook/{bot_id}/{suffix}",
+        params={"bot_id": BotIdParam(), "suffix": SuffixParam()},
+    )
+    request = DummyWebRequest(DummyRequest(path_params={"bot_id": "42", "suffix": "a"}))
+
+    assert route.matches_synchronously is False
+    assert await route.match(request) == {"bot_id": 42, "suffix": "42:a"}
+    assert await route.build_url(target) == "https://example.com/webhook/42/42-x"
+    with pytest.raises(TypeError):
+        route.match_sync(request)
+
+
+def test_route_matches_builtin_params_without_awaiting(bot_token):
+    route = Route(
+        base_url="https://example.com",
+        path="/webhook/{bot_token}",
+        params={"bot_token": BotTokenParam()},
+        query={"v": "1"},
+    )
+    request = DummyWebRequest(DummyRequest(path_params={"bot_token": bot_token}, query=MultiDict({"v": "1"})))
+
+    assert route.matches_synchronously is True
+    assert route.match_sync(request) == {"bot_token": bot_token}
+
+
 @pytest.mark.asyncio
 async def test_route_reports_invalid_path_param_value():
     raw_bot_id = "not-int"
@@ -161,6 +221,42 @@ async def test_route_reports_query_param_value_mismatch(bot_token):
     assert exc_info.value.got == (wrong_token,)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "kinds",
+    [["telegram"], ["webhook", "webhook"], ["telegram", "webhook", "extra"]],
+    ids=["too-few", "duplicate", "too-many"],
+)
+async def test_route_reports_constant_multi_value_query_param_mismatch(kinds):
+    route = Route(base_url="https://example.com", path="/webhook", query={"kind": ["webhook", "telegram"]})
+    request = DummyWebRequest(DummyRequest(query=MultiDict([("kind", kind) for kind in kinds])))
+
+    with pytest.raises(QueryParamMismatchError) as exc_info:
+        await route.match(request)
+
+    assert exc_info.value.expected == ("webhook", "telegram")
+    assert exc_info.value.got == tuple(kinds)
+
+
+@pytest.mark.asyncio
+async def test_route_checks_constant_query_params_before_rendered_ones(bot_token):
+    route = Route(
+        base_url="https://example.com",
+        path="/webhook/{bot_token}",
+        params={"bot_token": BotTokenParam()},
+        query={"token": Ref("bot_token"), "kind": "webhook"},
+    )
+    request = DummyWebRequest(
+        DummyRequest(path_params={"bot_token": bot_token}, query=MultiDict({"token": "wrong", "kind": "other"}))
+    )
+
+    with pytest.raises(QueryParamMismatchError) as exc_info:
+        await route.match(request)
+
+    assert exc_info.value.query_param == "kind"
+    assert [check.expected for check in route._query.plan] == [("webhook",), None]
+
+
 @pytest.mark.asyncio
 async def test_route_reports_unexpected_query_param(bot_token):
     route = Route(
@@ -206,3 +302,68 @@ async def test_route_reports_any_query_param_when_strict_query_has_no_query_spec
 
     assert exc_info.value.query_params == ("extra",)
     assert exc_info.value.expected_query_params == ()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "base_url",
+    ["https://example.com", "https://example.com/api/", "http://[::1]:8080/a%20b"],
+    ids=["origin", "base-path-trailing-slash", "ipv6-encoded-base-path"],
+)
+async def test_route_build_urls_matches_urls_built_through_yarl(base_url):
+    route = Route(
+        base_url=base_url,
+        path="/webhook/{bot_id}/{bot_token}",
+        params={"bot_id": BotIdParam(), "bot_token": BotTokenParam()},
+        query={"kind": ("telegram", "web hook")},
+    )
+    targets = [Target(bot_id=42, bot_token="42:TEST"), Target(bot_id=7, bot_token="..")]
+
+    expected = [
+        str(
+            URL(base_url)
+            .joinpath(f"webhook/{target.bot_id}/{quote(target.bot_token, safe='')}", encoded=True)
+            .with_query((("kind", "telegram"), ("kind", "web hook")))
+        )
+        for target in targets
+    ]
+
+    assert await route.build_urls(targets) == expected
+    assert [await route.build_url(target) for target in targets] == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("url_cache_size", "builds"), [(1024, 1), (None, 2)], ids=["cached", "default"])
+async def test_route_caches_built_urls_per_target(target, url_cache_size, builds):
+    calls: list[Target] = []
+
+    class CountingParam(BotIdParam):
+        def build_sync(self, target, params):
+            calls.append(target)
+            return super().build_sync(target, params)
+
+    route = Route(
+        base_url="https://example.com",
+        path="/webhook/{bot_id}",
+        params={"bot_id": CountingParam()},
+        **({} if url_cache_size is None else {"url_cache_size": url_cache_size}),
+    )
+
+    assert await route.build_url(target) == "https://example.com/webhook/42"
+    assert await route.build_urls([target]) == ["https://example.com/webhook/42"]
+    assert len(calls) == builds
+
+
+@pytest.mark.asyncio
+async def test_route_url_cache_evicts_least_recently_used_target():
+    first, second, third = (Target(bot_id=bot_id, bot_token=f"{bot_id}:TEST") for bot_id in (1, 2, 3))
+    route = Route(
+        base_url="https://example.com",
+        path="/webhook/{bot_id}",
+        params={"bot_id": BotIdParam()},
+        url_cache_size=2,
+    )
+
+    await route.build_urls([first, second, first, third])
+
+    assert list(route._url_cache) == [first, third]
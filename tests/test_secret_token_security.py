@@ -1,10 +1,28 @@
+import asyncio
+from functools import partial
+
 import pytest
 
-from aiogram_webhook.security import Security, StaticSecretToken
-from aiogram_webhook.security.secret_token import SECRET_TOKEN_HEADER
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.security import (
+    CachedSecretToken,
+    DerivedSecretToken,
+    SecretToken,
+    Security,
+    StaticSecretToken,
+)
+from aiogram_webhook.security.secret_token import SECRET_TOKEN_HEADER, SECRET_TOKEN_PATTERN
 from tests.fixtures.web_request import DummyRequest, DummyWebRequest
 
 
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("request_token", "expected"),
@@ -41,3 +59,106 @@ def test_secret_token_check_rejects_telegram_incompatible_values(secret_token):
 async def test_security_resolves_secret_token_from_static_value_or_callable(target, secret_token, expected):
     sec = Security(secret_token=secret_token)
     assert await sec.secret_token(target=target) == expected
+
+
+class StoreSecretToken(SecretToken):
+    def __init__(self) -> None:
+        self.secrets = {42: "first"}
+        self.loads = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def secret_token(self, target: Target) -> str:
+        self.loads += 1
+        secret = self.secrets[target.bot_id]
+        await self.release.wait()
+        return secret
+
+
+@pytest.mark.asyncio
+async def test_cached_secret_token_coalesces_concurrent_misses_and_caches_for_ttl(target):
+    clock = FakeClock()
+    source = StoreSecretToken()
+    source.release.clear()
+    cached = CachedSecretToken(source, ttl=10, clock=clock)
+
+    waiting = [asyncio.ensure_future(cached.secret_token(target)) for _ in range(3)]
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await asyncio.gather(*waiting) == ["first"] * 3
+    assert await cached.secret_token(target) == "first"
+    assert (source.loads, len(cached)) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_secret_token_serves_stale_secret_while_reloading(target):
+    clock = FakeClock()
+    source = StoreSecretToken()
+    cached = CachedSecretToken(source, ttl=10, stale_ttl=5, clock=clock)
+    await cached.secret_token(target)
+    source.secrets[42] = "second"
+
+    clock.now = 12
+    assert await cached.secret_token(target) == "first"
+    await asyncio.sleep(0)
+    assert await cached.secret_token(target) == "second"
+
+    source.secrets[42] = "third"
+    clock.now = 30
+    assert await cached.secret_token(target) == "third"
+    assert source.loads == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_secret_token_invalidation_drops_cached_and_in_flight_secrets(target):
+    source = StoreSecretToken()
+    cached = CachedSecretToken(source, clock=FakeClock())
+    await cached.secret_token(target)
+
+    source.secrets[42] = "second"
+    source.release.clear()
+    stale = cached._loads.start(target.bot_id, partial(source.secret_token, target=target))
+    await asyncio.sleep(0)
+    cached.invalidate(target.bot_id)
+    source.secrets[42] = "third"
+    source.release.set()
+
+    assert await stale == "second"
+    assert await cached.secret_token(target) == "third"
+    cached.invalidate()
+    assert len(cached) == 0
+
+
+def secret_request(secret: str) -> DummyWebRequest:
+    return DummyWebRequest(DummyRequest(headers={SECRET_TOKEN_HEADER: secret}))
+
+
+def test_derived_secret_token_is_stable_per_bot_and_telegram_compatible(target):
+    secret_token = DerivedSecretToken("master-key")
+
+    secret = secret_token.secret_token_sync(target)
+
+    assert SECRET_TOKEN_PATTERN.match(secret)
+    assert secret == DerivedSecretToken(b"master-key").secret_token_sync(target)
+    assert secret != secret_token.secret_token_sync(Target(bot_id=43, bot_token="43:TEST"))
+    assert secret != DerivedSecretToken("other-key").secret_token_sync(target)
+    assert secret_token.verify_sync(target=target, request=secret_request(secret), route_params={})
+    assert not secret_token.verify_sync(target=target, request=DummyWebRequest(), route_params={})
+
+
+def test_derived_secret_token_accepts_previous_key_during_rotation_grace_period(target):
+    clock = FakeClock()
+    secret_token = DerivedSecretToken("old-key", clock=clock)
+    old_secret = secret_token.secret_token_sync(target)
+
+    secret_token.rotate("new-key", grace_period=60)
+    new_secret = secret_token.secret_token_sync(target)
+
+    assert new_secret != old_secret
+    assert secret_token.verify_sync(target=target, request=secret_request(old_secret), route_params={})
+    assert secret_token.verify_sync(target=target, request=secret_request(new_secret), route_params={})
+
+    clock.now = 60
+    assert not secret_token.verify_sync(target=target, request=secret_request(old_secret), route_params={})
+    assert secret_token.verify_sync(target=target, request=secret_request(new_secret), route_params={})
@@ -1,9 +1,12 @@
+import asyncio
+import gc
+
 import pytest
 
 from aiogram_webhook.security.errors import SecretTokenError, SecurityCheckError
 from aiogram_webhook.security.secret_token import SECRET_TOKEN_HEADER, StaticSecretToken
 from aiogram_webhook.security.security import Security
-from tests.fixtures.security_checks import RecordingCheck
+from tests.fixtures.security_checks import RecordingCheck, SyncRecordingCheck
 from tests.fixtures.web_request import DummyRequest, DummyWebRequest
 
 
@@ -75,3 +78,146 @@ async def test_security_pipeline_rejects_bad_secret_token_before_checks(target):
 
     assert calls == []
     assert exc_info.value.target_bot_id == target.bot_id
+
+
+def test_security_verifies_sync_checks_and_secret_token_without_awaiting(target):
+    calls: list[str] = []
+    security = Security(
+        SyncRecordingCheck("first", result=True, calls=calls),
+        SyncRecordingCheck("second", result=False, calls=calls),
+        secret_token=StaticSecretToken("secret"),
+    )
+    request = DummyWebRequest(DummyRequest(headers={SECRET_TOKEN_HEADER: "secret"}))
+
+    assert security.verifies_synchronously is True
+    with pytest.raises(SecurityCheckError):
+        security.verify_sync(target=target, request=request, route_params={})
+    assert calls == ["first", "second"]
+
+    with pytest.raises(SecretTokenError):
+        security.verify_sync(
+            target=target,
+            request=DummyWebRequest(DummyRequest(headers={SECRET_TOKEN_HEADER: "wrong"})),
+            route_params={},
+        )
+
+
+@pytest.mark.asyncio
+async def test_security_runs_cheap_sync_checks_before_async_ones(target):
+    calls: list[str] = []
+    security = Security(
+        SyncRecordingCheck("sync", result=True, calls=calls),
+        RecordingCheck("async", result=True, calls=calls),
+        SyncRecordingCheck("last", result=False, calls=calls),
+    )
+    request = DummyWebRequest()
+
+    with pytest.raises(SecurityCheckError) as exc_info:
+        await security.verify(target=target, request=request, route_params={})
+
+    assert calls == ["sync", "last"]
+    assert exc_info.value.security_check == "SyncRecordingCheck"
+    assert security.verifies_synchronously is False
+    with pytest.raises(TypeError):
+        security.verify_sync(target=target, request=request, route_params={})
+
+
+@pytest.mark.asyncio
+async def test_security_orders_checks_by_cost_hint_keeping_declaration_order_for_ties(target):
+    class CheapCheck(RecordingCheck):
+        cost = 1.0
+
+    calls: list[str] = []
+    security = Security(
+        RecordingCheck("first", result=True, calls=calls),
+        SyncRecordingCheck("sync", result=True, calls=calls),
+        RecordingCheck("second", result=True, calls=calls),
+        CheapCheck("cheap", result=True, calls=calls),
+    )
+
+    await security.verify(target=target, request=DummyWebRequest(), route_params={})
+
+    assert calls == ["sync", "cheap", "first", "second"]
+    assert [stats.cost for stats in security.check_stats] == [1.0, 1.0, 100.0, 100.0]
+
+
+def test_security_measures_checks_and_reorders_them_by_rejection_rate(target):
+    calls: list[str] = []
+    passing = SyncRecordingCheck("passing", result=True, calls=calls)
+    rejecting = SyncRecordingCheck("rejecting", result=False, calls=calls)
+    security = Security(passing, rejecting, adaptive=True)
+
+    for _ in range(1024):
+        with pytest.raises(SecurityCheckError):
+            security.verify_sync(target=target, request=DummyWebRequest(), route_params={})
+
+    first, second = security.check_stats
+    assert (first.check, first.calls, first.rejections) == (rejecting, 1024, 1024)
+    assert (second.check, second.calls, second.rejections, second.rejection_rate) == (passing, 1023, 0, 0.0)
+    assert second.total_time > 0
+
+    calls.clear()
+    with pytest.raises(SecurityCheckError):
+        security.verify_sync(target=target, request=DummyWebRequest(), route_params={})
+    assert calls == ["rejecting"]
+
+
+@pytest.mark.asyncio
+async def test_security_runs_async_checks_concurrently_and_cancels_the_rest_on_rejection(target):
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    class SlowCheck:
+        def __init__(self, name: str, delay: float, *, result: bool) -> None:
+            self.name = name
+            self.delay = delay
+            self.result = result
+
+        async def verify(self, target, request, route_params) -> bool:
+            started.append(self.name)
+            try:
+                await asyncio.sleep(self.delay)
+            except asyncio.CancelledError:
+                cancelled.append(self.name)
+                raise
+            return self.result
+
+    security = Security(
+        SlowCheck("slow", 10, result=True),
+        SlowCheck("rejecting", 0, result=False),
+        concurrent=True,
+    )
+
+    with pytest.raises(SecurityCheckError) as exc_info:
+        await asyncio.wait_for(security.verify(target=target, request=DummyWebRequest(), route_params={}), 1)
+
+    assert exc_info.value.security_check == "SlowCheck"
+    assert started == ["slow", "rejecting"]
+    assert cancelled == ["slow"]
+
+
+@pytest.mark.asyncio
+async def test_security_retrieves_outcomes_of_concurrent_checks_after_rejection(target):
+    unhandled = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _loop, context: unhandled.append(context))
+
+    class FailingCheck:
+        async def verify(self, target, request, route_params) -> bool:
+            raise RuntimeError("check failed")
+
+    class RejectingCheck:
+        async def verify(self, target, request, route_params) -> bool:
+            return False
+
+    security = Security(RejectingCheck(), FailingCheck(), concurrent=True)
+
+    try:
+        # Both checks finish in the same round; whichever outcome is seen first is raised.
+        with pytest.raises((SecurityCheckError, RuntimeError)):
+            await security.verify(target=target, request=DummyWebRequest(), route_params={})
+        gc.collect()
+    finally:
+        loop.set_exception_handler(None)
+
+    assert unhandled == []
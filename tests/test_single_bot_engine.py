@@ -2,8 +2,12 @@ import asyncio
 
 import pytest
 from aiogram import Bot
+from aiogram.methods import SendMessage
 
 from aiogram_webhook.engines.single import SingleBotEngine
+from aiogram_webhook.engines.target import Target
+from aiogram_webhook.route import Route
+from aiogram_webhook.security import Security, StaticSecretToken
 from tests.fixtures.shutdown import BlockingDispatcher, BlockingShutdownDispatcher, TrackableSession
 from tests.fixtures.web_request import DummyRequest, DummyWebRequest
 from tests.fixtures.webhook_engine import DummyDispatcher, DummyRoute
@@ -158,3 +162,105 @@ async def test_foreground_engine_rejects_request_after_shutdown_with_closed_bot_
     assert response["status_code"] == 503  # ty:ignore[not-subscriptable]
     assert dispatcher.foreground_updates == []
     assert dispatcher.foreground_session_closed == []
+
+
+@pytest.mark.asyncio
+async def test_compiled_handler_answers_like_handle_request(bot, adapter):
+    dispatcher = DummyDispatcher(result=SendMessage(chat_id=42, text="OK"))
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        security=Security(secret_token=StaticSecretToken("secret")),
+        handle_in_background=False,
+    )
+    handler = engine._compile_handler()
+
+    def request(secret: str) -> DummyWebRequest:
+        headers = {"X-Telegram-Bot-Api-Secret-Token": secret}
+        return DummyWebRequest(DummyRequest(headers=headers, json_data={"update_id": 1}))
+
+    for secret in ("secret", "wrong"):
+        assert await handler(request(secret)) == await engine.handle_request(request(secret))
+
+    assert (await handler(request("wrong")))["status_code"] == 403  # ty:ignore[not-subscriptable]
+    assert (await handler(request("secret")))["kind"] == "payload"  # ty:ignore[not-subscriptable]
+    assert dispatcher.webhook_bot is bot
+
+
+@pytest.mark.asyncio
+async def test_compiled_handler_keeps_per_request_resolution_of_subclasses(bot, adapter, update_request):
+    resolved = []
+
+    class CountingEngine(SingleBotEngine):
+        async def _resolve_target(self, request, route_params) -> Target:
+            resolved.append(route_params)
+            return Target(bot_id=bot.id, bot_token=bot.token)
+
+    engine = CountingEngine(
+        DummyDispatcher(),
+        bot,
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+    plain = SingleBotEngine(
+        DummyDispatcher(),
+        bot,
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+
+    await engine._compile_handler()(update_request)
+
+    assert resolved == [{}]
+    assert engine._static_target() is None
+    assert plain._static_target() == (Target(bot_id=bot.id, bot_token=bot.token), bot)
+
+
+@pytest.mark.asyncio
+async def test_compiled_handler_keeps_overridden_handle_request(bot, adapter, update_request):
+    class WrappingEngine(SingleBotEngine):
+        async def handle_request(self, request):
+            return self.web.json_response(status_code=204)
+
+    engine = WrappingEngine(
+        DummyDispatcher(),
+        bot,
+        web=adapter,
+        route=Route(base_url="https://example.com", path="/webhook"),
+        handle_in_background=False,
+    )
+
+    assert (await engine._compile_handler()(update_request))["status_code"] == 204  # ty:ignore[not-subscriptable]
+
+
+@pytest.mark.asyncio
+async def test_compiled_handler_calls_overridden_route_match_and_security_verify(bot, adapter, update_request):
+    calls = []
+
+    class RecordingRoute(Route):
+        async def match(self, request):
+            calls.append("match")
+            return await super().match(request)
+
+    class RecordingSecurity(Security):
+        async def verify(self, *, target, request, route_params) -> None:
+            calls.append("verify")
+            await super().verify(target=target, request=request, route_params=route_params)
+
+    engine = SingleBotEngine(
+        DummyDispatcher(),
+        bot,
+        web=adapter,
+        route=RecordingRoute(base_url="https://example.com", path="/webhook"),
+        security=RecordingSecurity(),
+        handle_in_background=False,
+    )
+
+    response = await engine._compile_handler()(update_request)
+
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    assert calls == ["match", "verify"]
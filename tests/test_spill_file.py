@@ -0,0 +1,97 @@
+import asyncio
+import stat
+
+import pytest
+
+from aiogram_webhook.background import SpilledUpdate, SpillFile, UpdateJournal
+from aiogram_webhook.engines.single import SingleBotEngine
+from tests.fixtures.shutdown import BlockingDispatcher
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyDispatcher, DummyRoute
+
+
+@pytest.mark.asyncio
+async def test_spill_file_writes_only_unfinished_updates(tmp_path, bot):
+    spill = SpillFile(tmp_path / "spill.jsonl")
+
+    finished = spill.track(bot, {"update_id": 1})
+    spill.track(bot, {"update_id": 2})
+    spill.done(finished)
+
+    assert await spill.dump() == 1
+    assert len(spill) == 0
+    assert await spill.load() == [SpilledUpdate(bot_id=bot.id, bot_token=bot.token, update={"update_id": 2})]
+    assert not spill.path.exists()
+
+
+@pytest.mark.asyncio
+async def test_spill_file_skips_malformed_lines(tmp_path, bot):
+    path = tmp_path / "spill.jsonl"
+    path.write_text(f'not json\n{{"bot_id": {bot.id}, "bot_token": "{bot.token}", "update": {{"update_id": 3}}}}\n')
+
+    entries = await SpillFile(path).load()
+
+    assert [entry.update for entry in entries] == [{"update_id": 3}]
+
+
+@pytest.mark.asyncio
+async def test_spill_file_does_not_create_file_without_unfinished_updates(tmp_path):
+    spill = SpillFile(tmp_path / "spill.jsonl")
+
+    assert await spill.dump() == 0
+    assert not spill.path.exists()
+    assert await spill.load() == []
+
+
+@pytest.mark.asyncio
+async def test_engine_spills_cancelled_updates_and_replays_them_on_startup(tmp_path, bot, adapter):
+    path = tmp_path / "spill.jsonl"
+    engine = SingleBotEngine(
+        BlockingDispatcher(),
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        shutdown_timeout=0.01,
+        spill=SpillFile(path),
+    )
+
+    await engine.handle_request(DummyWebRequest(DummyRequest(json_data={"update_id": 5, "message": {}})))
+    await asyncio.sleep(0)
+    await engine.on_shutdown(None)
+
+    assert path.exists()
+
+    dispatcher = DummyDispatcher()
+    restarted = SingleBotEngine(
+        dispatcher,  # ty:ignore[invalid-argument-type]
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        spill=SpillFile(path),
+    )
+    await restarted.on_startup(None)
+    await restarted.on_shutdown(None)
+
+    assert dispatcher.webhook_update == {"update_id": 5, "message": {}}
+    assert not path.exists()
+
+
+def test_engine_rejects_journal_together_with_spill(tmp_path, bot, adapter):
+    with pytest.raises(ValueError, match="journal and spill"):
+        SingleBotEngine(
+            DummyDispatcher(),  # ty:ignore[invalid-argument-type]
+            bot,
+            web=adapter,
+            route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+            journal=UpdateJournal(tmp_path / "journal.sqlite3"),
+            spill=SpillFile(tmp_path / "spill.jsonl"),
+        )
+
+
+@pytest.mark.asyncio
+async def test_spill_file_is_private(tmp_path, bot):
+    spill = SpillFile(tmp_path / "spill.jsonl")
+    spill.track(bot, {"update_id": 1})
+
+    assert await spill.dump() == 1
+    assert stat.S_IMODE(spill.path.stat().st_mode) == 0o600
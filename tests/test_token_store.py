@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from aiogram_webhook.tokens import CachedTokenStore, MemoryTokenStore, SQLiteTokenStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStore(MemoryTokenStore):
+    def __init__(self, tokens=None) -> None:
+        super().__init__(tokens)
+        self.loads = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def get(self, bot_id: int) -> str | None:
+        self.loads += 1
+        await self.release.wait()
+        return await super().get(bot_id)
+
+
+@pytest.mark.asyncio
+async def test_cached_token_store_coalesces_concurrent_misses_and_serves_hits_from_memory():
+    source = CountingStore({42: "42:TEST"})
+    source.release.clear()
+    store = CachedTokenStore(source)
+
+    waiting = [asyncio.ensure_future(store.get(42)) for _ in range(3)]
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await asyncio.gather(*waiting) == ["42:TEST"] * 3
+    assert await store.get(42) == "42:TEST"
+    assert (source.loads, len(store)) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_token_store_remembers_unknown_bots_for_negative_ttl():
+    clock = FakeClock()
+    source = CountingStore()
+    store = CachedTokenStore(source, negative_ttl=30, clock=clock)
+
+    assert await store.get(7) is None
+    assert await store.get(7) is None
+    assert source.loads == 1
+
+    clock.now = 30
+    assert await store.get(7) is None
+    assert source.loads == 2
+
+    await store.set(7, "7:TEST")
+    assert await store.get(7) == "7:TEST"
+    assert source.loads == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_token_store_evicts_least_recently_used_tokens_and_deletes_through():
+    source = CountingStore({1: "1:A", 2: "2:B", 3: "3:C"})
+    store = CachedTokenStore(source, maxsize=2)
+
+    for bot_id in (1, 2, 1, 3):
+        await store.get(bot_id)
+    loads = source.loads
+    await store.get(1)
+    await store.get(2)
+
+    assert source.loads == loads + 1
+
+    await store.delete(1)
+    assert await store.get(1) is None
+    assert await source.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_sqlite_token_store_persists_tokens_across_reopen(tmp_path):
+    path = tmp_path / "tokens.sqlite"
+    store = SQLiteTokenStore(path)
+    await store.set(42, "42:OLD")
+    await store.set(42, "42:TEST")
+    await store.set(43, "43:TEST")
+    await store.delete(43)
+    await store.close()
+
+    reopened = SQLiteTokenStore(path)
+    try:
+        assert await reopened.get(42) == "42:TEST"
+        assert await reopened.get(43) is None
+    finally:
+        await reopened.close()
@@ -0,0 +1,90 @@
+import pytest
+from multidict import CIMultiDict
+
+from aiogram_webhook.security import IPCheck, Security, TrustedProxies
+from aiogram_webhook.security.errors import SecurityCheckError
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+
+
+class MultiHeaderRequest(DummyWebRequest):
+    def __init__(self, ip: str, headers: list[tuple[str, str]]) -> None:
+        super().__init__(DummyRequest(ip=ip))
+        self._headers = CIMultiDict(headers)
+
+    @property
+    def headers(self):
+        return self._headers
+
+
+def forwarded_request(ip: str, value: str | None, header: str = "X-Forwarded-For") -> DummyWebRequest:
+    return DummyWebRequest(DummyRequest(ip=ip, headers={header: value} if value is not None else None))
+
+
+@pytest.mark.parametrize(
+    ("peer", "forwarded_for", "expected"),
+    [
+        ("203.0.113.9", "1.1.1.1", "203.0.113.9"),
+        ("10.0.0.2", None, "10.0.0.2"),
+        ("10.0.0.2", "1.1.1.1", "1.1.1.1"),
+        ("10.0.0.2", "6.6.6.6, 1.1.1.1, 10.0.0.7", "1.1.1.1"),
+        ("10.0.0.2", "10.0.0.8, 10.0.0.7", "10.0.0.8"),
+        ("10.0.0.2", "1.1.1.1, not-an-ip", None),
+    ],
+    ids=[
+        "untrusted-peer-ignores-header",
+        "trusted-peer-without-header",
+        "single-hop",
+        "rightmost-untrusted-hop",
+        "all-hops-trusted",
+        "malformed-hop",
+    ],
+)
+def test_trusted_proxies_walk_x_forwarded_for_right_to_left(peer, forwarded_for, expected):
+    proxies = TrustedProxies("10.0.0.0/8")
+
+    assert proxies.client_ip(forwarded_request(peer, forwarded_for)) == expected
+
+
+def test_trusted_proxies_read_forwarded_header_and_joined_header_lines():
+    proxies = TrustedProxies("10.0.0.0/8", "2001:db8::/32", header="Forwarded")
+    value = 'for="[2001:db8:cafe::17]:4711";proto=https, for=198.51.100.4:80;by=10.0.0.1, for="[2001:db8::1]"'
+
+    assert proxies.client_ip(forwarded_request("10.0.0.2", value, "Forwarded")) == "198.51.100.4"
+    assert proxies.client_ip(forwarded_request("10.0.0.2", "for=_hidden", "Forwarded")) is None
+
+    lines = MultiHeaderRequest("10.0.0.2", [("X-Forwarded-For", "1.1.1.1"), ("X-Forwarded-For", "10.0.0.5")])
+    assert TrustedProxies("10.0.0.0/8").client_ip(lines) == "1.1.1.1"
+
+
+def test_trusted_proxies_cache_results_per_header_value():
+    proxies = TrustedProxies("10.0.0.0/8")
+
+    for _ in range(3):
+        assert proxies.client_ip(forwarded_request("10.0.0.2", "1.1.1.1, 10.0.0.3")) == "1.1.1.1"
+
+    assert proxies._resolve.cache_info().hits == 2
+
+
+@pytest.mark.asyncio
+async def test_ip_check_resolves_client_through_security_proxies(target):
+    ip_check = IPCheck("1.1.1.1", include_default=False)
+    security = Security(ip_check, proxies=TrustedProxies("10.0.0.0/8"))
+
+    allowed = forwarded_request("10.0.0.2", "6.6.6.6, 1.1.1.1")
+    spoofed = forwarded_request("10.0.0.2", "1.1.1.1, 6.6.6.6")
+    direct = forwarded_request("203.0.113.9", "1.1.1.1")
+
+    await security.verify(target=target, request=allowed, route_params={})
+    assert await ip_check.verify(target=target, request=direct, route_params={}) is False
+    with pytest.raises(SecurityCheckError) as exc_info:
+        await security.verify(target=target, request=spoofed, route_params={})
+
+    assert exc_info.value.client_ip == "6.6.6.6"
+
+
+def test_ip_check_rejects_other_proxies_than_it_already_uses():
+    ip_check = IPCheck()
+    Security(ip_check, proxies=TrustedProxies("10.0.0.0/8"))
+
+    with pytest.raises(ValueError, match="other trusted proxies"):
+        Security(ip_check, proxies=TrustedProxies("192.168.0.0/16"))
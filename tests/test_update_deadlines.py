@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from aiogram_webhook.background import Deadlines
+from aiogram_webhook.engines.single import SingleBotEngine
+from tests.fixtures.shutdown import BlockingDispatcher
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyRoute
+
+
+def test_deadlines_prefer_per_type_timeouts():
+    deadlines = Deadlines(5, per_type={"callback_query": 1, "channel_post": None})
+
+    assert deadlines.timeout_for("callback_query") == 1
+    assert deadlines.timeout_for("channel_post") is None
+    assert deadlines.timeout_for("message") == 5
+    assert deadlines.timeout_for(None) == 5
+
+
+@pytest.mark.asyncio
+async def test_deadlines_cancel_overdue_dispatch_and_count_timeouts():
+    deadlines = Deadlines(0.01)
+    hanging = asyncio.Event()
+
+    result = await deadlines.run(hanging.wait(), bot_id=42, update={"update_id": 1, "message": {}})
+
+    assert result is None
+    assert deadlines.timeouts == 1
+    assert deadlines.timeouts_by_type == {"message": 1}
+    assert deadlines.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_deadlines_keep_cancellation_that_arrives_with_the_deadline():
+    deadlines = Deadlines(0.01)
+
+    async def handler() -> None:
+        await asyncio.sleep(0)
+        # Block the loop past both timers, so the deadline and the shutdown cancel the task in one iteration.
+        time.sleep(0.05)  # noqa: ASYNC251
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(deadlines.run(handler(), bot_id=42, update={"update_id": 1, "message": {}}))
+    asyncio.get_running_loop().call_later(0.02, task.cancel)
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert deadlines.timeouts == 0
+    assert deadlines.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_deadlines_do_not_count_timeout_raised_by_handler():
+    deadlines = Deadlines(10)
+
+    async def handler() -> None:
+        raise asyncio.TimeoutError
+
+    with pytest.raises(asyncio.TimeoutError):
+        await deadlines.run(handler(), bot_id=42, update={"update_id": 1, "message": {}})
+
+    assert deadlines.timeouts == 0
+
+
+@pytest.mark.asyncio
+async def test_deadlines_report_slowest_in_flight_updates():
+    deadlines = Deadlines()
+    release = asyncio.Event()
+
+    first = asyncio.create_task(deadlines.run(release.wait(), bot_id=1, update={"update_id": 1, "message": {}}))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(deadlines.run(release.wait(), bot_id=2, update={"update_id": 2, "poll": {}}))
+    await asyncio.sleep(0)
+
+    slowest = deadlines.slowest(limit=1)
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert [(item.bot_id, item.update_id, item.update_type) for item in slowest] == [(1, 1, "message")]
+    assert slowest[0].elapsed > 0
+    assert deadlines.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_background_engine_cancels_update_after_deadline(bot, adapter):
+    dispatcher = BlockingDispatcher()
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        deadlines=Deadlines(0.01),
+    )
+
+    response = await engine.handle_request(DummyWebRequest(DummyRequest(json_data={"update_id": 1, "message": {}})))
+    await asyncio.sleep(0.05)
+
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    assert dispatcher.started_updates == 1
+    assert engine.deadlines is not None
+    assert engine.deadlines.timeouts == 1
+    assert not engine._task_tracker._tasks
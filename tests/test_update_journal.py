@@ -0,0 +1,117 @@
+import asyncio
+import json
+import stat
+
+import pytest
+
+from aiogram_webhook.background import UpdateJournal
+from aiogram_webhook.engines.single import SingleBotEngine
+from aiogram_webhook.web.base import WebRequest
+from tests.fixtures.shutdown import BlockingDispatcher
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyDispatcher, DummyRoute
+
+
+@pytest.mark.asyncio
+async def test_journal_group_commits_concurrent_appends(tmp_path, target):
+    journal = UpdateJournal(tmp_path / "journal.sqlite3")
+
+    entry_ids = await asyncio.gather(*(journal.append(target, f'{{"update_id": {i}}}'.encode()) for i in range(10)))
+    pending = await journal.pending()
+    await journal.close()
+
+    assert entry_ids == sorted(entry_ids)
+    assert len(set(entry_ids)) == 10
+    assert journal.appended == 10
+    assert journal.commits < 10
+    assert [entry.id for entry in pending] == entry_ids
+    assert pending[0].bot_id == target.bot_id
+    assert pending[0].bot_token == target.bot_token
+
+
+@pytest.mark.asyncio
+async def test_journal_keeps_only_unacknowledged_updates_across_reopen(tmp_path, target):
+    path = tmp_path / "journal.sqlite3"
+    journal = UpdateJournal(path)
+
+    first = await journal.append(target, b'{"update_id": 1}')
+    second = await journal.append(target, b'{"update_id": 2}')
+    journal.ack(first)
+    await journal.close()
+
+    reopened = UpdateJournal(path)
+    pending = await reopened.pending()
+    await reopened.close()
+
+    assert [(entry.id, entry.payload) for entry in pending] == [(second, b'{"update_id": 2}')]
+
+
+@pytest.mark.asyncio
+async def test_background_engine_acknowledges_update_after_dispatch(tmp_path, bot, adapter):
+    dispatcher = BlockingDispatcher()
+    engine = SingleBotEngine(
+        dispatcher,
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        journal=UpdateJournal(tmp_path / "journal.sqlite3"),
+    )
+    assert engine.journal is not None
+
+    response = await engine.handle_request(DummyWebRequest(DummyRequest(json_data={"update_id": 1, "message": {}})))
+    await asyncio.sleep(0)
+
+    assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    assert len(await engine.journal.pending()) == 1
+
+    dispatcher.release_updates.set()
+    await asyncio.sleep(0.01)
+
+    assert await engine.journal.pending() == []
+    await engine.journal.close()
+
+
+@pytest.mark.asyncio
+async def test_engine_replays_journaled_updates_on_startup(tmp_path, bot, target, adapter):
+    path = tmp_path / "journal.sqlite3"
+    journal = UpdateJournal(path)
+    await journal.append(target, json.dumps({"update_id": 7, "message": {}}).encode())
+    await journal.close()
+
+    dispatcher = DummyDispatcher()
+    engine = SingleBotEngine(
+        dispatcher,  # ty:ignore[invalid-argument-type]
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        journal=UpdateJournal(path),
+    )
+
+    await engine.on_startup(None)
+    await engine.on_shutdown(None)
+
+    assert dispatcher.webhook_update == {"update_id": 7, "message": {}}
+
+    reopened = UpdateJournal(path)
+    assert await reopened.pending() == []
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_journal_file_is_private(tmp_path, target):
+    path = tmp_path / "journal.sqlite3"
+    journal = UpdateJournal(path)
+
+    await journal.append(target, b'{"update_id": 1}')
+    await journal.close()
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+@pytest.mark.asyncio
+async def test_web_request_default_read_encodes_json_body():
+    class JsonOnlyRequest(WebRequest[None]):
+        async def json(self) -> dict:
+            return {"update_id": 1, "message": {"text": "привет"}}
+
+    assert json.loads(await JsonOnlyRequest().read()) == {"update_id": 1, "message": {"text": "привет"}}
@@ -1,9 +1,14 @@
 import pytest
 from aiogram.methods import SendDocument, SendMessage
-from aiogram.types import BufferedInputFile
+from aiogram.types import BufferedInputFile, FSInputFile
 
 from aiogram_webhook.utils._payload import build_webhook_payload
-from tests.fixtures.multipart_payload import assert_attached_file, assert_payload_fields
+from tests.fixtures.multipart_payload import (
+    MemoryStreamWriter,
+    assert_attached_file,
+    assert_multipart_fields,
+    assert_payload_fields,
+)
 
 
 @pytest.mark.asyncio
@@ -34,3 +39,20 @@ async def test_webhook_payload_builder_serializes_attached_file(bot):
     parts = await assert_payload_fields(payload, {"method": "sendDocument", "chat_id": "42"})
 
     assert_attached_file(parts, field="document", filename="hello.txt", body=b"hello")
+
+
+@pytest.mark.asyncio
+async def test_webhook_payload_builder_streams_local_files_in_chunks_with_known_size(bot, tmp_path):
+    path = tmp_path / "report.bin"
+    path.write_bytes(b"x" * 100)
+    method = SendDocument(chat_id=42, document=FSInputFile(path, chunk_size=32))
+
+    payload = build_webhook_payload(bot=bot, method=method)
+    writer = MemoryStreamWriter()
+    await payload.write(writer)
+    body = b"".join(writer.chunks)
+
+    assert payload.size == len(body)
+    assert [len(chunk) for chunk in writer.chunks if chunk.strip(b"x") == b""] == [32, 32, 32, 4]
+    parts = assert_multipart_fields(payload.headers["Content-Type"], body, {"method": "sendDocument"})
+    assert_attached_file(parts, field="document", filename="report.bin", body=b"x" * 100)
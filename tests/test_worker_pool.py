@@ -0,0 +1,178 @@
+import asyncio
+import json
+import time
+from functools import partial
+
+import pytest
+
+from aiogram_webhook.background import Deadlines, PriorityLanes, SpillFile, UpdateJournal, WorkerPool
+from aiogram_webhook.background.errors import WorkerUnavailableError
+from aiogram_webhook.engines.single import SingleBotEngine
+from aiogram_webhook.utils.update import get_update_chat_id
+from tests.fixtures.web_request import DummyRequest, DummyWebRequest
+from tests.fixtures.webhook_engine import DummyRoute
+from tests.fixtures.workers import build_failing_dispatcher, build_hanging_dispatcher, build_recording_dispatcher
+
+
+def message_update(update_id: int, chat_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": text,
+        },
+    }
+
+
+def test_get_update_chat_id_covers_chat_less_updates():
+    assert get_update_chat_id(message_update(1, 7, "hi")) == 7
+    assert (
+        get_update_chat_id({"update_id": 1, "callback_query": {"from": {"id": 3}, "message": {"chat": {"id": 9}}}}) == 9
+    )
+    assert get_update_chat_id({"update_id": 1, "inline_query": {"from": {"id": 3}}}) == 3
+    assert get_update_chat_id({"update_id": 1}) is None
+
+
+def test_worker_pool_routes_one_chat_to_one_worker():
+    pool = WorkerPool(build_recording_dispatcher, processes=4)
+
+    workers = {pool.worker_for(42, message_update(index, 7, "hi")) for index in range(20)}
+
+    assert len(workers) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_reports_worker_that_failed_to_start():
+    pool = WorkerPool(build_failing_dispatcher, processes=1)
+
+    with pytest.raises(WorkerUnavailableError):
+        await pool.start()
+
+    assert not pool.started
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_restarts_dead_worker(tmp_path, bot):
+    output = tmp_path / "dispatched.txt"
+    pool = WorkerPool(partial(build_recording_dispatcher, str(output)), processes=1, max_in_flight=1)
+    await pool.start()
+
+    pool._workers[0].kill()
+    await asyncio.to_thread(pool._workers[0].join)
+
+    with pytest.raises(WorkerUnavailableError):
+        pool.submit(bot, message_update(1, 7, "lost"), b"{}")
+    with pytest.raises(WorkerUnavailableError):
+        pool.submit(bot, message_update(2, 7, "restarting"), b"{}")
+
+    await asyncio.wait_for(pool._restarting[0], timeout=60)
+    assert pool.restarts == [1]
+    for index, text in enumerate(("a", "b", "c"), start=3):
+        update = message_update(index, 7, text)
+        pool.submit(bot, update, json.dumps(update).encode())
+    await pool.close(timeout=60)
+
+    assert output.read_text().splitlines() == ["7:a", "7:b", "7:c"]
+
+
+@pytest.mark.parametrize("option", ["lanes", "deadlines", "journal", "spill"])
+def test_engine_rejects_workers_with_in_process_dispatch_options(tmp_path, bot, adapter, dispatcher, option):
+    options = {
+        "lanes": PriorityLanes(),
+        "deadlines": Deadlines(1),
+        "journal": UpdateJournal(tmp_path / "journal.sqlite3"),
+        "spill": SpillFile(tmp_path / "spill.jsonl"),
+    }
+
+    with pytest.raises(ValueError, match=option):
+        SingleBotEngine(
+            dispatcher,  # ty:ignore[invalid-argument-type]
+            bot,
+            web=adapter,
+            route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+            workers=WorkerPool(build_recording_dispatcher, processes=1),
+            **{option: options[option]},
+        )
+
+
+@pytest.mark.parametrize("option", ["lanes", "deadlines", "journal", "spill", "workers"])
+def test_engine_rejects_background_options_in_foreground_mode(tmp_path, bot, adapter, dispatcher, option):
+    options = {
+        "lanes": PriorityLanes(),
+        "deadlines": Deadlines(1),
+        "journal": UpdateJournal(tmp_path / "journal.sqlite3"),
+        "spill": SpillFile(tmp_path / "spill.jsonl"),
+        "workers": WorkerPool(build_recording_dispatcher, processes=1),
+    }
+
+    with pytest.raises(ValueError, match=f"{option} require handle_in_background=True"):
+        SingleBotEngine(
+            dispatcher,  # ty:ignore[invalid-argument-type]
+            bot,
+            web=adapter,
+            route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+            handle_in_background=False,
+            **{option: options[option]},
+        )
+
+
+def test_worker_pool_rejects_updates_before_start(bot):
+    pool = WorkerPool(build_recording_dispatcher, processes=2)
+
+    with pytest.raises(WorkerUnavailableError):
+        pool.submit(bot, message_update(1, 7, "hi"), b"{}")
+
+
+@pytest.mark.asyncio
+async def test_engine_forwards_updates_to_worker_processes(tmp_path, bot, adapter, dispatcher):
+    output = tmp_path / "dispatched.txt"
+    pool = WorkerPool(partial(build_recording_dispatcher, str(output)), processes=2)
+    engine = SingleBotEngine(
+        dispatcher,  # ty:ignore[invalid-argument-type]
+        bot,
+        web=adapter,
+        route=DummyRoute(),  # ty:ignore[invalid-argument-type]
+        shutdown_timeout=60,
+        workers=pool,
+    )
+
+    await engine.on_startup(None)
+    updates = [message_update(index, chat_id, str(index)) for index, chat_id in enumerate((1, 2, 1, 2, 1), start=1)]
+    for update in updates:
+        request = DummyWebRequest(DummyRequest(json_data=json.loads(json.dumps(update))))
+        response = await engine.handle_request(request)
+        assert response["status_code"] == 200  # ty:ignore[not-subscriptable]
+    await engine.on_shutdown(None)
+
+    lines = output.read_text().splitlines()
+
+    assert sorted(lines) == sorted(
+        f"{chat_id}:{text}" for chat_id, text in ((1, "1"), (2, "2"), (1, "3"), (2, "4"), (1, "5"))
+    )
+    assert [line for line in lines if line.startswith("1:")] == ["1:1", "1:3", "1:5"]
+    assert sum(pool.submitted) == 5
+    assert dispatcher.webhook_update is None
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_close_waits_for_all_workers_at_once(bot):
+    pool = WorkerPool(build_hanging_dispatcher, processes=2)
+    await pool.start()
+
+    updates = {}
+    for chat_id in range(100):
+        updates.setdefault(pool.worker_for(bot.id, message_update(chat_id, chat_id, "hi")), chat_id)
+        if len(updates) == pool.processes:
+            break
+    for chat_id in updates.values():
+        update = message_update(chat_id, chat_id, "hi")
+        pool.submit(bot, update, json.dumps(update).encode())
+
+    started = time.monotonic()
+    await pool.close(timeout=1)
+
+    # Joined one after another, two stuck workers would take at least two timeouts.
+    assert time.monotonic() - started < 2
+    assert not pool._workers